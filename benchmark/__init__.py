@@ -0,0 +1 @@
+"""A package to benchmark the performance of susy_cross_section package."""
@@ -0,0 +1,495 @@
+"""Runner of benchmark scripts.
+
+This code is supposed to be called from **the root directory of this
+repository** by ``python3 -m benchmark ARGS``.
+"""
+
+import logging
+import pathlib
+import pickle as pickle_module
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, List, MutableMapping  # noqa: F401
+
+import click
+import numpy
+import pandas
+import scipy.interpolate
+from click.testing import CliRunner
+
+import susy_cross_section.scripts
+from benchmark.base import measure, parse_int_list, print_table, write_synthetic_grid
+import susy_cross_section.config as config
+import susy_cross_section.evaluation as evaluation
+import susy_cross_section.interp.artifact as artifact
+from susy_cross_section.base.table import BaseFile, BaseTable, read_numeric_columns
+from susy_cross_section.interp.axes_wrapper import AxesWrapper
+from susy_cross_section.interp.interpolator import (
+    Scipy1dInterpolator,
+    ScipyGridInterpolator,
+    ScipyMultiDimensionalInterpolator,
+    default_interpolator,
+)
+from susy_cross_section.table import File
+from susy_cross_section.utility import get_paths
+
+__author__ = susy_cross_section.scripts.__author__
+__copyright__ = susy_cross_section.scripts.__copyright__
+__license__ = "MIT"
+__packagename__ = "susy_cross_section/benchmark"
+__version__ = susy_cross_section.scripts.__version__
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def _sample_interpolators():  # type: ignore
+    """Return interpolators with bundled tables to apply."""
+    table_1d = File(*get_paths("13TeV.n2x1+.wino"))["xsec"]
+    table_2d = File(*get_paths("13TeV.sb10"))["xsec"]
+    wrapper_2d = AxesWrapper(["log", "log"], "log")
+    return [
+        ("1d-linear", Scipy1dInterpolator("linear", "loglog"), table_1d),
+        ("1d-spline", Scipy1dInterpolator("spline", "loglog"), table_1d),
+        ("2d-linear", ScipyGridInterpolator("linear", wrapper_2d), table_2d),
+        ("2d-spline", ScipyGridInterpolator("spline", wrapper_2d), table_2d),
+    ]
+
+
+def _sample_interpolations():  # type: ignore
+    """Return interpolations of bundled tables with their parameter ranges."""
+    return [
+        (label, interp.interpolate(table), _bounds(table))
+        for label, interp, table in _sample_interpolators()
+    ]
+
+
+def _bounds(table):  # type: ignore
+    """Return the ranges of the parameters of a table."""
+    index = table.index
+    levels = [index.get_level_values(i) for i in range(index.nlevels)]
+    return [(level.min(), level.max()) for level in levels]
+
+
+class _RowWiseFile(BaseFile[BaseTable]):
+    """BaseFile with the original row-by-row uncertainty calculation."""
+
+    def _parse_data(self, names=None):  # type: ignore
+        tables = {}  # type: MutableMapping[str, BaseTable]
+
+        def calc(row, unc_sources, sign):  # type: ignore
+            unc_components = []  # type: List[float]
+            for source, unc_type in unc_sources:
+                if "signed" in unc_type.split(","):
+                    unc_candidates = [abs(row[c]) for c in source if row[c] * sign > 0]
+                else:
+                    unc_candidates = [abs(row[c]) for c in source]
+                unc_components.append(max(unc_candidates) if unc_candidates else 0)
+            return sum(i ** 2 for i in unc_components) ** 0.5
+
+        for value_info in self.info.values:
+            name = value_info.column
+            data = self._prepare_normalized_data(value_info)
+            tables[name] = BaseTable(file=self, name=name)
+            tables[name]["value"] = data[name]
+            for key, row in data.iterrows():
+                tables[name].loc[key, "unc+"] = calc(row, value_info.unc_p, +1)
+                tables[name].loc[key, "unc-"] = calc(row, value_info.unc_m, -1)
+        return tables
+
+
+@click.group(
+    context_settings={"help_option_names": ["-h", "--help"]},
+    invoke_without_command=True,
+)
+@click.version_option(__version__, "-V", "--version", prog_name=__packagename__)
+@click.pass_context
+def main(ctx):  # type: ignore
+    """Invoke specified benchmark command."""
+    ctx.info_name = "python -m benchmark"
+    if not ctx.invoked_subcommand:
+        click.echo(ctx.get_help())
+        exit(1)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--rows", default="1e2,1e3,1e4,1e5", help="Comma-separated row counts.")
+@click.option("--legacy-max", default=1e4, help="Max rows for row-wise calculation.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def parse(**kw):  # type: ignore
+    """Measure grid parsing time as a function of row count."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in parse_int_list(kw["rows"]):
+            grid, info = write_synthetic_grid(pathlib.Path(tmp), n_rows)
+            n_actual = len(BaseFile(grid, info).raw_data)
+            t_new = measure(
+                lambda: BaseFile(grid, info, lazy=False), repeat=kw["repeat"]
+            )
+            if n_actual <= kw["legacy_max"]:
+                t_old = measure(lambda: _RowWiseFile(grid, info), repeat=1)
+                ratio = t_old / t_new
+            else:
+                t_old, ratio = float("nan"), float("nan")
+            results.append(
+                (n_actual, t_new, t_new / n_actual * 1e6, t_old, ratio)
+            )
+    print_table(["rows", "time[s]", "per_row[us]", "row_wise[s]", "speedup"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--repeat", default=5, help="Repeat count for each measurement.")
+def read(**kw):  # type: ignore
+    """Compare the numeric reader with pandas over the bundled catalog."""
+    data_dir = pathlib.Path(susy_cross_section.__file__).parent / "data"
+    results = []
+    total_pandas, total_fast = 0.0, 0.0
+    for info_path in sorted(data_dir.glob("**/*.info")):
+        grid = next(
+            info_path.with_suffix(s)
+            for s in [".grid", ".csv"]
+            if info_path.with_suffix(s).is_file()
+        )
+        data_file = BaseFile(grid, info_path)
+        names = [c.name for c in data_file.info.columns]
+        columns = data_file._required_columns(list(data_file.tables.keys()))
+        options = data_file.info.reader_options
+
+        def read_fast():  # type: ignore
+            if read_numeric_columns(grid, names, columns, options) is None:
+                raise RuntimeError("Fast reader does not support %s", grid)
+
+        t_pandas = measure(
+            lambda: data_file._read_csv(grid, columns), repeat=kw["repeat"]
+        )
+        t_fast = measure(read_fast, repeat=kw["repeat"])
+        total_pandas, total_fast = total_pandas + t_pandas, total_fast + t_fast
+        name = str(grid.relative_to(data_dir))
+        results.append((name, len(data_file.raw_data), t_pandas, t_fast))
+    results.append(("(total)", "", total_pandas, total_fast))
+    print_table(["file", "rows", "pandas[s]", "numeric[s]"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--points", default=2000, help="Number of points to evaluate.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def tuple_at(**kw):  # type: ignore
+    """Measure per-point time of Interpolation.tuple_at."""
+    results = []
+    random = numpy.random.RandomState(0)
+    for label, fit, bounds in _sample_interpolations():
+        xs = numpy.column_stack(
+            [random.uniform(lo, hi, kw["points"]) for lo, hi in bounds]
+        )
+
+        def separate():  # type: ignore
+            for x in xs:
+                fit.f0(x), fit.unc_p_at(x), fit.unc_m_at(x)
+
+        def fused():  # type: ignore
+            for x in xs:
+                fit.tuple_at(x)
+
+        t_separate = measure(separate, repeat=kw["repeat"]) / kw["points"]
+        t_fused = measure(fused, repeat=kw["repeat"]) / kw["points"]
+        results.append(
+            (label, t_separate * 1e6, t_fused * 1e6, t_separate / t_fused)
+        )
+    print_table(["interpolation", "separate[us]", "tuple_at[us]", "speedup"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--repeat", default=5, help="Repeat count for each measurement.")
+def pickle(**kw):  # type: ignore
+    """Measure pickling of interpolations compared with fitting."""
+    results = []
+    for label, interp, table in _sample_interpolators():
+        fit = interp.interpolate(table)
+        data = pickle_module.dumps(fit, protocol=pickle_module.HIGHEST_PROTOCOL)
+        t_dump = measure(
+            lambda: pickle_module.dumps(fit, protocol=pickle_module.HIGHEST_PROTOCOL),
+            repeat=kw["repeat"],
+            number=1000,
+        )
+        t_load = measure(
+            lambda: pickle_module.loads(data), repeat=kw["repeat"], number=1000
+        )
+        t_fit = measure(lambda: interp.interpolate(table), repeat=kw["repeat"])
+        results.append((label, len(data), t_dump * 1e6, t_load * 1e6, t_fit * 1e6))
+    print_table(["interpolation", "bytes", "dump[us]", "load[us]", "fit[us]"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--repeat", default=5, help="Repeat count for each measurement.")
+def compile(**kw):  # type: ignore
+    """Measure loading of compiled interpolations compared with fitting."""
+    results = []
+    tmp_dir = tempfile.mkdtemp()
+    for label, interp, table in _sample_interpolators():
+        path = pathlib.Path(tmp_dir) / "{}.bin".format(label)
+        artifact.dump(interp.interpolate(table), path)
+        t_mmap = measure(lambda: artifact.load(path), repeat=kw["repeat"], number=100)
+        t_read = measure(
+            lambda: artifact.load(path, mmap=False), repeat=kw["repeat"], number=100
+        )
+        t_fit = measure(lambda: interp.interpolate(table), repeat=kw["repeat"])
+        results.append(
+            (label, path.stat().st_size, t_mmap * 1e6, t_read * 1e6, t_fit * 1e6)
+        )
+    shutil.rmtree(tmp_dir)
+    print_table(["interpolation", "bytes", "mmap[us]", "read[us]", "fit[us]"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--points", default="1e3,1e4,1e5", help="Comma-separated point counts.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def batch(**kw):  # type: ignore
+    """Measure BATCH command compared with per-point GET."""
+    results = []
+    runner = CliRunner(mix_stderr=False)
+    random = numpy.random.RandomState(0)
+    table = File(*get_paths("13TeV.sb10"))["xsec"]
+    bounds = _bounds(table)
+    fit = ScipyGridInterpolator("spline", AxesWrapper(["log", "log"], "log"))
+    fit = fit.interpolate(table)
+    for n_points in parse_int_list(kw["points"]):
+        xs = numpy.column_stack([random.uniform(lo, hi, n_points) for lo, hi in bounds])
+        text = "\n".join("{},{}".format(*x) for x in xs) + "\n"
+        args = ["-0", "13TeV.sb10"]
+
+        def run():  # type: ignore
+            ret = runner.invoke(susy_cross_section.scripts.batch, args, input=text)
+            assert ret.exit_code == 0, ret.stderr
+
+        def loop():  # type: ignore
+            for x in xs:
+                "{}".format(fit.tuple_at(x)[0])
+
+        t_batch = measure(run, repeat=kw["repeat"])
+        t_loop = measure(loop, repeat=kw["repeat"])
+        results.append((n_points, t_batch, n_points / t_batch, n_points / t_loop))
+    print_table(["points", "batch[s]", "batch[pts/s]", "tuple_at[pts/s]"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--tables", default="13TeV.*", help="Comma-separated table patterns.")
+@click.option("--points", default="1,100,10000", help="Comma-separated point counts.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def evaluate(**kw):  # type: ignore
+    """Measure evaluation of many tables compared with a per-table loop."""
+    results = []
+    patterns = kw["tables"].split(",")
+    names = evaluation.find_tables(patterns)
+    random = numpy.random.RandomState(0)
+    for n_points in parse_int_list(kw["points"]):
+        points = pandas.DataFrame(
+            {
+                name: random.uniform(500, 1500, n_points)
+                for name in ["ms", "mgl", "mst", "m_wino", "m_hino", "m_slep"]
+            }
+        )
+
+        def loop():  # type: ignore
+            rows = []
+            for name in names:
+                data_file = File(*get_paths(name), values=["xsec"])
+                table = data_file["xsec"]
+                params = [p.column for p in data_file.info.parameters]
+                try:
+                    fit = default_interpolator(len(params)).interpolate(table)
+                except ValueError:
+                    continue
+                values = [v.tolist() for v in fit.tuple_batch(points[params])]
+                unit = table.unit
+                rows.extend(
+                    (i, name, v0, vp, vm, unit)
+                    for i, (v0, vp, vm) in enumerate(zip(*values))
+                )
+            rows.sort(key=lambda row: row[0])
+
+        t_loop = measure(loop, repeat=kw["repeat"])
+        t_shared = measure(
+            lambda: evaluation.evaluate(points, patterns), repeat=kw["repeat"]
+        )
+        results.append((n_points, len(names), t_loop, t_shared, t_loop / t_shared))
+    print_table(["points", "tables", "loop[s]", "evaluate[s]", "speedup"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--dims", default="2,3,4", help="Comma-separated parameter counts.")
+@click.option("--points", default="1e3,1e4,1e5", help="Comma-separated point counts.")
+@click.option("--side", default=10, help="Number of grid points along each axis.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def multilinear(**kw):  # type: ignore
+    """Measure linear grid interpolation in log axes against dimensions and points.
+
+    Compares tuple_batch with RegularGridInterpolator on the same stacked
+    values and with per-point tuple_at (up to 1000 points).
+    """
+    results = []
+    random = numpy.random.RandomState(0)
+    for dim in parse_int_list(kw["dims"]):
+        axes = [numpy.geomspace(100, 3000, kw["side"]) for _ in range(dim)]
+        names = ["m{}".format(j) for j in range(dim)]
+        index = pandas.MultiIndex.from_product(axes, names=names)
+        grid = index.to_frame(index=False).to_numpy(dtype=float)
+        value = 1e4 * numpy.prod(grid / 1000, axis=1) ** -2
+        table = BaseTable(
+            pandas.DataFrame({"value": value, "unc+": value, "unc-": value}, index)
+        )
+        wrapper = AxesWrapper(["log"] * dim, "log")
+        fit = ScipyGridInterpolator("linear", wrapper).interpolate(table)
+        shape = [len(a) for a in axes] + [3]
+        stacked = numpy.column_stack([value, 2 * value, value * 0])
+        reference = scipy.interpolate.RegularGridInterpolator(
+            [numpy.log(a) for a in axes], numpy.log(stacked).reshape(shape)
+        )
+        for n_points in parse_int_list(kw["points"]):
+            xs = random.uniform(100, 3000, (n_points, dim))
+
+            def loop():  # type: ignore
+                for x in xs[:1000]:
+                    fit.tuple_at(x)
+
+            t_batch = measure(lambda: fit.tuple_batch(xs), repeat=kw["repeat"])
+            t_scipy = measure(
+                lambda: numpy.exp(reference(numpy.log(xs))), repeat=kw["repeat"]
+            )
+            t_loop = measure(loop, repeat=kw["repeat"]) / min(n_points, 1000)
+            results.append(
+                (dim, n_points, t_batch, t_scipy, n_points / t_batch, 1 / t_loop)
+            )
+    header = ["dims", "points", "batch[s]", "scipy[s]", "batch[pts/s]"]
+    print_table(header + ["tuple_at[pts/s]"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--nodes", default="1e4,1e5", help="Comma-separated node counts.")
+@click.option("--points", default=100000, help="Number of points to evaluate.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def delaunay(**kw):  # type: ignore
+    """Measure Delaunay interpolation of scattered nodes.
+
+    Compares the construction with and without the cached triangulation, and
+    the batch evaluation with scipy's LinearNDInterpolator.
+    """
+    results = []
+    random = numpy.random.RandomState(0)
+    xs = random.uniform(0, 1, (kw["points"], 2))
+    cache_dir = config.cache_dir
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        config.cache_dir = tmp_dir
+        for n_nodes in parse_int_list(kw["nodes"]):
+            nodes = random.uniform(0, 1, (n_nodes, 2))
+            value = 1 + numpy.sin(3 * nodes[:, 0]) + nodes[:, 1] ** 2
+            index = pandas.MultiIndex.from_arrays(nodes.T, names=["x", "y"])
+            table = BaseTable(
+                pandas.DataFrame({"value": value, "unc+": value, "unc-": value}, index)
+            )
+            cold = ScipyMultiDimensionalInterpolator(cache=False)
+            cached = ScipyMultiDimensionalInterpolator()
+            fit = cached.interpolate(table)  # fill the cache
+            t_cold = measure(lambda: cold.interpolate(table), repeat=kw["repeat"])
+            t_cached = measure(lambda: cached.interpolate(table), repeat=kw["repeat"])
+            t_scipy_build = measure(
+                lambda: scipy.interpolate.LinearNDInterpolator(nodes, value),
+                repeat=kw["repeat"],
+            )
+            scipy_fit = scipy.interpolate.LinearNDInterpolator(nodes, value)
+            t_eval = measure(lambda: fit.f0_batch(xs), repeat=kw["repeat"])
+            t_scipy_eval = measure(lambda: scipy_fit(xs), repeat=kw["repeat"])
+            results.append(
+                (n_nodes, t_cold, t_cached, t_scipy_build, t_eval, t_scipy_eval)
+            )
+    finally:
+        config.cache_dir = cache_dir
+        shutil.rmtree(tmp_dir)
+    header = ["nodes", "build[s]", "cached[s]", "scipy_build[s]"]
+    print_table(header + ["eval[s]", "scipy_eval[s]"], results)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--fraction", default=0.1, help="Tolerated deviation / uncertainty.")
+@click.option("--points", default="1e5,1e6", help="Comma-separated point counts.")
+@click.option("--repeat", default=3, help="Repeat count for each measurement.")
+def lut(**kw):  # type: ignore
+    """Measure lookup tables given by Interpolation.tabulate.
+
+    Shows the time to tabulate, the number of the grid points, the largest
+    deviation relative to the uncertainty, and tuple_batch of the lookup
+    table compared with the original interpolation.
+    """
+    results = []
+    random = numpy.random.RandomState(0)
+    for label, fit, bounds in _sample_interpolations():
+        t_build = measure(lambda: fit.tabulate(kw["fraction"]), repeat=1)
+        table = fit.tabulate(kw["fraction"])
+        nodes = table._f_stack.f_bar.values.size // 3
+        for n_points in parse_int_list(kw["points"]):
+            xs = numpy.column_stack(
+                [random.uniform(lo, hi, n_points) for lo, hi in bounds]
+            )
+            exact = numpy.array(fit.tuple_batch(xs))
+            approx = numpy.array(table.tuple_batch(xs))
+            deviation = abs(approx - exact)
+            deviation[1:] = abs(approx[0] + approx[1:] - exact[0] - exact[1:])
+            ratio = deviation.max(axis=0) / numpy.minimum(exact[1], -exact[2])
+            t_exact = measure(lambda: fit.tuple_batch(xs), repeat=kw["repeat"])
+            t_lut = measure(lambda: table.tuple_batch(xs), repeat=kw["repeat"])
+            results.append(
+                (label, nodes, t_build, n_points, ratio.max(), t_exact, t_lut)
+            )
+    header = ["interpolation", "nodes", "build[s]", "points", "max_dev/unc"]
+    print_table(header + ["exact[s]", "lut[s]"], results)
+
+
+_STARTUP_SNIPPET = """
+import atexit, sys
+atexit.register(lambda: sys.stderr.write("\\nHEAVY=%d\\n" % any(
+    m.split(".")[0] in ("pandas", "scipy") for m in sys.modules)))
+from susy_cross_section.scripts import main
+main(sys.argv[1:])
+"""
+
+_STARTUP_COMMANDS = [
+    ("--version", True),
+    ("--help", True),
+    ("list", True),
+    ("list --all --full", True),
+    ("get --no-server 13TeV.ss10 600 700", False),
+    ("show 13TeV.slepslep.ll", False),
+]
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--repeat", default=5, help="Repeat count for each measurement.")
+def startup(**kw):  # type: ignore
+    """Measure the start-up time of sub-commands in new processes.
+
+    Exits with an error if a light sub-command imports pandas or scipy.
+    """
+    results = []
+    regressions = []
+    for command, light in _STARTUP_COMMANDS:
+        args = [sys.executable, "-c", _STARTUP_SNIPPET] + command.split()
+
+        def run():  # type: ignore
+            return subprocess.run(args, capture_output=True, check=True, text=True)
+
+        heavy = "HEAVY=1" in run().stderr
+        t = measure(run, repeat=kw["repeat"])
+        results.append((command, t * 1e3, "yes" if heavy else "no"))
+        if light and heavy:
+            regressions.append(command)
+    print_table(["command", "time[ms]", "pandas/scipy"], results)
+    if regressions:
+        raise click.ClickException(
+            "Light commands import pandas/scipy: {}".format(", ".join(regressions))
+        )
+
+
+if __name__ == "__main__":
+    main()
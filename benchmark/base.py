@@ -0,0 +1,113 @@
+"""Utility functions for benchmarks."""
+
+import json
+import logging
+import pathlib  # noqa: F401
+import timeit
+from typing import Any, Callable, List, Sequence, Tuple  # noqa: F401
+
+import numpy
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def measure(func, repeat=3, number=1):
+    # type: (Callable[[], Any], int, int)->float
+    """Return the best time per call of `func` in seconds."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def parse_int_list(text):
+    # type: (str)->List[int]
+    """Parse comma-separated integers, allowing exponential notation."""
+    return [int(float(s)) for s in text.split(",") if s.strip()]
+
+
+def print_table(header, rows):
+    # type: (Sequence[str], Sequence[Sequence[Any]])->None
+    """Print a benchmark result as a tab-separated table."""
+    print("\t".join(header))
+    for row in rows:
+        print("\t".join(_format_cell(c) for c in row))
+
+
+def _format_cell(obj):
+    # type: (Any)->str
+    if isinstance(obj, float):
+        return "{:.4g}".format(obj)
+    return str(obj)
+
+
+def write_synthetic_grid(directory, n_rows, seed=0):
+    # type: (pathlib.Path, int, int)->Tuple[pathlib.Path, pathlib.Path]
+    """Write a two-parameter grid with NLL-fast-like columns.
+
+    The grid has about `n_rows` rows on a square mesh, a central value with
+    absolute scale uncertainties, and relative "pdf" and "signed" uncertainties
+    so that all the uncertainty types are exercised.
+    """
+    side = max(int(n_rows ** 0.5), 2)
+    m1, m2 = numpy.meshgrid(
+        numpy.arange(side) * 5.0 + 100, numpy.arange(side) * 5.0 + 100
+    )
+    m1, m2 = m1.ravel(), m2.ravel()
+    random = numpy.random.RandomState(seed)
+    xsec = 1e4 * (m1 * m2 / 1e4) ** -4
+    columns = [
+        m1,
+        m2,
+        xsec,
+        xsec * random.uniform(0.05, 0.2, len(xsec)),
+        -xsec * random.uniform(0.05, 0.2, len(xsec)),
+        random.uniform(1, 10, len(xsec)),
+        random.uniform(1, 10, len(xsec)),
+        random.uniform(-5, 5, len(xsec)),
+        random.uniform(-5, 5, len(xsec)),
+    ]
+    names = ["m1", "m2", "xsec", "scale+", "scale-", "pdf+", "pdf-", "sys1", "sys2"]
+    units = ["GeV", "GeV", "pb", "pb", "pb", "%", "%", "%", "%"]
+
+    grid_path = directory / "synthetic_{}.csv".format(len(xsec))
+    info_path = grid_path.with_suffix(".info")
+    numpy.savetxt(
+        str(grid_path),
+        numpy.array(columns).T,
+        delimiter=",",
+        header=",".join(names),
+        comments="",
+    )
+    info = {
+        "document": {"title": "synthetic grid for benchmark"},
+        "attributes": {
+            "processes": "p p > x x",
+            "collider": "pp",
+            "ecm": "13TeV",
+            "order": "NLO",
+            "pdf_name": "none",
+        },
+        "columns": [{"name": n, "unit": u} for n, u in zip(names, units)],
+        "parameters": [
+            {"column": "m1", "granularity": 1},
+            {"column": "m2", "granularity": 1},
+        ],
+        "values": [
+            {
+                "column": "xsec",
+                "unc+": [
+                    {"column": "scale+", "type": "absolute"},
+                    {"column": "pdf+", "type": "relative"},
+                    {"column": ["sys1", "sys2"], "type": "relative,signed"},
+                ],
+                "unc-": [
+                    {"column": "scale-", "type": "absolute"},
+                    {"column": "pdf-", "type": "relative"},
+                    {"column": ["sys1", "sys2"], "type": "relative,signed"},
+                ],
+            }
+        ],
+    }
+    with open(str(info_path), "w") as f:
+        json.dump(info, f)
+    return grid_path, info_path
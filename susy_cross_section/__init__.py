@@ -1 +1,18 @@
 """Module to handle CSV-like data of SUSY cross section."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+from typing import Any  # noqa: F401
+
+
+def load(key_or_path, info_path=None):
+    # type: (Any, Any)->Any
+    """Return a shared `File` object, loading it only on the first request.
+
+    This is a shortcut to :func:`susy_cross_section.registry.load`, which
+    imports the registry on the first call so that importing this package
+    stays light.
+    """
+    from susy_cross_section.registry import load as registry_load
+
+    return registry_load(key_or_path, info_path)
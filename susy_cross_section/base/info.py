@@ -492,12 +492,50 @@ class FileInfo(object):
         FileInfo
             Constructed instance.
         """
-        obj = cls()
         with open(source.__str__()) as f:  # py2
-            obj._load(**(json.load(f)))
+            return cls.from_json(json.load(f))
+
+    @classmethod
+    def from_json(cls, json_obj):
+        # type: (Any)->FileInfo
+        """Initialize an instance from valid json data.
+
+        Parameters
+        ----------
+        json_obj: Any
+            a valid json object, i.e., the content of an info file.
+
+        Returns
+        -------
+        FileInfo
+            Constructed instance.
+        """
+        obj = cls()
+        obj._load(**json_obj)
         obj.validate()
         return obj
 
+    def to_json(self):
+        # type: ()->MutableMapping[str, Any]
+        """Serialize the object to a json data.
+
+        The returned data can be loaded by :meth:`load` if dumped to a file.
+        File-level "attributes" are not generated because `ValueInfo` objects
+        already have them merged.
+
+        Returns
+        -------
+        dict(str, Any)
+            The json data describing the object.
+        """
+        return {
+            "document": self.document,
+            "columns": [c.to_json() for c in self.columns],
+            "parameters": [p.to_json() for p in self.parameters],
+            "values": [v.to_json() for v in self.values],
+            "reader_options": self.reader_options,
+        }
+
     def _load(self, **kw):
         # type: (Any)->None
         """Load and construct FileInfo from keyword arguments.
@@ -9,27 +9,34 @@ annotations.
 
 from __future__ import absolute_import, division, print_function  # py2
 
+import collections
 import itertools
 import json
 import logging
-import pathlib  # noqa: F401
+import pathlib
 import sys
 from typing import (  # noqa: F401
     Any,
+    Callable,
     Generic,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
     Optional,
     Sequence,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
 )
 
+import numpy
 import pandas
 
+import susy_cross_section.config as config
+import susy_cross_section.storage as storage
 from susy_cross_section.base.info import FileInfo, UncSpecType, ValueInfo
 from susy_cross_section.utility import Unit
 
@@ -44,7 +51,7 @@ logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 PathLike = Union[pathlib.Path, str]
-TableT = TypeVar("TableT", bound="BaseTable", covariant=True)
+TableT = TypeVar("TableT", bound="BaseTable")
 
 
 class BaseTable(object):
@@ -64,19 +71,45 @@ class BaseTable(object):
     """
 
     def __init__(self, obj=None, file=None, name=None):
-        # type:(pandas.DataFrame, Optional[BaseFile[BaseTable]], Optional[str])->None
+        # type:(pandas.DataFrame, Optional[BaseFile[Any]], Optional[str])->None
         if isinstance(obj, pandas.DataFrame):
             self._df = obj  # type: pandas.DataFrame
         else:
             self._df = pandas.DataFrame()
-        self.file = file  # type: Optional[BaseFile[BaseTable]]
+        self.file = file  # type: Optional[BaseFile[Any]]
         self.name = name  # type: Optional[str]
 
     def __getattr__(self, name):
         # type: (str)->Any
         """Fall-back method to delegate any operations to the DataFrame."""
+        if "_df" not in self.__dict__:
+            # not delegated, e.g., while unpickling before `_df` is set
+            raise AttributeError(name)
         return self._df.__getattr__(name)
 
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        """Return the state for pickling.
+
+        If the table belongs to a file attached to shared memory, the data is
+        not pickled but taken from the file on unpickling.
+        """
+        if (
+            self.file is not None
+            and self.file._shared_path is not None
+            and self.name in self.file.tables
+            and self.file.tables[self.name] is self
+        ):
+            return {"file": self.file, "name": self.name}
+        return {"_df": self._df, "file": self.file, "name": self.name}
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        """Restore the state from pickle."""
+        self.__dict__.update(state)
+        if "_df" not in state:
+            self._df = state["file"].tables[state["name"]]._df
+
     def __setitem__(self, name, obj):
         # type: (str, Any)->Any
         """Perform DataFrame.__setitem__."""
@@ -92,6 +125,209 @@ class BaseTable(object):
         """Dump the data-frame."""
         return cast(str, self._df.__str__())
 
+    def __repr__(self):
+        # type: ()->str
+        """Show the name, the number of rows, and the grid layout."""
+        name = "" if self.name is None else " {}".format(self.name)
+        names = self._df.index.names
+        axes = ["{}: {}".format(n, a) for n, a in zip(names, self.layout())]
+        return "<{}{}: {} rows; {}>".format(
+            type(self).__name__, name, len(self._df), "; ".join(axes)
+        )
+
+    def granularities(self):
+        # type: ()->List[Optional[float]]
+        """Return the granularity of each parameter, or None if not specified.
+
+        The granularities are given by the `ParameterInfo` of the file, in the
+        order of the index levels.
+        """
+        if self.file is None:
+            return [None] * self._df.index.nlevels
+        info = {p.column: p.granularity for p in self.file.info.parameters}
+        return [info.get(name) for name in self._df.index.names]
+
+    def layout(self):
+        # type: ()->List[str]
+        """Return the description of the grid points along each parameter.
+
+        Each parameter is described as "uniform" if the grid points are
+        equally spaced, "log-uniform" if equally spaced in logarithm, or
+        "irregular", up to the quantization by the granularity. The
+        interpolators detect the same spacing in their axes to locate the
+        grid cells arithmetically.
+        """
+        index = self._df.index
+        return [
+            _describe_axis(numpy.unique(index.get_level_values(i).to_numpy(float)), g)
+            for i, g in enumerate(self.granularities())
+        ]
+
+
+def _describe_axis(points, granularity):
+    # type: (numpy.ndarray, Optional[float])->str
+    """Return the description of the sorted grid points; see `BaseTable.layout`."""
+    text = "{} point{}".format(len(points), "" if len(points) == 1 else "s")
+    if len(points) < 2:
+        return text
+    tolerance = (granularity or 0) / 2
+    spacing = uniform_spacing(points, tolerance)
+    if spacing:
+        return text + ", uniform step {:g}".format(spacing[1])
+    if points[0] > 0:
+        spacing = uniform_spacing(numpy.log(points), tolerance / points[0])
+        if spacing:
+            return text + ", log-uniform ratio {:g}".format(numpy.exp(spacing[1]))
+    return text + ", irregular"
+
+
+def uniform_spacing(points, tolerance=0.0):
+    # type: (numpy.ndarray, float)->Optional[Tuple[float, float]]
+    """Return the start and the step if the sorted points are equally spaced.
+
+    The points may deviate from the arithmetic progression by the tolerance,
+    e.g., half of the granularity for quantized parameters, in addition to
+    round-off errors. Deviations of a quarter of the step or more are never
+    tolerated, so that the cell of a value estimated by the arithmetic
+    progression is off by at most one.
+
+    Returns
+    -------
+    tuple(float, float), optional
+        The first point and the step, or None if not equally spaced.
+    """
+    n = len(points)
+    if n < 2:
+        return (float(points[0]), 0.0) if n else None
+    start, step = float(points[0]), (float(points[-1]) - float(points[0])) / (n - 1)
+    deviation = numpy.abs(points - (start + step * numpy.arange(n))).max()
+    bound = tolerance + 1e-9 * max(abs(start), abs(float(points[-1])), step)
+    if step > 0 and deviation <= bound and deviation < step / 4:
+        return start, step
+    return None
+
+
+class _LazyTables(MutableMapping[str, TableT]):
+    """Dictionary of tables, each of which is built on first access.
+
+    Arguments
+    ---------
+    names: list of str
+        Keys of the tables.
+    builder: function of str to BaseTable
+        The function to build a table for a key.
+    """
+
+    def __init__(self, names, builder):
+        # type: (Sequence[str], Callable[[str], TableT])->None
+        self._names = list(names)  # type: List[str]
+        self._builder = builder
+        self._tables = {}  # type: MutableMapping[str, TableT]
+
+    def __getitem__(self, key):
+        # type: (str)->TableT
+        """Return the table, building it if not yet."""
+        if key not in self._tables:
+            if key not in self._names:
+                raise KeyError(key)
+            self._tables[key] = self._builder(key)
+        return self._tables[key]
+
+    def __setitem__(self, key, table):
+        # type: (str, TableT)->None
+        """Set a table."""
+        if key not in self._names:
+            self._names.append(key)
+        self._tables[key] = table
+
+    def __delitem__(self, key):
+        # type: (str)->None
+        """Remove a table."""
+        if key not in self._names:
+            raise KeyError(key)
+        self._names.remove(key)
+        self._tables.pop(key, None)
+
+    def __iter__(self):
+        # type: ()->Iterator[str]
+        """Iterate over the keys without building tables."""
+        return iter(list(self._names))
+
+    def __len__(self):
+        # type: ()->int
+        """Return the number of tables including those not built yet."""
+        return len(self._names)
+
+    def is_built(self, key):
+        # type: (str)->bool
+        """Return whether the table for the key is already built."""
+        return key in self._tables
+
+
+def read_numeric_columns(
+    path,  # type: PathLike
+    names,  # type: Sequence[str]
+    columns,  # type: Sequence[str]
+    reader_options,  # type: Mapping[str, Any]
+):
+    # type: (...)->Optional[Mapping[str, numpy.ndarray]]
+    """Read numeric columns of a simple table file without pandas.
+
+    Whitespace- or comma-separated files are parsed by `numpy.loadtxt` into
+    float64 arrays, each of which is contiguous. Only the options
+    ``skiprows``, ``delim_whitespace``, ``skipinitialspace``, and ``sep`` (or
+    ``delimiter``) of :ar:`reader_options` are supported, with the same meaning
+    as in `pandas.read_csv`; blank lines are ignored.
+
+    Arguments
+    ---------
+    path: str or pathlib.Path
+        Path to the data file.
+    names: list of str
+        Names of all the columns in the file.
+    columns: list of str
+        Names of the columns to read.
+    reader_options: dict(str, Any)
+        Options for `pandas.read_csv`.
+
+    Returns
+    -------
+    dict(str, numpy.ndarray), optional
+        The columns, or None if the options are not supported or the file is
+        not parsed as a numeric table.
+    """
+    options = dict(reader_options)
+    skiprows = options.pop("skiprows", [0])
+    if not isinstance(skiprows, int):
+        if list(skiprows) != list(range(len(skiprows))):
+            return None
+        skiprows = len(skiprows)
+    delimiter = options.pop("sep", options.pop("delimiter", ","))
+    if options.pop("delim_whitespace", False) or delimiter == r"\s+":
+        delimiter = None
+    elif delimiter != ",":
+        return None
+    options.pop("skipinitialspace", None)  # spaces around numbers are ignored
+    if options:
+        return None
+
+    try:
+        data = numpy.loadtxt(
+            str(path),
+            dtype=numpy.float64,
+            delimiter=delimiter,
+            skiprows=skiprows,
+            usecols=[names.index(c) for c in columns],
+            ndmin=2,
+            comments=None,
+            encoding="utf-8",
+        )
+    except (ValueError, IndexError) as e:
+        logger.debug("Fall back to pandas for %s: %s", path, e)
+        return None
+    data = numpy.ascontiguousarray(data.T)
+    return collections.OrderedDict(zip(columns, data))
+
 
 class BaseFile(Generic[TableT]):
     """File with table data-sets and annotations.
@@ -109,6 +345,23 @@ class BaseFile(Generic[TableT]):
 
         If unspecified, `!table_path` with suffix changed to ``".info"`` is
         used.
+    use_cache: bool, optional
+        Whether to use the on-disk cache of the parsed tables.
+
+        If unspecified, :data:`config.use_cache` is used. The cache is keyed by
+        the contents of the data and info files, so it is automatically
+        invalidated if either file is modified.
+    lazy: bool
+        Whether to build each table on its first access.
+
+        If False, all the tables are built in initialization, which was the
+        original behavior. Lazy loading is ignored if the cache is used.
+    values: list of str, optional
+        Names of the values to load.
+
+        If specified, only the tables for the values are available, and only
+        the columns required for them, i.e., the parameters, the values, and
+        their uncertainty sources, are read from the data file.
 
     Attributes
     ----------
@@ -118,11 +371,17 @@ class BaseFile(Generic[TableT]):
         Path to the info file.
     raw_data: pandas.DataFrame
         the content of `!table_path`.
+
+        This is read by `pandas.read_csv` on first access, while the tables are
+        built from the numeric columns read by `read_numeric_columns`.
     info: FileInfo
         the content of `!info_path`.
     tables: dict(str, BaseTable)
         The table parsed according to the annotation.
 
+        If :ar:`lazy` is True, this is a lazy mapping, which looks like a dict
+        but builds each table on first access.
+
         Each value is practically a `pandas.DataFrame` object and indexed
         according to the parameter specified in `!info`, having exactly three
         value-columns: ``"value"``, ``"unc+"``, and ``"unc-"`` for the central
@@ -130,15 +389,27 @@ class BaseFile(Generic[TableT]):
         respectively. The content of ``"unc-"`` is non-positive.
     """
 
-    def __init__(self, table_path, info_path=None):
-        # type: (Union[PathLike, BaseFile[TableT]], Optional[PathLike])->None
+    _cache_format = 2  # to be incremented if the cache content is changed.
+
+    def __init__(
+        self,
+        table_path,  # type: Union[PathLike, BaseFile[TableT]]
+        info_path=None,  # type: Optional[PathLike]
+        use_cache=None,  # type: Optional[bool]
+        lazy=True,  # type: bool
+        values=None,  # type: Optional[Sequence[str]]
+    ):
+        # type: (...)->None
         if isinstance(table_path, BaseFile):
             # copy constructor
             assert info_path is None  # or invalid use of copy constructor
             self.table_path = table_path.table_path  # type: pathlib.Path
             self.info_path = table_path.info_path  # type: pathlib.Path
             self.info = table_path.info  # type: FileInfo
-            self.raw_data = table_path.raw_data  # type: pandas.DataFrame
+            self._raw_data = table_path._raw_data  # type: Optional[pandas.DataFrame]
+            self._data = table_path._data  # type: Optional[pandas.DataFrame]
+            self._index = table_path._index  # type: Optional[pandas.Index]
+            self._shared_path = table_path._shared_path  # type: Optional[pathlib.Path]
             self.tables = table_path.tables  # type: MutableMapping[str, TableT]
             return
 
@@ -146,73 +417,190 @@ class BaseFile(Generic[TableT]):
         self.info_path = pathlib.Path(
             info_path if info_path else self.table_path.with_suffix(".info")
         )
+        self._raw_data = None
+        self._data = None
+        self._index = None
+        self._shared_path = None
+
+        if config.use_cache if use_cache is None else use_cache:
+            self._load_with_cache()
+            if values is not None:
+                self.tables = {name: self.tables[name] for name in values}
+        else:
+            self._load(lazy, values)
 
+    def _load(self, lazy=False, values=None):
+        # type: (bool, Optional[Sequence[str]])->None
+        """Load the info file and parse the data file."""
         self.info = FileInfo.load(self.info_path)
-        self.raw_data = self._read_csv(self.table_path)
-
         # validate annotation before actual load
         self.info.validate()
-        # and do actual loading
-        self.tables = self._parse_data()
-        self.validate()
 
-    def _read_csv(self, path):
-        # type: (pathlib.Path)->pandas.DataFrame
+        names = [v.column for v in self.info.values] if values is None else list(values)
+        self._data = self._read_columns(self._required_columns(names))
+
+        self.validate()
+        # and do actual loading
+        self.tables = self._parse_data(names)
+        if not lazy:
+            self.tables = dict(self.tables)  # build all the tables
+
+    @property
+    def raw_data(self):
+        # type: ()->pandas.DataFrame
+        """Return the content of the data file, reading it if not yet."""
+        if self._raw_data is None:
+            self._raw_data = self._read_csv(self.table_path)
+        return self._raw_data
+
+    def _table_data(self):
+        # type: ()->pandas.DataFrame
+        """Return the numeric columns used to build the tables."""
+        if self._data is None:
+            names = [v.column for v in self.info.values]
+            self._data = self._read_columns(self._required_columns(names))
+        return self._data
+
+    def _required_columns(self, names):
+        # type: (Sequence[str])->List[str]
+        """Return the columns required to build tables of the values.
+
+        Raises
+        ------
+        KeyError
+            If a name is not found in the values.
+        """
+        value_dict = {v.column: v for v in self.info.values}
+        required = {p.column for p in self.info.parameters}
+        for name in names:
+            value_info = value_dict[name]
+            required.add(value_info.column)
+            for cols, _ in itertools.chain(value_info.unc_p, value_info.unc_m):
+                required.update(cols)
+        return [c.name for c in self.info.columns if c.name in required]
+
+    def _read_csv(self, path, columns=None):
+        # type: (pathlib.Path, Optional[Sequence[str]])->pandas.DataFrame
         """Read a csv file and return the content.
 
-        Internally, call `pandas.read_csv` with `!reader_options`.
+        Internally, call `pandas.read_csv` with `!reader_options`. If
+        :ar:`columns` is specified, only the columns are read. Columns of values
+        and uncertainties are read as float without type inference.
         """
+        numeric_columns = set()  # type: Set[str]
+        for v in self.info.values:
+            numeric_columns.add(v.column)
+            for cols, _ in itertools.chain(v.unc_p, v.unc_m):
+                numeric_columns.update(cols)
         reader_options = {
             "skiprows": [0],
             "names": [c.name for c in self.info.columns],
+            "dtype": {
+                c: numpy.float64
+                for c in numeric_columns
+                if columns is None or c in columns
+            },
         }  # default values
+        if columns is not None:
+            reader_options["usecols"] = list(columns)
         reader_options.update(self.info.reader_options)
         return pandas.read_csv(path, **reader_options)
 
-    def _parse_data(self):
-        # type: ()->MutableMapping[str, TableT]
-        """Load and prepare data from the specified paths."""
-        tables = {}  # type: MutableMapping[str, TableT]
-
-        def calc(row, unc_sources, sign):
-            # type: (pandas.Series, List[UncSpecType], int)->float
-            """Calculate uncertainty from a row in normalized dataframe."""
-            unc_components = []  # type: List[float]
-            for source, unc_type in unc_sources:  # iterate over sources
-                if "signed" in unc_type.split(","):
-                    # use only the correct-signed uncertainties
-                    unc_candidates = [abs(row[c]) for c in source if row[c] * sign > 0]
-                else:
-                    unc_candidates = [abs(row[c]) for c in source]
-                unc_components.append(max(unc_candidates) if unc_candidates else 0)
-            return sum(i ** 2 for i in unc_components) ** 0.5
+    def _read_columns(self, columns):
+        # type: (Sequence[str])->pandas.DataFrame
+        """Read the specified numeric columns of the data file.
 
+        The fast reader `read_numeric_columns` is used if it supports the
+        format; otherwise the file is read by `pandas.read_csv`.
+        """
+        names = [c.name for c in self.info.columns]
+        arrays = read_numeric_columns(
+            self.table_path, names, columns, self.info.reader_options
+        )
+        if arrays is None:
+            return self._read_csv(self.table_path, columns)
+        return pandas.DataFrame(arrays, columns=list(columns))
+
+    def _parse_data(self, names=None):
+        # type: (Optional[Sequence[str]])->MutableMapping[str, TableT]
+        """Prepare tables, which are built on first access."""
+        if names is None:
+            names = [v.column for v in self.info.values]
+        return _LazyTables(names, self._build_table)
+
+    def _build_table(self, name):
+        # type: (str)->TableT
+        """Build the table for the value with the specified name."""
         for value_info in self.info.values:
-            name = value_info.column
-            data = self._prepare_normalized_data(value_info)
-            tables[name] = cast(TableT, BaseTable(file=self, name=name))
-            tables[name]["value"] = data[name]
-            for key, row in data.iterrows():
-                tables[name].loc[key, "unc+"] = calc(row, value_info.unc_p, +1)
-                tables[name].loc[key, "unc-"] = calc(row, value_info.unc_m, -1)
+            if value_info.column == name:
+                break
+        else:
+            raise KeyError(name)
+        data = self._prepare_normalized_data(value_info)
+        df = pandas.DataFrame(
+            {
+                "value": data[name],
+                "unc+": self._combine_uncertainties(data, value_info.unc_p, +1),
+                "unc-": self._combine_uncertainties(data, value_info.unc_m, -1),
+            },
+            index=data.index,
+            columns=["value", "unc+", "unc-"],
+        )
+        return self._new_table(df, name)
 
-        return tables
+    def _new_table(self, df, name):
+        # type: (pandas.DataFrame, str)->TableT
+        """Return a table object for the data-frame; overridden in subclasses."""
+        return cast(TableT, BaseTable(df, file=self, name=name))
 
-    def _prepare_normalized_data(self, value_info):
-        # type: (ValueInfo)->pandas.DataFrame
-        """Quantize parameters and normalize columns to value_info.column."""
-        data = self.raw_data.copy()
+    @staticmethod
+    def _combine_uncertainties(data, unc_sources, sign):
+        # type: (pandas.DataFrame, List[UncSpecType], int)->numpy.ndarray
+        """Calculate uncertainty column-wise from a normalized dataframe.
 
-        def quantize(data_frame, granularity):
-            # type: (pandas.DataFrame, float)->pandas.DataFrame
-            return (data_frame / granularity).apply(round) * granularity
+        For each source, the largest absolute value among its columns is taken,
+        where only the correct-signed columns are considered for "signed"
+        sources; the components are then summed in quadrature.
 
-        # set index by the quantized values
-        for p in self.info.parameters:
-            if p.granularity:
-                data[p.column] = quantize(data[p.column], p.granularity)
-        data.set_index([p.column for p in self.info.parameters], inplace=True)
+        `numpy.float_power` is used for powers, as it calls the same C-library
+        function as Python's ``**`` operator and thus the result is identical
+        to the row-by-row calculation.
+        """
+        squared_sum = numpy.zeros(len(data))
+        for source, unc_type in unc_sources:  # iterate over sources
+            if not source:
+                continue
+            columns = data[source].to_numpy(dtype=float)  # shape (rows, source)
+            candidates = numpy.abs(columns)
+            if "signed" in unc_type.split(","):
+                # use only the correct-signed uncertainties
+                candidates = numpy.where(columns * sign > 0, candidates, 0.0)
+            squared_sum = squared_sum + numpy.float_power(candidates.max(axis=1), 2)
+        return cast(numpy.ndarray, numpy.float_power(squared_sum, 0.5))
+
+    def _parameter_index(self):
+        # type: ()->pandas.Index
+        """Return the index given by the quantized parameters.
+
+        The index is common to all the values and thus computed only once.
+        """
+        if self._index is None:
+            columns = [p.column for p in self.info.parameters]
+            data = self._table_data()[columns].copy()
+
+            def quantize(data_frame, granularity):
+                # type: (pandas.DataFrame, float)->pandas.DataFrame
+                return (data_frame / granularity).apply(round) * granularity
 
+            for p in self.info.parameters:
+                if p.granularity:
+                    data[p.column] = quantize(data[p.column], p.granularity)
+            self._index = data.set_index(columns).index
+        return self._index
+
+    def _prepare_normalized_data(self, value_info):
+        # type: (ValueInfo)->pandas.DataFrame
+        """Quantize parameters and normalize columns to value_info.column."""
         # collect columns to use
         abs_columns, rel_columns = set(), set()  # type: Set[str], Set[str]
         for unc_cols, unc_type in itertools.chain(value_info.unc_p, value_info.unc_m):
@@ -222,6 +610,16 @@ class BaseFile(Generic[TableT]):
         assert abs_columns.isdisjoint(rel_columns)
 
         name = value_info.column
+        parameters = {p.column for p in self.info.parameters}
+        columns = [
+            c
+            for c in self._table_data().columns
+            if c not in parameters
+            and (c == name or c in abs_columns or c in rel_columns)
+        ]
+        data = self._table_data()[columns].copy()
+        data.index = self._parameter_index()
+
         value_unit = Unit(self.info.get_column(name).unit)
         for col in data.columns:
             if col == value_info.column:
@@ -235,19 +633,178 @@ class BaseFile(Generic[TableT]):
             elif col in rel_columns:
                 unc_unit = Unit(self.info.get_column(col).unit) * value_unit
                 data[col] = data[name] * data[col] * float(unc_unit / value_unit)
-            else:
-                data.drop(col, axis=1, inplace=True)
         return data
 
+    # ------------- #
+    # cache control #
+    # ------------- #
+
+    def _cache_path(self):
+        # type: ()->pathlib.Path
+        """Return the path to the cache file for the data and info files."""
+        key = storage.content_hash(self.table_path, self.info_path)
+        return storage.cache_dir() / "files" / "{}.bin".format(key)
+
+    def _load_with_cache(self):
+        # type: ()->None
+        """Restore the tables from cache if available, or load and store them."""
+        path = self._cache_path()
+        if path.is_file():
+            try:
+                self._restore(*storage.load(path))
+                return
+            except (ValueError, KeyError, TypeError, IOError, OSError) as e:
+                logger.warning("Cache %s is ignored: %s", path.__str__(), e)
+        self._load()
+        try:
+            storage.dump(path, *self._serialize())
+        except (IOError, OSError) as e:
+            logger.warning("Failed to write cache %s: %s", path.__str__(), e)
+
+    def _serialize(self):
+        # type: ()->Tuple[Mapping[str, Any], Mapping[str, numpy.ndarray]]
+        """Return the info and the tables as metadata and arrays.
+
+        The values of each table are stored as one two-dimensional array, from
+        which a data-frame is constructed without copy.
+        """
+        specs = []  # type: List[Mapping[str, Any]]
+        arrays = {}  # type: MutableMapping[str, numpy.ndarray]
+        for i, (name, table) in enumerate(self.tables.items()):
+            index = table.index
+            specs.append(
+                {
+                    "name": name,
+                    "index_names": list(index.names),
+                    "columns": list(table.columns),
+                }
+            )
+            for j in range(index.nlevels):
+                arrays["{}/index/{}".format(i, j)] = index.get_level_values(j).values
+            arrays["{}/values".format(i)] = table._df.to_numpy(dtype=numpy.float64)
+        meta = {
+            "format": self._cache_format,
+            "table_path": self.table_path.__str__(),  # py2
+            "info_path": self.info_path.__str__(),  # py2
+            "info": self.info.to_json(),
+            "tables": specs,
+        }
+        return meta, arrays
+
+    def _restore(self, meta, arrays):
+        # type: (Mapping[str, Any], Mapping[str, numpy.ndarray])->None
+        """Restore the info and the tables from metadata and arrays."""
+        if meta.get("format") != self._cache_format:
+            raise ValueError("Cache format mismatch.")
+        self.info = FileInfo.from_json(meta["info"])
+        self.tables = {}
+        for i, spec in enumerate(meta["tables"]):
+            names = spec["index_names"]
+            levels = [arrays["{}/index/{}".format(i, j)] for j in range(len(names))]
+            if len(levels) == 1:
+                index = pandas.Index(levels[0], name=names[0])
+            else:
+                index = pandas.MultiIndex.from_arrays(levels, names=names)
+            df = pandas.DataFrame(
+                arrays["{}/values".format(i)],
+                index=index,
+                columns=spec["columns"],
+                copy=False,
+            )
+            self.tables[spec["name"]] = self._new_table(df, spec["name"])
+
+    # --------------------------------- #
+    # pickling and shared-memory export #
+    # --------------------------------- #
+
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        """Return the state for pickling.
+
+        All the tables are built and pickled with the info, while the raw data
+        and intermediate data are dropped; they are read again on demand. A file
+        attached to shared memory is pickled as the path to the shared block.
+        """
+        state = {
+            "table_path": self.table_path,
+            "info_path": self.info_path,
+            "_shared_path": self._shared_path,
+        }  # type: MutableMapping[str, Any]
+        if self._shared_path is None:
+            state["info"] = self.info
+            state["tables"] = dict(self.tables)
+        return state
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        """Restore the state from pickle."""
+        self.__dict__.update(state)
+        self._raw_data = None
+        self._data = None
+        self._index = None
+        if self._shared_path is not None:
+            self._restore(*storage.load(self._shared_path, mmap=True))
+
+    def export_shared(self, path=None):
+        # type: (Optional[PathLike])->pathlib.Path
+        """Export the tables and the info to a block in shared memory.
+
+        The block is a container file of `storage`, which is attached by
+        `attach_shared` in any processes on the same host; the numerical data
+        is memory-mapped and thus shared rather than copied. The block is not
+        removed automatically; remove the file when it is no longer used.
+
+        Arguments
+        ---------
+        path: str or pathlib.Path, optional
+            Path to the block. If unspecified, a new file is created in
+            `storage.shared_dir`.
+
+        Returns
+        -------
+        pathlib.Path
+            Path to the block.
+        """
+        if path is None:
+            path = storage.shared_path(prefix="file-")
+        path = pathlib.Path(path)
+        storage.dump(path, *self._serialize())
+        return path
+
+    @classmethod
+    def attach_shared(cls, path):
+        # type: (PathLike)->BaseFile[TableT]
+        """Return a file object attached to a block exported by `export_shared`.
+
+        The tables are read-only views of the memory-mapped block. Pickling the
+        returned object sends only the path, so that worker processes attach
+        to the same block.
+        """
+        path = pathlib.Path(path)
+        meta, arrays = storage.load(path, mmap=True)
+        obj = cls.__new__(cls)
+        obj.table_path = pathlib.Path(meta["table_path"])
+        obj.info_path = pathlib.Path(meta["info_path"])
+        obj._raw_data = None
+        obj._data = None
+        obj._index = None
+        obj._shared_path = path
+        obj._restore(meta, arrays)
+        return obj
+
     def validate(self):
         # type: ()->None
-        """Validate the Table data."""
-        for key, table in self.tables.items():
-            duplication = table.index[table.index.duplicated()]
-            for d in duplication:
-                raise ValueError("Found duplicated entries: %s, %s", key, d)
-                if len(duplication) > 5:
-                    raise ValueError("Maybe parameter granularity is set too large?")
+        """Validate the Table data.
+
+        As the tables share the parameter index, the index is validated instead
+        of each table so that lazy tables are not built.
+        """
+        index = self._parameter_index()
+        duplication = index[index.duplicated()]
+        for d in duplication:
+            raise ValueError("Found duplicated entries: %s", d)
+            if len(duplication) > 5:
+                raise ValueError("Maybe parameter granularity is set too large?")
 
     # ------------------ #
     # accessor functions #
@@ -0,0 +1,413 @@
+"""Catalog of the grid tables bundled in this package.
+
+Discovering tables by their contents requires reading all the info and grid
+files. The catalog is an index generated in advance, which records for every
+grid file in :data:`config.table_dir` its paths, the names, units, and bounds
+of the parameters, the hull of two-parameter grids, and the names, units, and
+`CrossSectionAttributes` of the values. It is stored as a JSON file in the
+data directory, shipped with this package, and regenerated on demand by
+`rebuild` (or ``susy-xs list --rebuild``) after the data files are modified.
+
+Loading the catalog reads only the JSON file, so that searching tables does
+not touch the data directory nor import pandas.
+
+=============== =======================================================
+`Catalog`       the index of the grid files
+`CatalogEntry`  an entry of the catalog, i.e., one grid file
+`load`          return the catalog, building it if not generated
+`rebuild`       generate the catalog file again from the data files
+=============== =======================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import copy
+import json
+import logging
+import pathlib
+import sys
+from typing import (  # noqa: F401
+    Any,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import susy_cross_section.config as config
+
+if sys.version_info[0] < 3:  # py2
+    str = basestring  # noqa: A001, F821
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+
+CATALOG_NAME = "catalog.json"
+"""Name of the catalog file in the data directory."""
+
+VERSION = 2
+"""Version of the catalog content, to be incremented if it is changed."""
+
+
+class CatalogEntry(object):
+    """An entry of the catalog, representing one grid file.
+
+    Attributes
+    ----------
+    key: str or None
+        The table key in :data:`config.table_names`, or None if the grid has
+        no predefined key.
+    table_path: str
+        Path to the grid file relative to :data:`config.table_dir`.
+    info_path: str
+        Path to the info file relative to :data:`config.table_dir`.
+    parameters: list of dict(str, Any)
+        The parameters with keys ``name``, ``unit``, ``min``, and ``max``,
+        where the latter two are the bounds of the grid.
+    hull: list of list of float, or None
+        For grids with two parameters, the rows ``[x, y_min, y_max]`` for each
+        grid value ``x`` of the first parameter, where ``y_min`` and ``y_max``
+        are the bounds of the second parameter on the grid line; otherwise
+        None.
+    values: list of dict(str, Any)
+        The values with keys ``name`` and ``unit``, and the attributes of
+        `CrossSectionAttributes`, i.e., ``processes``, ``collider``, ``ecm``,
+        ``order``, and ``pdf_name``.
+    """
+
+    def __init__(
+        self,
+        key,  # type: Optional[str]
+        table_path,  # type: str
+        info_path,  # type: str
+        parameters,  # type: List[Mapping[str, Any]]
+        values,  # type: List[Mapping[str, Any]]
+        hull=None,  # type: Optional[List[List[float]]]
+    ):
+        # type: (...)->None
+        self.key = key
+        self.table_path = table_path
+        self.info_path = info_path
+        self.parameters = parameters
+        self.values = values
+        self.hull = hull
+
+    def __repr__(self):
+        # type: ()->str
+        return "CatalogEntry(key={!r}, table_path={!r})".format(
+            self.key, self.table_path
+        )
+
+    def to_dict(self):
+        # type: ()->Mapping[str, Any]
+        """Return the JSON-serializable content, except the key."""
+        return {
+            "table_path": self.table_path,
+            "info_path": self.info_path,
+            "parameters": self.parameters,
+            "values": self.values,
+            "hull": self.hull,
+        }
+
+    def paths(self):
+        # type: ()->Tuple[pathlib.Path, pathlib.Path]
+        """Return the absolute paths to the grid file and the info file."""
+        base = config.package_dir / config.table_dir
+        return base / self.table_path, base / self.info_path
+
+    def matches(
+        self,
+        substr=None,  # type: Optional[Sequence[str]]
+        process=None,  # type: Optional[str]
+        collider=None,  # type: Optional[str]
+        ecm=None,  # type: Optional[str]
+        order=None,  # type: Optional[str]
+        pdf_name=None,  # type: Optional[str]
+        parameters=None,  # type: Optional[Sequence[str]]
+        point=None,  # type: Optional[Mapping[str, float]]
+    ):
+        # type: (...)->bool
+        """Return whether the entry satisfies all the specified conditions.
+
+        See `Catalog.search` for the arguments.
+        """
+        if substr:
+            texts = [self.key or "", self.table_path, self.info_path]
+            texts = [t.lower() for t in texts]
+            if not all(any(s.lower() in t for t in texts) for s in substr):
+                return False
+        names = [p["name"] for p in self.parameters]
+        if parameters and not all(p in names for p in parameters):
+            return False
+        if point:
+            bounds = {p["name"]: (p["min"], p["max"]) for p in self.parameters}
+            for name, x in point.items():
+                if name not in bounds or not bounds[name][0] <= x <= bounds[name][1]:
+                    return False
+        exact = {"collider": collider, "ecm": ecm, "order": order}
+        partial = {"pdf_name": pdf_name}
+        return any(
+            all(
+                v[k].lower() == cond.lower()
+                for k, cond in exact.items()
+                if cond is not None
+            )
+            and all(
+                cond.lower() in v[k].lower()
+                for k, cond in partial.items()
+                if cond is not None
+            )
+            and (process is None or any(process in p for p in v["processes"]))
+            for v in self.values
+        )
+
+
+class Catalog(object):
+    """The index of the grid files.
+
+    Arguments
+    ---------
+    entries: list of CatalogEntry
+        The entries; one entry for each predefined key, and one for each grid
+        file without keys.
+    """
+
+    def __init__(self, entries):
+        # type: (List[CatalogEntry])->None
+        self.entries = entries
+
+    def __iter__(self):
+        # type: ()->Any
+        return iter(self.entries)
+
+    def __len__(self):
+        # type: ()->int
+        return len(self.entries)
+
+    def search(self, predefined=False, **kw):
+        # type: (bool, Any)->List[CatalogEntry]
+        """Return the entries satisfying all the specified conditions.
+
+        Arguments
+        ---------
+        predefined: bool
+            Whether to return only the entries with predefined keys.
+        substr: list of str, optional
+            Strings to be contained in the key or the paths, case-insensitively.
+        process: str, optional
+            String to be contained in one of the processes.
+        collider: str, optional
+            The collider, e.g., ``"pp"``, compared case-insensitively.
+        ecm: str, optional
+            The collision energy, e.g., ``"13TeV"``, compared case-insensitively.
+        order: str, optional
+            The order of the calculation, e.g., ``"NLO+NLL"``, compared
+            case-insensitively.
+        pdf_name: str, optional
+            String to be contained in the PDF name, case-insensitively.
+        parameters: list of str, optional
+            Names of parameters the grid must have.
+        point: dict(str, float), optional
+            Parameter values that must be within the bounds of the grid.
+
+        Returns
+        -------
+        list of CatalogEntry
+            The entries, where the attribute conditions are satisfied by one
+            of the values of each entry.
+        """
+        return [
+            e
+            for e in self.entries
+            if (e.key is not None or not predefined) and e.matches(**kw)
+        ]
+
+    def dump(self, path):
+        # type: (PathLike)->None
+        """Write the catalog into a JSON file.
+
+        The keys are not written, but are assigned on loading according to
+        :data:`config.table_names`.
+        """
+        grids = _unique_sorted(
+            (e.table_path, e.info_path, e.to_dict()) for e in self.entries
+        )
+        content = {"version": VERSION, "grids": grids}
+        with open(str(path), "w") as f:
+            json.dump(content, f, indent=1, sort_keys=True)
+            f.write("\n")
+
+    @classmethod
+    def from_file(cls, path):
+        # type: (PathLike)->Catalog
+        """Read the catalog from a JSON file.
+
+        Raises
+        ------
+        ValueError
+            If the file is of another version.
+        """
+        with open(str(path)) as f:
+            content = json.load(f)
+        if content.get("version") != VERSION:
+            raise ValueError("Catalog version mismatch: %s", path)
+        return cls._from_grids(content["grids"])
+
+    @classmethod
+    def build(cls):
+        # type: ()->Catalog
+        """Construct the catalog by reading all the files in the data directory.
+
+        Grid files are files in :data:`config.table_dir` accompanied by an info
+        file with the same name but the suffix ``.info``. The files of
+        :data:`config.table_names` are also included.
+        """
+        base = config.package_dir / config.table_dir
+        pairs = []  # type: List[Tuple[str, str]]
+        for value in config.table_names.values():
+            grid, info = config.parse_table_value(value)
+            pairs.append((grid, info or _sibling_info(grid)))
+        for f in sorted(base.glob("**/*")):
+            if f.suffix != ".info" and f.is_file() and f.with_suffix(".info").is_file():
+                grid = f.relative_to(base).as_posix()
+                pairs.append((grid, _sibling_info(grid)))
+        unique = sorted(set(pairs))
+        return cls._from_grids([_describe(base, grid, info) for grid, info in unique])
+
+    @classmethod
+    def _from_grids(cls, grids):
+        # type: (List[Mapping[str, Any]])->Catalog
+        """Construct entries from the grid descriptions, assigning the keys."""
+        by_paths = {(g["table_path"], g["info_path"]): g for g in grids}
+        entries = []
+        used = set()
+        for key, value in config.table_names.items():
+            grid, info = config.parse_table_value(value)
+            paths = (grid, info or _sibling_info(grid))
+            if paths not in by_paths:
+                logger.warning("Table %s is not in the catalog; rebuild it.", key)
+                continue
+            entries.append(_entry(key, by_paths[paths]))
+            used.add(paths)
+        for g in grids:
+            if (g["table_path"], g["info_path"]) not in used:
+                entries.append(_entry(None, g))
+        return cls(entries)
+
+
+def _unique_sorted(items):
+    # type: (Iterable[Tuple[str, str, Mapping[str, Any]]])->List[Mapping[str, Any]]
+    """Return the unique grid descriptions sorted by the paths."""
+    unique = {(grid, info): d for grid, info, d in items}
+    return [unique[k] for k in sorted(unique)]
+
+
+def _sibling_info(grid):
+    # type: (str)->str
+    """Return the default info path of a grid path."""
+    return pathlib.PurePosixPath(grid).with_suffix(".info").as_posix()
+
+
+def _entry(key, grid):
+    # type: (Optional[str], Mapping[str, Any])->CatalogEntry
+    g = copy.deepcopy(grid)
+    return CatalogEntry(
+        key, g["table_path"], g["info_path"], g["parameters"], g["values"], g["hull"]
+    )
+
+
+def _describe(base, grid, info):
+    # type: (pathlib.Path, str, str)->Mapping[str, Any]
+    """Return the description of a grid file by reading it."""
+    from susy_cross_section.table import File
+
+    data_file = File(base / grid, base / info)
+    names = [p.column for p in data_file.info.parameters]
+    index = data_file.raw_data[names]
+    parameters = [
+        {
+            "name": p.column,
+            "unit": data_file.info.get_column(p.column).unit,
+            "min": float(index[p.column].min()),
+            "max": float(index[p.column].max()),
+        }
+        for p in data_file.info.parameters
+    ]
+    hull = None
+    if len(names) == 2:
+        lines = index.groupby(names[0])[names[1]]
+        hull = [
+            [float(x), float(y_min), float(y_max)]
+            for x, y_min, y_max in zip(lines.min().index, lines.min(), lines.max())
+        ]
+    values = []
+    for name, table in data_file.tables.items():
+        attributes = table.attributes
+        values.append(
+            {
+                "name": name,
+                "unit": table.unit,
+                "processes": list(attributes.processes),
+                "collider": attributes.collider,
+                "ecm": attributes.ecm,
+                "order": attributes.order,
+                "pdf_name": attributes.pdf_name,
+            }
+        )
+    return {
+        "table_path": grid,
+        "info_path": info,
+        "parameters": parameters,
+        "values": values,
+        "hull": hull,
+    }
+
+
+def default_path():
+    # type: ()->pathlib.Path
+    """Return the path of the catalog file in the data directory."""
+    return config.package_dir / config.table_dir / CATALOG_NAME
+
+
+def load(path=None):
+    # type: (Optional[PathLike])->Catalog
+    """Return the catalog.
+
+    If the catalog file is not generated or invalid, the catalog is built from
+    the data files, which takes time; `rebuild` generates the file.
+
+    Arguments
+    ---------
+    path: str or pathlib.Path, optional
+        Path to the catalog file; `default_path` is used if unspecified.
+    """
+    path = pathlib.Path(path) if path else default_path()
+    try:
+        return Catalog.from_file(path)
+    except (IOError, OSError, ValueError, KeyError) as e:
+        logger.info("Catalog %s is not available (%s); building it.", path, e)
+        return Catalog.build()
+
+
+def rebuild(path=None):
+    # type: (Optional[PathLike])->Catalog
+    """Generate the catalog file again from the data files.
+
+    Arguments
+    ---------
+    path: str or pathlib.Path, optional
+        Path to the catalog file; `default_path` is used if unspecified.
+
+    Raises
+    ------
+    OSError
+        If the catalog file cannot be written.
+    """
+    catalog = Catalog.build()
+    catalog.dump(path or default_path())
+    return catalog
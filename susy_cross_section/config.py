@@ -25,6 +25,53 @@ The package diretory, usually no need to change.
     :typ:`pathlib.Path`
 """
 
+cache_dir = None  # type: Optional[str]
+"""
+Directory to store cache files, or None to use the default.
+
+If None, ``susy_cross_section`` directory in ``$XDG_CACHE_HOME`` (or in
+``~/.cache`` if the variable is not set) is used.
+
+:Type:
+    :typ:`str` or None
+"""
+
+use_cache = False
+"""
+Whether to use the on-disk cache of parsed table files by default.
+
+:Type:
+    :typ:`bool`
+"""
+
+registry_size = 16
+"""
+The maximal number of files kept in the registry of :func:`load`.
+
+:Type:
+    :typ:`int`
+"""
+
+registry_memory = None  # type: Optional[int]
+"""
+Memory budget of the registry of :func:`load` in bytes, or None for no limit.
+
+:Type:
+    :typ:`int` or None
+"""
+
+server_socket = None  # type: Optional[str]
+"""
+Path to the socket of the server of ``susy-xs serve``, or None to use the
+default.
+
+If None, ``susy_cross_section.sock`` in ``$XDG_RUNTIME_DIR`` (or a file in the
+temporary directory if the variable is not set) is used.
+
+:Type:
+    :typ:`str` or None
+"""
+
 
 table_names = {
     # gluino
@@ -0,0 +1,206 @@
+"""Coverage of parameter domains by the grid tables.
+
+The data in this package have several grid files for one process at one
+collision energy, e.g., grids with different PDF sets or a grid and its
+high-mass extension in NLL-fast data, and their parameter domains overlap or
+complement each other. `CoverageIndex`, constructed from the `catalog`,
+selects for each parameter point the table whose grid covers the point, so
+that users specify only the process and the collision energy.
+
+A point is covered by a grid if it is within the bounding box of the grid
+and, for two-parameter grids, within the hull of the grid, i.e., within the
+range of the second parameter on both of the grid lines of the first
+parameter enclosing the point. The grid lines are located by binary search,
+and the points are tested in batch for each candidate table.
+
+================= ======================================================
+`CoverageIndex`   index of the domains keyed by process and energy
+================= ======================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import logging
+import sys
+from typing import Any, List, Mapping, MutableMapping, Optional, Sequence  # noqa: F401
+
+import numpy
+
+import susy_cross_section.catalog as catalog_module
+from susy_cross_section.catalog import Catalog, CatalogEntry  # noqa: F401
+
+if sys.version_info[0] < 3:  # py2
+    str = basestring  # noqa: A001, F821
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def _normalize(process):
+    # type: (str)->str
+    """Return the process name with normalized spaces."""
+    return " ".join(process.split())
+
+
+class _Domain(object):
+    """The parameter domain of a grid table."""
+
+    def __init__(self, entry):
+        # type: (CatalogEntry)->None
+        self.entry = entry
+        self.names = [p["name"] for p in entry.parameters]
+        self.lower = numpy.array([p["min"] for p in entry.parameters])
+        self.upper = numpy.array([p["max"] for p in entry.parameters])
+        if entry.hull:
+            hull = numpy.array(sorted(entry.hull), dtype=float)
+            self.hull_x, self.hull_min, self.hull_max = hull.T
+        else:
+            self.hull_x = None
+
+    def contains(self, points):
+        # type: (numpy.ndarray)->numpy.ndarray
+        """Return whether each of the points (n, d) is in the domain."""
+        inside = ((points >= self.lower) & (points <= self.upper)).all(axis=1)
+        if self.hull_x is not None:
+            x, y = points[:, 0], points[:, 1]
+            last = len(self.hull_x) - 1
+            left = (numpy.searchsorted(self.hull_x, x, side="right") - 1).clip(0, last)
+            right = numpy.searchsorted(self.hull_x, x, side="left").clip(0, last)
+            y_min = numpy.maximum(self.hull_min[left], self.hull_min[right])
+            y_max = numpy.minimum(self.hull_max[left], self.hull_max[right])
+            inside &= (y >= y_min) & (y <= y_max)
+        return inside
+
+
+class CoverageIndex(object):
+    """Index of the parameter domains of the tables.
+
+    The tables are grouped by the pairs of the process and the collision
+    energy of their values; a table with several processes, e.g., a sum of
+    production cross sections, belongs to the group of each process.
+
+    Arguments
+    ---------
+    entries: list of CatalogEntry
+        The tables in the order of preference; if several tables cover a
+        point, the former is selected.
+    """
+
+    def __init__(self, entries):
+        # type: (Sequence[CatalogEntry])->None
+        self._groups = {}  # type: MutableMapping[Any, List[_Domain]]
+        for entry in entries:
+            domain = _Domain(entry)
+            for value in entry.values:
+                for process in value["processes"]:
+                    group = self._groups.setdefault(
+                        (_normalize(process), value["ecm"].lower()), []
+                    )
+                    if domain not in group:
+                        group.append(domain)
+
+    @classmethod
+    def from_catalog(cls, index=None):
+        # type: (Optional[Catalog])->CoverageIndex
+        """Construct the index of the tables in a catalog.
+
+        The tables with predefined keys are preferred in the order of
+        :data:`config.table_names`, and then the others in the order of
+        their paths.
+
+        Arguments
+        ---------
+        index: Catalog, optional
+            The catalog; the catalog of this package is used if unspecified.
+        """
+        return cls(list(index if index is not None else catalog_module.load()))
+
+    def tables(self, process, ecm, parameters=None, value_name=None):
+        # type: (str, str, Optional[Sequence[str]], Optional[str])->List[CatalogEntry]
+        """Return the tables of the process in the order of preference.
+
+        Arguments
+        ---------
+        process: str
+            The process, e.g., ``"p p > go go"``, compared with the processes
+            of the tables after spaces are normalized.
+        ecm: str
+            The collision energy, e.g., ``"13TeV"``, compared
+            case-insensitively.
+        parameters: list of str, optional
+            If specified, only the tables having exactly these parameters in
+            any order are returned.
+        value_name: str, optional
+            If specified, only the tables having the value are returned.
+        """
+        return [d.entry for d in self._domains(process, ecm, parameters, value_name)]
+
+    def _domains(self, process, ecm, parameters, value_name):
+        # type: (str, str, Optional[Sequence[str]], Optional[str])->List[_Domain]
+        """Return the domains of the tables; see `tables`."""
+        result = []
+        for domain in self._groups.get((_normalize(process), ecm.lower()), []):
+            if parameters is not None and sorted(domain.names) != sorted(parameters):
+                continue
+            names = [v["name"] for v in domain.entry.values]
+            if value_name is not None and value_name not in names:
+                continue
+            result.append(domain)
+        return result
+
+    def select(self, process, ecm, points, value_name=None):
+        # type: (str, str, Any, Optional[str])->List[Optional[CatalogEntry]]
+        """Return the table covering each of the points.
+
+        Arguments
+        ---------
+        process: str
+            The process; see `tables`.
+        ecm: str
+            The collision energy; see `tables`.
+        points: dict(str, float) or list of dict(str, float)
+            The parameter assignments, e.g., ``{"ms": 1200, "mgl": 1000}``;
+            only the tables having exactly the assigned parameters are
+            considered.
+        value_name: str, optional
+            If specified, only the tables having the value are considered.
+
+        Returns
+        -------
+        list of (CatalogEntry or None)
+            The most preferred table covering each point, or None if no tables
+            cover it.
+        """
+        if isinstance(points, Mapping):
+            points = [points]
+        result = [None] * len(points)  # type: List[Optional[CatalogEntry]]
+        by_names = {}  # type: MutableMapping[Any, List[int]]
+        for i, point in enumerate(points):
+            by_names.setdefault(tuple(sorted(point)), []).append(i)
+        for names, indices in by_names.items():
+            unassigned = numpy.array(indices)
+            for domain in self._domains(process, ecm, names, value_name):
+                xs = numpy.array(
+                    [[points[i][n] for n in domain.names] for i in unassigned],
+                    dtype=float,
+                ).reshape(len(unassigned), len(domain.names))
+                covered = domain.contains(xs)
+                for i in unassigned[covered]:
+                    result[i] = domain.entry
+                unassigned = unassigned[~covered]
+                if not len(unassigned):
+                    break
+        return result
+
+    def covering(self, process, ecm, point, value_name=None):
+        # type: (str, str, Mapping[str, float], Optional[str])->List[CatalogEntry]
+        """Return all the tables covering a point in the order of preference.
+
+        See `select` for the arguments.
+        """
+        result = []
+        for domain in self._domains(process, ecm, list(point), value_name):
+            xs = numpy.array([[point[n] for n in domain.names]], dtype=float)
+            if domain.contains(xs)[0]:
+                result.append(domain.entry)
+        return result
@@ -0,0 +1,228 @@
+"""Evaluation of many tables at many parameter points.
+
+A spectrum point usually needs the cross sections of many production
+processes, i.e., many tables. This module evaluates a set of tables, given by
+table names or glob patterns of them, at one or many parameter assignments in
+one process. The files are loaded and the interpolations are constructed in
+parallel threads, compiled interpolations (see `interp.artifact`) are used if
+available, and the tables having the identical parameter grid are
+interpolated and evaluated together (see
+`AbstractInterpolator.interpolate_many`).
+
+Each parameter assignment is a dictionary from parameter names to values,
+e.g., ``{"ms": 1200, "mgl": 1000}``; each table is evaluated at the
+assignments that have all of its parameters.
+
+================ ======================================================
+`find_tables`    return the table names matching patterns
+`evaluate`       evaluate tables at parameter assignments
+`Row`            one result of `evaluate`
+================ ======================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import collections
+import concurrent.futures
+import fnmatch
+import logging
+import sys
+from typing import Any, List, Mapping, MutableMapping, Optional, Sequence  # noqa: F401
+
+import numpy
+import pandas
+
+import susy_cross_section.config as config
+import susy_cross_section.interp.artifact as artifact
+from susy_cross_section.interp.interpolator import (  # noqa: F401
+    Interpolation,
+    default_interpolator,
+    tuple_batch_many,
+)
+from susy_cross_section.table import File
+from susy_cross_section.utility import get_paths
+
+if sys.version_info[0] < 3:  # py2
+    str = basestring  # noqa: A001, F821
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+Row = collections.namedtuple(
+    "Row", ["point", "table", "value", "unc_p", "unc_m", "unit"]
+)
+"""One result of `evaluate`.
+
+The fields are the index of the parameter assignment, the table name (or
+path), the central value, the positive and negative uncertainties, and the
+unit of the value.
+"""
+
+
+def find_tables(patterns):
+    # type: (Sequence[str])->List[str]
+    """Return the table names matching the patterns.
+
+    Each pattern is a glob pattern, e.g., ``13TeV.*.wino``, matched against
+    the keys of :data:`config.table_names`, which are returned in the order
+    of the configuration. A pattern without any glob characters that is not
+    a table name is returned as-is, to be interpreted as a path.
+
+    Raises
+    ------
+    ValueError
+        If a glob pattern matches no table names.
+    """
+    result = []  # type: List[str]
+    for pattern in patterns:
+        if pattern in config.table_names or not any(c in pattern for c in "*?["):
+            matched = [pattern]
+        else:
+            matched = [k for k in config.table_names if fnmatch.fnmatchcase(k, pattern)]
+            if not matched:
+                raise ValueError("No table matches the pattern: %s", pattern)
+        result.extend(k for k in matched if k not in result)
+    return result
+
+
+class _Entry(object):
+    """A table to evaluate and its interpolation."""
+
+    def __init__(self, name, table_path, info_path, value_name):
+        # type: (str, Any, Any, str)->None
+        self.name = name
+        data_file = File(table_path, info_path, values=[value_name])
+        self.table = data_file.tables[value_name]
+        self.unit = self.table.unit
+        self.param_names = [p.column for p in data_file.info.parameters]
+        self.interpolator = default_interpolator(len(self.param_names))
+        self.interpolation = artifact.load_compiled(
+            table_path, info_path, value_name, self.interpolator
+        )  # type: Optional[Interpolation]
+
+    def grid_key(self):
+        # type: ()->Any
+        """Return the key identifying the parameter grid and the interpolator."""
+        index = self.table.index
+        grid = index.to_frame(index=False).to_numpy(dtype=float)
+        return (repr(self.interpolator), tuple(index.names), grid.tobytes())
+
+
+def _load_entries(names, value_name, info_path, executor):
+    # type: (Sequence[str], str, Any, Any)->List[_Entry]
+    """Load the tables in parallel, skipping those without the value."""
+    futures = []
+    for name in names:
+        table_path, info = get_paths(name, info_path)
+        futures.append(
+            executor.submit(_Entry, name, table_path, info, value_name)
+        )
+    entries = []
+    for name, future in zip(names, futures):
+        try:
+            entries.append(future.result())
+        except KeyError:
+            logger.debug("Table %s does not have value %s.", name, value_name)
+    return entries
+
+
+def _interpolate(entries, executor):
+    # type: (List[_Entry], Any)->List[_Entry]
+    """Interpolate the tables in parallel, sharing work on identical grids."""
+    groups = collections.OrderedDict()  # type: Any
+    for entry in entries:
+        if entry.interpolation is None:
+            groups.setdefault(entry.grid_key(), []).append(entry)
+
+    def fit(group):
+        # type: (List[_Entry])->None
+        try:
+            fits = group[0].interpolator.interpolate_many([e.table for e in group])
+        except ValueError as e:
+            if len(group) == 1:
+                logger.warning("Table %s is skipped: %s", group[0].name, e)
+            else:
+                for entry in group:  # some tables cannot be fit; try separately.
+                    fit([entry])
+        else:
+            for entry, interpolation in zip(group, fits):
+                entry.interpolation = interpolation
+
+    for future in [executor.submit(fit, g) for g in groups.values()]:
+        future.result()
+    return [e for e in entries if e.interpolation is not None]
+
+
+def evaluate(
+    points,  # type: Any
+    tables,  # type: Sequence[str]
+    value_name="xsec",  # type: str
+    info_path=None,  # type: Any
+    out_of_domain="nan",  # type: str
+    max_workers=None,  # type: Optional[int]
+):
+    # type: (...)->List[Row]
+    """Evaluate tables at parameter assignments.
+
+    Arguments
+    ---------
+    points: dict(str, float), list of dict(str, float), or pandas.DataFrame
+        The parameter assignments; a `pandas.DataFrame` has one assignment in
+        each row and the parameter names as columns.
+    tables: list of str
+        Table names, glob patterns of them, or paths to grid files; see
+        `find_tables`.
+    value_name: str
+        Name of the value to evaluate; tables without the value are skipped.
+    info_path: str or pathlib.Path, optional
+        Path to the info file, which is valid only for one table.
+    out_of_domain: str
+        The policy for points out of the grid; see `Interpolation.f0_batch`.
+    max_workers: int, optional
+        The number of threads to load and interpolate the tables.
+
+    Returns
+    -------
+    list of Row
+        The results sorted by the assignments and then by the tables, i.e.,
+        one row for each pair of an assignment and a table that has all the
+        parameters in the assignment. Tables not interpolatable by the
+        default interpolator, e.g., a spline on a grid with missing points,
+        are skipped with a warning.
+    """
+    if isinstance(points, Mapping):
+        points = [points]
+    frame = pandas.DataFrame(points)
+    names = find_tables(tables)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        entries = _load_entries(names, value_name, info_path, executor)
+        entries = _interpolate(entries, executor)
+
+    by_params = collections.OrderedDict()  # type: Any
+    for entry in entries:
+        if all(p in frame.columns for p in entry.param_names):
+            by_params.setdefault(tuple(entry.param_names), []).append(entry)
+        else:
+            logger.debug("Table %s has other parameters.", entry.name)
+
+    # columns of the rows, concatenated over the tables and sorted at last.
+    columns = [[], [], [], [], []]  # type: List[List[numpy.ndarray]]
+    for params, group in by_params.items():
+        xs = frame[list(params)].to_numpy(dtype=float)
+        assigned = numpy.flatnonzero(~numpy.isnan(xs).any(axis=1))
+        results = tuple_batch_many(
+            [e.interpolation for e in group], xs[assigned], out_of_domain
+        )
+        for entry, values in zip(group, results):
+            columns[0].append(assigned)
+            columns[1].append(numpy.full(len(assigned), entries.index(entry)))
+            for column, v in zip(columns[2:], values):
+                column.append(v)
+    if not columns[0]:
+        return []
+    point, table, value, unc_p, unc_m = [numpy.concatenate(c) for c in columns]
+    order = numpy.lexsort((table, point))
+    names = numpy.array([entry.name for entry in entries], dtype=object)
+    units = numpy.array([entry.unit for entry in entries], dtype=object)
+    fields = [point, names[table], value, unc_p, unc_m, units[table]]
+    return list(map(Row._make, zip(*[f[order].tolist() for f in fields])))
@@ -2,23 +2,25 @@ r"""A subpackage to perform interpolation.
 
 At the subpackage-level, the following modules and class aliases are defined.
 
-=============================== ===============================================
-module `interp.axes_wrapper`    has axis preprocessors for interpolation
-module `interp.interpolator`    has interpolator classes
-`!interp.Scipy1dInterpolator`   = `interp.interpolator.Scipy1dInterpolator`
-`!interp.ScipyGridInterpolator` = `interp.interpolator.ScipyGridInterpolator`
-=============================== ===============================================
+=========================================== ===========================================
+module `interp.axes_wrapper`                has axis preprocessors for interpolation
+module `interp.interpolator`                has interpolator classes
+`!interp.Scipy1dInterpolator`               alias of the class in `interp.interpolator`
+`!interp.ScipyGridInterpolator`             alias of the class in `interp.interpolator`
+`!interp.ScipyMultiDimensionalInterpolator` alias of the class in `interp.interpolator`
+=========================================== ===========================================
 
 This subpackage contains the following class. Actual interpolators are
 subclasses of `AbstractInterpolator` and not listed here.
 
-========================================== ====================================
+============================================ ==================================
  classes
-========================================== ====================================
-`interp.axes_wrapper.AxesWrapper`          axis preprocessor
-`interp.interpolator.Interpolation`        interpolation result
-`interp.interpolator.AbstractInterpolator` base class for interpolators
-========================================== ====================================
+============================================ ==================================
+`interp.axes_wrapper.AxesWrapper`            axis preprocessor
+`interp.interpolator.Interpolation`          interpolation result
+`interp.interpolator.CompositeInterpolation` interpolation stitched from grids
+`interp.interpolator.AbstractInterpolator`   base class for interpolators
+============================================ ==================================
 
 Note
 ----
@@ -42,4 +44,39 @@ patch by patch, so its first or higher derivative can be discontinuous, while
 usually a fit function is globally defined and class :math:`C^\infty`.
 """
 
-from .interpolator import Scipy1dInterpolator, ScipyGridInterpolator  # noqa: F401
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import importlib
+import sys
+from typing import Any, List  # noqa: F401
+
+# The aliases are resolved on the first access (PEP 562), so that importing a
+# module of this subpackage does not import the interpolators, i.e., scipy.
+_LAZY_ALIASES = {
+    "Scipy1dInterpolator": "interpolator",
+    "ScipyGridInterpolator": "interpolator",
+    "ScipyMultiDimensionalInterpolator": "interpolator",
+}
+
+if sys.version_info < (3, 7):  # module __getattr__ is not supported
+    from .interpolator import (  # noqa: F401
+        Scipy1dInterpolator,
+        ScipyGridInterpolator,
+        ScipyMultiDimensionalInterpolator,
+    )
+
+
+def __getattr__(name):
+    # type: (str)->Any
+    if name in _LAZY_ALIASES:
+        module = importlib.import_module("." + _LAZY_ALIASES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value  # skip this function in later accesses
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    # type: ()->List[str]
+    return sorted(list(globals()) + list(_LAZY_ALIASES))
@@ -0,0 +1,338 @@
+"""Compiled interpolations stored as binary artifacts.
+
+Fitting interpolating functions, e.g., splines, takes time on every process
+start, although the result is always the same for a table that never changes.
+This module "compiles" an `Interpolation` into an artifact, i.e., a container
+file of `storage` holding the knots and coefficients of the interpolating
+functions together with the names of the axis transformations, the domain,
+and the hash of the source files. Loading an artifact memory-maps the arrays
+and reconstructs the functions without fitting.
+
+Only the interpolations given by the interpolators of this package with
+predefined axis functions (see `AxesWrapper`) can be compiled.
+
+================ ======================================================
+`dump`           write an interpolation into an artifact
+`load`           read an interpolation from an artifact
+`default_path`   return the artifact path in the cache directory
+`load_compiled`  return the compiled interpolation of a table if available
+================ ======================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import hashlib
+import logging
+import pathlib
+import sys
+from typing import Any, List, Mapping, MutableMapping, Optional, Union  # noqa: F401
+
+import numpy
+import scipy.interpolate as sci_interp
+
+import susy_cross_section.storage as storage
+
+from .axes_wrapper import AxesWrapper, _WrappedFunction
+from .interpolator import (  # noqa: F401
+    AbstractInterpolator,
+    Interpolation,
+    _BivariateSplineFunction,
+    _Interp1dFunction,
+    _LookupTable,
+    _MultilinearFunction,
+)
+
+if sys.version_info[0] < 3:  # py2
+    str = basestring  # noqa: A001, F821
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+
+VERSION = 4
+"""Version of the artifact content, to be incremented if it is changed."""
+
+_SPLINE_ORDERS = {"zero": 0, "slinear": 1, "quadratic": 2, "cubic": 3}
+"""Orders of the spline kinds of `scipy.interpolate.interp1d`."""
+
+
+class _Encoder(object):
+    """Collector of arrays for encoding interpolating functions into JSON."""
+
+    def __init__(self):
+        # type: ()->None
+        self.arrays = {}  # type: MutableMapping[str, numpy.ndarray]
+
+    def add(self, array):
+        # type: (Any)->str
+        """Register an array and return its key."""
+        key = "{}".format(len(self.arrays))
+        self.arrays[key] = numpy.asarray(array)
+        return key
+
+    def encode(self, f):
+        # type: (Any)->Mapping[str, Any]
+        """Return a JSON-serializable node representing the function."""
+        if isinstance(f, _WrappedFunction):
+            wx, wy, wy_inv = f.wrapper._spec
+            if not all(isinstance(w, str) for w in list(wx) + [wy]) or not (
+                wy_inv is None or isinstance(wy_inv, str)
+            ):
+                raise TypeError("Only predefined axis functions can be compiled.")
+            return {
+                "type": "wrapped",
+                "wx": wx,
+                "wy": wy,
+                "wy_inv": wy_inv,
+                "x_len": f.x_len,
+                "f_bar": self.encode(f.f_bar),
+            }
+        elif isinstance(f, _Interp1dFunction):
+            return self._encode_interp1d(f)
+        elif isinstance(f, _LookupTable):
+            return {
+                "type": "lookup_table",
+                "grid": [self.add(g) for g in f.grid],
+                "values": self.add(f.values),
+            }
+        elif isinstance(f, _MultilinearFunction):
+            return {
+                "type": "multilinear",
+                "grid": [self.add(g) for g in f.grid],
+                "values": self.add(f.values),
+                "tolerances": f.tolerances,
+            }
+        elif isinstance(f, _BivariateSplineFunction):
+            state = f.__getstate__()
+            return {
+                "type": "bivariate_spline",
+                "tx": self.add(state["tx"]),
+                "ty": self.add(state["ty"]),
+                "c": self.add(state["c"]),
+                "degrees": list(state["degrees"]),
+                "stacked": state["stacked"],
+            }
+        raise TypeError("Unsupported interpolating function: %s", f)
+
+    def _encode_interp1d(self, f):
+        # type: (_Interp1dFunction)->Mapping[str, Any]
+        """Return a node of a one-dimensional interpolating function."""
+        state = f.__getstate__()
+        if "c" in state:
+            return {
+                "type": "ppoly",
+                "c": self.add(state["c"]),
+                "x": self.add(state["x"]),
+                "extrapolate": state["extrapolate"],
+            }
+        interp = f.interp
+        if isinstance(interp, sci_interp.BSpline):
+            spline = interp  # loaded from an artifact
+        elif not isinstance(interp, sci_interp.interp1d) or interp.axis != 0:
+            raise TypeError("Unsupported interpolating function: %s", interp)
+        elif f.kind == "linear":
+            return {
+                "type": "interp1d",
+                "x": self.add(interp.x),
+                "y": self.add(interp.y),
+                "bounds_error": bool(interp.bounds_error),
+            }
+        elif f.kind in _SPLINE_ORDERS:
+            # the B-spline that interp1d fits, stored to be loaded without fitting
+            spline = sci_interp.make_interp_spline(
+                interp.x, interp.y, k=_SPLINE_ORDERS[f.kind], axis=0
+            )
+        else:
+            raise TypeError("Unsupported kind of interp1d: %s", f.kind)
+        return {
+            "type": "bspline",
+            "t": self.add(spline.t),
+            "c": self.add(spline.c),
+            "k": int(spline.k),
+        }
+
+
+def _decode(node, arrays):
+    # type: (Mapping[str, Any], Mapping[str, numpy.ndarray])->Any
+    """Return the function represented by the node without fitting."""
+    kind = node["type"]
+    if kind == "wrapped":
+        wrapper = AxesWrapper(node["wx"], node["wy"], node["wy_inv"])
+        return _WrappedFunction(_decode(node["f_bar"], arrays), wrapper, node["x_len"])
+    elif kind == "ppoly":
+        f = _Interp1dFunction.__new__(_Interp1dFunction)
+        f.__setstate__(
+            {
+                "c": arrays[node["c"]],
+                "x": arrays[node["x"]],
+                "extrapolate": node["extrapolate"],
+            }
+        )
+        return f
+    elif kind == "interp1d":
+        interp = sci_interp.interp1d(
+            arrays[node["x"]],
+            arrays[node["y"]],
+            "linear",
+            axis=0,
+            bounds_error=node["bounds_error"],
+            copy=False,
+            assume_sorted=True,
+        )
+        return _Interp1dFunction(interp, "linear")
+    elif kind == "bspline":
+        spline = sci_interp.BSpline.construct_fast(
+            arrays[node["t"]], arrays[node["c"]], node["k"], extrapolate=False
+        )
+        return _Interp1dFunction(spline)
+    elif kind == "lookup_table":
+        return _LookupTable(
+            [arrays[key] for key in node["grid"]], arrays[node["values"]]
+        )
+    elif kind == "multilinear":
+        return _MultilinearFunction(
+            [arrays[key] for key in node["grid"]],
+            arrays[node["values"]],
+            node.get("tolerances"),
+        )
+    elif kind == "bivariate_spline":
+        f = _BivariateSplineFunction.__new__(_BivariateSplineFunction)
+        f.__setstate__(
+            {
+                "tx": arrays[node["tx"]],
+                "ty": arrays[node["ty"]],
+                "c": arrays[node["c"]],
+                "degrees": tuple(node["degrees"]),
+                "stacked": node["stacked"],
+            }
+        )
+        return f
+    raise ValueError("Unknown function type in artifact: %s", kind)
+
+
+def dump(interpolation, path, source_hash=None, label=None):
+    # type: (Interpolation, PathLike, Optional[str], Optional[str])->None
+    """Write an interpolation into an artifact file.
+
+    Arguments
+    ---------
+    interpolation: Interpolation
+        The interpolation to compile.
+    path: str or pathlib.Path
+        Path to the artifact.
+    source_hash: str, optional
+        Hash of the source files, e.g., by `storage.content_hash`, which is
+        verified by `load`.
+    label: str, optional
+        Description of the interpolator, which is verified by `load`.
+
+    Raises
+    ------
+    TypeError
+        If the interpolation contains functions that cannot be compiled.
+    """
+    encoder = _Encoder()
+    state = interpolation.__getstate__()
+    if "f_stack" in state:
+        functions = [encoder.encode(state["f_stack"])]
+    else:
+        functions = [encoder.encode(f) for f in state["functions"]]
+    meta = {
+        "version": VERSION,
+        "source_hash": source_hash,
+        "label": label,
+        "param_names": state["param_names"],
+        "domain": interpolation.domain,
+        "stacked": "f_stack" in state,
+        "functions": functions,
+    }
+    storage.dump(path, meta, encoder.arrays)
+
+
+def load(path, source_hash=None, label=None, mmap=True):
+    # type: (PathLike, Optional[str], Optional[str], bool)->Interpolation
+    """Read an interpolation from an artifact file.
+
+    Arguments
+    ---------
+    path: str or pathlib.Path
+        Path to the artifact.
+    source_hash: str, optional
+        If specified, the artifact must be compiled from the source files with
+        this hash.
+    label: str, optional
+        If specified, the artifact must be compiled by the interpolator with
+        this description.
+    mmap: bool
+        Whether to memory-map the arrays instead of reading them.
+
+    Returns
+    -------
+    Interpolation
+        The interpolation, equivalent to the compiled one.
+
+    Raises
+    ------
+    ValueError
+        If the artifact is invalid, of another version, or stale.
+    """
+    meta, arrays = storage.load(path, mmap=mmap)
+    if meta.get("version") != VERSION:
+        raise ValueError("Artifact version mismatch: %s", path)
+    if source_hash is not None and meta["source_hash"] != source_hash:
+        raise ValueError("Artifact compiled from other sources: %s", path)
+    if label is not None and meta["label"] != label:
+        raise ValueError("Artifact compiled by other interpolator: %s", path)
+    functions = [_decode(node, arrays) for node in meta["functions"]]
+    if meta["stacked"]:
+        return Interpolation.from_stacked(
+            functions[0], meta["param_names"], meta["domain"]
+        )
+    return Interpolation(
+        *functions, param_names=meta["param_names"], domain=meta["domain"]
+    )
+
+
+def default_path(source_hash, value_name, interpolator):
+    # type: (str, str, AbstractInterpolator)->pathlib.Path
+    """Return the path of the artifact in the cache directory.
+
+    The path is determined by the source hash, the value name, and the
+    description (`repr`) of the interpolator.
+    """
+    key = "\0".join([source_hash, value_name, repr(interpolator)])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return storage.cache_dir() / "interp" / "{}.bin".format(digest)
+
+
+def load_compiled(table_path, info_path, value_name, interpolator):
+    # type: (PathLike, PathLike, str, AbstractInterpolator)->Optional[Interpolation]
+    """Return the compiled interpolation of a table if available.
+
+    Arguments
+    ---------
+    table_path: str or pathlib.Path
+        Path to the grid file.
+    info_path: str or pathlib.Path
+        Path to the info file.
+    value_name: str
+        Name of the value.
+    interpolator: AbstractInterpolator
+        The interpolator used in the compilation.
+
+    Returns
+    -------
+    Interpolation, optional
+        The interpolation loaded from the artifact in the cache directory, or
+        None if it is not compiled or stale.
+    """
+    source_hash = storage.content_hash(table_path, info_path)
+    path = default_path(source_hash, value_name, interpolator)
+    if not path.is_file():
+        return None
+    try:
+        return load(path, source_hash=source_hash, label=repr(interpolator))
+    except (ValueError, KeyError, TypeError, IOError, OSError) as e:
+        logger.warning("Artifact %s is ignored: %s", path.__str__(), e)
+        return None
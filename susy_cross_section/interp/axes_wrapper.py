@@ -58,7 +58,7 @@ and derive the interpolation function :math:`\bar f` based on
 """
 
 import sys
-from typing import Any, Callable, Mapping, Sequence, Union, cast  # noqa: F401
+from typing import Any, Callable, Mapping, Optional, Sequence, Union, cast  # noqa: F401
 
 import numpy
 
@@ -91,6 +91,33 @@ def _is_number_sequence(obj, length):
         return False
 
 
+def vectorized(func):
+    # type: (FT)->FT
+    """Declare a function is numpy-native, i.e., applicable to arrays.
+
+    A function declared by this decorator is used by `AxesWrapper` without
+    being dressed by `numpy.vectorize`; it must accept numpy arrays and apply
+    itself element-wise, as numpy ufuncs do.
+
+    Examples
+    --------
+    >>> @vectorized
+    ... def sqrt_axis(x):
+    ...     return numpy.sqrt(x)
+    >>> wrapper = AxesWrapper([sqrt_axis], "log")
+    """
+    func.vectorized = True  # type: ignore
+    return func
+
+
+def _is_vectorized(obj):
+    # type: (Any)->bool
+    """Return whether obj is applicable to numpy arrays element-wise."""
+    return isinstance(obj, (numpy.ufunc, numpy.vectorize)) or bool(
+        getattr(obj, "vectorized", False)
+    )
+
+
 class AxesWrapper:
     """Toolkit to modify the x- and y- axes before interpolation.
 
@@ -101,6 +128,12 @@ class AxesWrapper:
         - "log10"    (or "log")
         - "exp10"    (or "exp")
 
+    The predefined functions are numpy-native, i.e., applicable to arrays
+    element-wise at C speed, and their inverses and derivatives are available
+    by :meth:`inverse` and :meth:`derivative`. Other functions are dressed by
+    `numpy.vectorize`, which is a Python-level loop, unless they are numpy
+    ufuncs or declared as numpy-native by `vectorized`.
+
     Attributes
     ----------
     wx: *list of* |FT|
@@ -132,8 +165,28 @@ class AxesWrapper:
         """Exp function (base 10) as a wrapper.
 
         Note that this is equivalent to natural-exp function as a wrapper.
+        `numpy.float_power` is used so that the result is identical to that of
+        Python's ``10 ** x``.
         """
-        return 10 ** x
+        return cast(VT, numpy.float_power(10.0, x))
+
+    @staticmethod
+    def d_identity(x):
+        # type: (VT)->VT
+        """Derivative of the identity function."""
+        return cast(VT, numpy.ones_like(x, dtype=float))
+
+    @staticmethod
+    def d_log10(x):
+        # type: (VT)->VT
+        """Derivative of the log function (base 10)."""
+        return cast(VT, 1 / (numpy.asarray(x, dtype=float) * numpy.log(10)))
+
+    @staticmethod
+    def d_exp10(x):
+        # type: (VT)->VT
+        """Derivative of the exp function (base 10)."""
+        return cast(VT, numpy.log(10) * numpy.float_power(10.0, x))
 
     # we use base 10 because they are equivalent and easier to debug.
     # keys include aliases, and values are the name of staticmethods.
@@ -153,32 +206,76 @@ class AxesWrapper:
         "exp10": "log10",
     }  # type: Mapping[str, str]
 
+    _derivative_function_names = {
+        "identity": "d_identity",
+        "log10": "d_log10",
+        "exp10": "d_exp10",
+    }  # type: Mapping[str, str]
+
     @classmethod
     def _get_function(cls, obj):
         # type: (Union[FT, str])->FT
         """Return wrapper function.
 
         The argument can be a function itself or a function name. The returned
-        functions are dressed by `numpy.vectorize` so that it can be applied to
-        numpy objects.
+        functions can be applied to numpy objects element-wise; functions not
+        numpy-native are dressed by `numpy.vectorize`.
         """
         if isinstance(obj, str):
             name = cls._predefined_function_names.get(obj)
             if not name:
                 raise KeyError("Function %s is not predefined in AxesWrapper", obj)
-            return cast(FT, numpy.vectorize(getattr(cls, name)))
+            return cast(FT, getattr(cls, name))
+        elif _is_vectorized(obj):
+            return obj
         else:
             return cast(FT, numpy.vectorize(obj))
 
     @classmethod
     def _get_inverse_function(cls, name):
         # type: (str)->FT
-        """Return the inverse function with numpy-dress."""
+        """Return the inverse function of a predefined function."""
+        return cls.inverse(name)
+
+    @classmethod
+    def inverse(cls, name):
+        # type: (str)->FT
+        """Return the inverse function of a predefined function.
+
+        Arguments
+        ---------
+        name: str
+            Name of a predefined function, including aliases.
+
+        Returns
+        -------
+        |FT|
+            The numpy-native inverse function.
+        """
         name = cls._inverse_function_names[cls._predefined_function_names[name]]
-        return cast(FT, numpy.vectorize(getattr(cls, name)))
+        return cast(FT, getattr(cls, name))
+
+    @classmethod
+    def derivative(cls, name):
+        # type: (str)->FT
+        """Return the derivative of a predefined function.
+
+        Arguments
+        ---------
+        name: str
+            Name of a predefined function, including aliases.
+
+        Returns
+        -------
+        |FT|
+            The numpy-native derivative function.
+        """
+        name = cls._derivative_function_names[cls._predefined_function_names[name]]
+        return cast(FT, getattr(cls, name))
 
     def __init__(self, wx, wy, wy_inv=None):
         # type: (Sequence[Union[FT, str]], Union[FT, str], Union[FT, str])->None
+        self._spec = (list(wx), wy, wy_inv)
         self.wx = [self._get_function(i) for i in wx]  # Type: List[FT]
         self.wy = self._get_function(wy)  # type: FT
         if wy_inv:
@@ -188,6 +285,24 @@ class AxesWrapper:
         else:
             raise TypeError("wy_inv must be specified.")
 
+    def __getstate__(self):
+        # type: ()->Any
+        """Return the arguments given in initialization.
+
+        Predefined functions are thus pickled as their names, and other
+        functions as themselves, which must be picklable, e.g., defined at the
+        top level of a module.
+        """
+        return self._spec
+
+    def __setstate__(self, state):
+        # type: (Any)->None
+        self.__init__(*state)  # type: ignore
+
+    def __repr__(self):
+        # type: ()->str
+        return "AxesWrapper({!r}, {!r}, {!r})".format(*self._spec)
+
     def wrapped_x(self, xs):
         # type: (XT)->XT
         r"""Return the parameter values after axes modification.
@@ -244,11 +359,39 @@ class AxesWrapper:
         :math:`\boldsymbol x`.
         """
         x_len = len(self.wx) if type_check else None
+        return _WrappedFunction(f_bar, self, x_len)
+
 
-        def _f(x, _f_bar=f_bar, _len=x_len):
-            # type: (XT, Callable[[XT], YT], Union[int, None])->YT
-            if _len is not None and not _is_number_sequence(x, _len):
-                raise TypeError("Invalid arguments for %d-dim fit: %s", _len, x)
-            return self.wy_inv(_f_bar(self.wrapped_x(x)))
+class _WrappedFunction(object):
+    """Interpolating function in the original axes returned by `wrapped_f`.
 
-        return _f
+    A call with one point evaluates :math:`f` at the point. The method
+    :meth:`batch` evaluates :math:`f` at many points at once, for which
+    :ar:`f_bar` should have its own `!batch` method accepting an array with
+    shape ``(N, d)``; otherwise :ar:`f_bar` is called point by point.
+    """
+
+    def __init__(self, f_bar, wrapper, x_len=None):
+        # type: (Callable[[XT], YT], AxesWrapper, Optional[int])->None
+        self.f_bar = f_bar
+        self.wrapper = wrapper
+        self.x_len = x_len
+
+    def __call__(self, x):
+        # type: (XT)->YT
+        """Return the interpolated value at the point."""
+        if self.x_len is not None and not _is_number_sequence(x, self.x_len):
+            raise TypeError("Invalid arguments for %d-dim fit: %s", self.x_len, x)
+        return self.wrapper.wy_inv(self.f_bar(self.wrapper.wrapped_x(x)))
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        """Return the interpolated values at the points with shape (N, d)."""
+        xs_bar = numpy.column_stack(
+            [w(xs[:, i]) for i, w in enumerate(self.wrapper.wx)]
+        ).astype(float)
+        if hasattr(self.f_bar, "batch"):
+            ys_bar = self.f_bar.batch(xs_bar)  # type: ignore
+        else:
+            ys_bar = numpy.array([self.f_bar(x) for x in xs_bar], dtype=float)
+        return cast(numpy.ndarray, self.wrapper.wy_inv(ys_bar))
@@ -15,18 +15,23 @@ r"""Interpolators of cross-section data.
 
 from __future__ import absolute_import, division, print_function  # py2
 
+import hashlib
+import itertools
 import logging
 import re
 import sys
 from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple, Union, cast
 
 import numpy
-import pandas  # noqa: F401
+import pandas
 import scipy.interpolate as sci_interp
+import scipy.spatial as sci_spatial
 
+import susy_cross_section.storage as storage
+from susy_cross_section.base.table import uniform_spacing
 from susy_cross_section.table import BaseTable
 
-from .axes_wrapper import AxesWrapper
+from .axes_wrapper import AxesWrapper, _WrappedFunction
 
 if sys.version_info[0] < 3:  # py2
     str = basestring  # noqa: A001, F821
@@ -60,21 +65,112 @@ class Interpolation:
         Interpolating function of values with negative uncertainty subtracted.
     param_names: list[str], optional
         Names of parameters.
+    domain: list[tuple(float, float)], optional
+        Lower and upper bounds of each parameter, used by the batch methods.
 
     Attributes
     ----------
     param_index: dict(str, int)
         Dictionary to look up parameter's position from a parameter name.
+    domain: list[tuple(float, float)] or None
+        The bounds of parameters, within which the interpolation is valid.
+
+    Note
+    ----
+    The batch methods, e.g., :meth:`tuple_batch`, evaluate the interpolation
+    at many points in one pass. The interpolating functions are called with an
+    array with shape ``(N, d)`` through their `!batch` method if they have one,
+    which is the case for the interpolators in this module, and otherwise
+    point by point.
     """
 
-    def __init__(self, f0, fp, fm, param_names=None):
-        # type: (InterpType, InterpType, InterpType, List[str])->None
+    out_of_domain_policies = ["nan", "raise", "clip"]
+    """Policies for points out of the domain in the batch methods."""
+
+    def __init__(
+        self,
+        f0,  # type: InterpType
+        fp,  # type: InterpType
+        fm,  # type: InterpType
+        param_names=None,  # type: Optional[List[str]]
+        domain=None,  # type: Optional[Sequence[Tuple[float, float]]]
+    ):
+        # type: (...)->None
         self._f0 = f0
         self._fp = fp
         self._fm = fm
         self.param_index = {
             name: index for index, name in enumerate(param_names or [])
         }  # type: Mapping[str, int]
+        self.domain = (
+            [(float(lo), float(hi)) for lo, hi in domain] if domain else None
+        )  # type: Optional[List[Tuple[float, float]]]
+        self._f_stack = None  # type: Optional[Callable[[Sequence[float]], Any]]
+
+    @classmethod
+    def from_stacked(
+        cls,
+        f_stack,  # type: Callable[[Sequence[float]], Any]
+        param_names=None,  # type: Optional[List[str]]
+        domain=None,  # type: Optional[Sequence[Tuple[float, float]]]
+    ):
+        # type: (...)->Interpolation
+        """Construct from an interpolating function of the three series.
+
+        Arguments
+        ---------
+        f_stack: function of list of float to array with shape (3,)
+            Interpolating function returning the central, upper-fluctuated, and
+            downer-fluctuated values at once. If it has a `!batch` method, the
+            method should return an array with shape ``(N, 3)``.
+        param_names: list[str], optional
+            Names of parameters.
+        domain: list[tuple(float, float)], optional
+            Lower and upper bounds of each parameter.
+
+        Returns
+        -------
+        Interpolation
+            The interpolation, where :meth:`tuple_at` and :meth:`tuple_batch`
+            evaluate :ar:`f_stack` only once.
+        """
+        obj = cls(
+            _StackComponent(f_stack, 0),
+            _StackComponent(f_stack, 1),
+            _StackComponent(f_stack, 2),
+            param_names=param_names,
+            domain=domain,
+        )
+        obj._f_stack = f_stack
+        return obj
+
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        """Return the interpolating functions and the parameter information.
+
+        For stacked interpolations, only the stacked function is stored.
+        """
+        names = sorted(self.param_index, key=lambda k: self.param_index[k])
+        state = {"param_names": names, "domain": self.domain}  # type: Any
+        if self._f_stack is not None:
+            state["f_stack"] = self._f_stack
+        else:
+            state["functions"] = (self._f0, self._fp, self._fm)
+        return state
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        if "f_stack" in state:
+            obj = self.from_stacked(
+                state["f_stack"], state["param_names"], state["domain"]
+            )
+        else:
+            obj = Interpolation(
+                *state["functions"],
+                param_names=state["param_names"],
+                domain=state["domain"]
+            )
+        self.__dict__.update(obj.__dict__)
 
     def _interpret_args(self, *args, **kwargs):
         # type: (Union[Sequence[float], float], float)->Sequence[float]
@@ -165,13 +261,21 @@ class Interpolation:
         # type: (Union[Sequence[float], float], float)->Tuple[float, float, float]
         """Return the tuple(central, +unc, -unc) at the point.
 
+        The arguments are interpreted once and each interpolating function is
+        evaluated once, which is faster than calling :meth:`f0`,
+        :meth:`unc_p_at`, and :meth:`unc_m_at` separately.
+
         Returns
         -------
         tuple(float, float, float)
             interpolated central value and positive and negative uncertainties.
         """
         x = self._interpret_args(*args, **kwargs)
-        return self._f0(x), self.unc_p_at(*x), self.unc_m_at(*x)
+        if self._f_stack is not None:
+            f0, fp, fm = self._f_stack(x)
+        else:
+            f0, fp, fm = self._f0(x), self._fp(x), self._fm(x)
+        return f0, fp - f0, -(f0 - fm)
 
     def unc_p_at(self, *args, **kwargs):
         # type: (Union[Sequence[float], float], float)->float
@@ -207,6 +311,1174 @@ class Interpolation:
         x = self._interpret_args(*args, **kwargs)
         return -(self._f0(x) - self._fm(x))
 
+    # ------------- #
+    # batch methods #
+    # ------------- #
+
+    def _batch_points(self, points):
+        # type: (Any)->numpy.ndarray
+        """Interpret the points for batch methods as an array (N, d).
+
+        A `pandas.DataFrame` is interpreted using :attr:`param_index`, i.e., it
+        must have columns named by the parameters. A one-dimensional array is
+        interpreted as points of a one-parameter interpolation.
+        """
+        if isinstance(points, pandas.DataFrame):
+            if not self.param_index:
+                raise ValueError("DataFrame requires parameter names.")
+            names = sorted(self.param_index, key=lambda k: self.param_index[k])
+            points = points[names].to_numpy(dtype=float)
+        xs = numpy.asarray(points, dtype=float)
+        if xs.ndim == 1:
+            xs = xs.reshape(-1, 1)
+        if xs.ndim != 2:
+            raise TypeError("Points must be an (N, d) array: shape %s", xs.shape)
+        if self.domain is not None and xs.shape[1] != len(self.domain):
+            raise TypeError("Invalid points for %d-dim fit", len(self.domain))
+        return xs
+
+    def _evaluate_batch(self, functions, points, out_of_domain, shape=()):
+        # type: (Sequence[Callable[[Any], Any]], Any, str, Tuple[int, ...])->List[numpy.ndarray]  # noqa: B950
+        """Evaluate the functions at the points with the out-of-domain policy.
+
+        Each function should return an array with shape :ar:`shape` per point.
+        """
+        if out_of_domain not in self.out_of_domain_policies:
+            raise ValueError("Invalid out_of_domain policy: %s", out_of_domain)
+        xs = self._batch_points(points)
+        inside = numpy.ones(len(xs), dtype=bool)
+        if self.domain is not None:
+            lower, upper = numpy.array(self.domain, dtype=float).T
+            if out_of_domain == "clip":
+                xs = numpy.clip(xs, lower, upper)
+            else:
+                inside = ((xs >= lower) & (xs <= upper)).all(axis=1)
+                if out_of_domain == "raise" and not inside.all():
+                    x = xs[numpy.argmin(inside)]
+                    raise ValueError("Point out of the domain: %s", x)
+
+        results = []
+        for f in functions:
+            ys = numpy.full((len(xs),) + shape, numpy.nan)
+            if inside.any():
+                ys[inside] = _call_batch(f, xs[inside])
+            if out_of_domain == "raise":
+                hole = numpy.isnan(ys.reshape(len(xs), -1)).any(axis=1)
+                if hole.any():
+                    x = xs[numpy.argmax(hole)]
+                    raise ValueError("Point in a hole of the grid: %s", x)
+            results.append(ys)
+        return results
+
+    def f0_batch(self, points, out_of_domain="nan"):
+        # type: (Any, str)->numpy.ndarray
+        """Return the central values at many points.
+
+        Arguments
+        ---------
+        points: numpy.ndarray or pandas.DataFrame
+            The points as an array with shape ``(N, d)``, or a DataFrame having
+            columns named by the parameters (see :attr:`param_index`).
+        out_of_domain: str
+            The policy for points out of :attr:`domain`:
+
+            :nan: the results are NaN for the points.
+            :raise: ValueError is raised, also for points in holes of the
+                    grid, i.e., where the interpolation gives NaN.
+            :clip: each parameter is clipped into the domain.
+
+        Returns
+        -------
+        numpy.ndarray
+            The interpolated central values with shape ``(N,)``.
+        """
+        return self._evaluate_batch([self._f0], points, out_of_domain)[0]
+
+    def fp_batch(self, points, out_of_domain="nan"):
+        # type: (Any, str)->numpy.ndarray
+        """Return the upper-fluctuated values at many points.
+
+        See :meth:`f0_batch` for the arguments.
+        """
+        return self._evaluate_batch([self._fp], points, out_of_domain)[0]
+
+    def fm_batch(self, points, out_of_domain="nan"):
+        # type: (Any, str)->numpy.ndarray
+        """Return the downer-fluctuated values at many points.
+
+        See :meth:`f0_batch` for the arguments.
+        """
+        return self._evaluate_batch([self._fm], points, out_of_domain)[0]
+
+    def tuple_batch(self, points, out_of_domain="nan"):
+        # type: (Any, str)->Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """Return the central values and uncertainties at many points.
+
+        This is the batch version of :meth:`tuple_at`; see :meth:`f0_batch`
+        for the arguments.
+
+        Returns
+        -------
+        tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            interpolated central values and positive and negative uncertainties,
+            each with shape ``(N,)``.
+        """
+        if self._f_stack is not None:
+            ys = self._evaluate_batch([self._f_stack], points, out_of_domain, (3,))
+            f0, fp, fm = ys[0].T
+        else:
+            f0, fp, fm = self._evaluate_batch(
+                [self._f0, self._fp, self._fm], points, out_of_domain
+            )
+        return f0, fp - f0, -(f0 - fm)
+
+    def tabulate(self, fraction=0.1, max_nodes=2 * 10 ** 6):
+        # type: (float, int)->Interpolation
+        """Return the interpolation resampled onto a fine uniform grid.
+
+        The interpolation is evaluated on a grid equally spaced in the axes of
+        its interpolator, e.g., log-log axes, and linearly interpolated on the
+        grid, so that the evaluation needs only arithmetic and is fast for
+        many points. The number of the grid points along each axis is
+        increased until the deviation from this interpolation is within
+        :ar:`fraction` of the smaller of the local uncertainties, which is
+        tested at the midpoints of the grid cells and at random points.
+
+        The result can be compiled by `interp.artifact` if the axes are
+        predefined; the artifact is memory-mapped on loading, so processes
+        loading the same artifact share the grid.
+
+        Arguments
+        ---------
+        fraction: float
+            The tolerated deviation relative to the local uncertainty.
+        max_nodes: int
+            The maximal number of the grid points.
+
+        Returns
+        -------
+        Interpolation
+            The interpolation on the fine grid with the same domain.
+
+        Raises
+        ------
+        ValueError
+            If the domain is not available or the deviation is not within the
+            tolerance with :ar:`max_nodes` grid points.
+        """
+        if self.domain is None:
+            raise ValueError("Tabulation requires the domain.")
+        wrapper, f_bar = self._transformed()
+        wx = wrapper.wx if wrapper else [lambda x: x] * len(self.domain)
+        bounds = numpy.array(
+            [w(numpy.array(d, dtype=float)) for w, d in zip(wx, self.domain)]
+        )
+        if not numpy.isfinite(bounds).all():
+            raise ValueError("Domain is not finite in the axes: %s", self.domain)
+        wy_inv = wrapper.wy_inv if wrapper else (lambda y: y)
+        # the number of the grid points is checked before they are evaluated.
+        if _Tabulation.INITIAL_SIZE ** len(bounds) > max_nodes:
+            raise ValueError("Tabulation needs more than %d nodes.", max_nodes)
+        tabulation = _Tabulation(bounds, f_bar, wy_inv, fraction)
+        while True:
+            factors = tabulation.refinement()
+            if factors is None:
+                break
+            sizes = [(n - 1) * k + 1 for n, k in zip(tabulation.sizes, factors)]
+            if numpy.prod(sizes) > max_nodes:
+                raise ValueError("Tabulation needs more than %d nodes.", max_nodes)
+            tabulation.refine(factors)
+        f_lut = tabulation.function()  # type: Callable[[Sequence[float]], Any]
+        if wrapper:
+            f_lut = wrapper.wrapped_f(f_lut)
+        names = sorted(self.param_index, key=lambda k: self.param_index[k])
+        return Interpolation.from_stacked(f_lut, names, self.domain)
+
+    def _transformed(self):
+        # type: ()->Tuple[Optional[AxesWrapper], Callable[[numpy.ndarray], numpy.ndarray]]  # noqa: B950
+        """Return the axes wrapper and the three series in the wrapped axes.
+
+        If the interpolating function is not given by an axes wrapper, the
+        series are given in the original axes without the wrapper.
+        """
+        f, columns = self._f_stack, slice(0, 3)
+        if isinstance(f, _JointComponent):
+            f, columns = f.f_joint, f.columns
+        if isinstance(f, _WrappedFunction):
+            f_bar = f.f_bar
+            return f.wrapper, lambda xs: _call_batch(f_bar, xs)[:, columns]
+        functions = [self._f0, self._fp, self._fm]
+        return None, lambda xs: numpy.column_stack(
+            self._evaluate_batch(functions, xs, "nan")
+        )
+
+
+class CompositeInterpolation(Interpolation):
+    """An interpolation stitched from interpolations on adjacent domains.
+
+    Some data are split into several grids, e.g., the default and high-mass
+    grids of NLL-fast, and each grid gives an interpolation valid on its own
+    domain. This class routes each point to the interpolation whose domain
+    contains the point, and provides the interface of `Interpolation`.
+
+    The routing uses an index precomputed from the boundaries of the domains,
+    with which a point is located by binary search along each axis. The batch
+    methods group the points by the routed interpolation, so that each
+    interpolation is evaluated once for its points.
+
+    Arguments
+    ---------
+    interpolations: list of Interpolation
+        The interpolations with :attr:`~Interpolation.domain` and the same
+        parameters. If domains overlap, the former interpolation is used.
+
+    Attributes
+    ----------
+    interpolations: list of Interpolation
+        The interpolations stitched.
+    domain: list[tuple(float, float)]
+        The bounding box of the domains of the interpolations. The results at
+        points in the box but not in any of the domains are NaN, or
+        ValueError is raised by the batch methods with ``"raise"`` policy.
+
+    Raises
+    ------
+    ValueError
+        If the interpolations are not given with domains of the same
+        dimension or have different parameters.
+    """
+
+    def __init__(self, interpolations):
+        # type: (Sequence[Interpolation])->None
+        if not interpolations or any(i.domain is None for i in interpolations):
+            raise ValueError("Interpolations with domains must be specified.")
+        if len({len(i.domain) for i in interpolations}) != 1:  # type: ignore
+            raise ValueError("Interpolations have different dimensions.")
+        param_index = interpolations[0].param_index
+        if any(i.param_index != param_index for i in interpolations):
+            raise ValueError("Interpolations have different parameters.")
+        self.interpolations = list(interpolations)
+        router = _Router([i.domain for i in interpolations])  # type: ignore
+        self._router = router
+        bounds = numpy.array([i.domain for i in interpolations])  # (n, d, 2)
+        domain = list(zip(bounds[:, :, 0].min(axis=0), bounds[:, :, 1].max(axis=0)))
+        names = sorted(param_index, key=lambda k: param_index[k])
+        if all(i._f_stack is not None for i in interpolations):
+            f_stack = _CompositeFunction(
+                [i._f_stack for i in interpolations], router, (3,)
+            )
+            Interpolation.__init__(
+                self,
+                _StackComponent(f_stack, 0),
+                _StackComponent(f_stack, 1),
+                _StackComponent(f_stack, 2),
+                param_names=names,
+                domain=domain,
+            )
+            self._f_stack = f_stack
+        else:
+            f0, fp, fm = [
+                _CompositeFunction([getattr(i, f) for i in interpolations], router)
+                for f in ["_f0", "_fp", "_fm"]
+            ]
+            Interpolation.__init__(self, f0, fp, fm, param_names=names, domain=domain)
+
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        """Return the interpolations stitched."""
+        return {"interpolations": self.interpolations}
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        self.__init__(state["interpolations"])  # type: ignore
+
+    def route(self, points):
+        # type: (Any)->numpy.ndarray
+        """Return the index of the interpolation used for each point.
+
+        Arguments
+        ---------
+        points: numpy.ndarray or pandas.DataFrame
+            The points; see :meth:`Interpolation.f0_batch`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The indices of :attr:`interpolations` with shape ``(N,)``, where
+            -1 denotes points not in any of the domains.
+        """
+        return self._router.route(self._batch_points(points))
+
+    def _evaluate_batch(self, functions, points, out_of_domain, shape=()):
+        # type: (Sequence[Callable[[Any], Any]], Any, str, Tuple[int, ...])->List[numpy.ndarray]  # noqa: B950
+        if out_of_domain == "raise":
+            xs = self._batch_points(points)
+            outside = self._router.route(xs) < 0
+            if outside.any():
+                x = xs[numpy.argmax(outside)]
+                raise ValueError("Point out of the domain: %s", x)
+        return Interpolation._evaluate_batch(
+            self, functions, points, out_of_domain, shape
+        )
+
+
+def tuple_batch_many(interpolations, points, out_of_domain="nan"):
+    # type: (Sequence[Interpolation], Any, str)->List[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]  # noqa: B950
+    """Return the values and uncertainties of many interpolations at points.
+
+    This is equivalent to calling :meth:`Interpolation.tuple_batch` for each
+    interpolation, but the interpolations constructed together by
+    :meth:`AbstractInterpolator.interpolate_many` are evaluated at once.
+
+    Arguments
+    ---------
+    interpolations: list of Interpolation
+        The interpolations to evaluate.
+    points: numpy.ndarray or pandas.DataFrame
+        The points; see :meth:`Interpolation.f0_batch`.
+    out_of_domain: str
+        The policy for points out of the domain; see
+        :meth:`Interpolation.f0_batch`.
+
+    Returns
+    -------
+    list of tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        The results of :meth:`Interpolation.tuple_batch` for each interpolation.
+    """
+    results = [None] * len(interpolations)  # type: List[Any]
+    joint = {}  # type: Any
+    for i, interpolation in enumerate(interpolations):
+        f_stack = interpolation._f_stack
+        if isinstance(f_stack, _JointComponent):
+            joint.setdefault(id(f_stack.f_joint), []).append(i)
+        else:
+            results[i] = interpolation.tuple_batch(points, out_of_domain)
+    for indices in joint.values():
+        first = interpolations[indices[0]]
+        f_joint = first._f_stack.f_joint  # type: ignore
+        starts = [interpolations[i]._f_stack.start for i in indices]  # type: ignore
+        width = max(starts) + 3
+        ys = first._evaluate_batch([f_joint], points, out_of_domain, (width,))[0]
+        for i, start in zip(indices, starts):
+            f0, fp, fm = ys[:, slice(start, start + 3)].T
+            results[i] = (f0, fp - f0, -(f0 - fm))
+    return results
+
+
+def _call_batch(f, xs):
+    # type: (Callable[[Any], Any], numpy.ndarray)->numpy.ndarray
+    """Call the batch method of the function, or the function point by point."""
+    if hasattr(f, "batch"):
+        return cast(numpy.ndarray, f.batch(xs))  # type: ignore
+    return numpy.array([f(x) for x in xs], dtype=float)
+
+
+class _StackComponent(object):
+    """One series of a stacked interpolating function."""
+
+    def __init__(self, f_stack, index):
+        # type: (Callable[[Sequence[float]], Any], int)->None
+        self.f_stack = f_stack
+        self.index = index
+
+    def __call__(self, x):
+        # type: (Sequence[float])->float
+        return cast(float, self.f_stack(x)[self.index])
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        return _call_batch(self.f_stack, xs)[:, self.index]
+
+
+class _JointComponent(object):
+    """Three series of an interpolating function jointly fit for many tables."""
+
+    def __init__(self, f_joint, start):
+        # type: (Callable[[Sequence[float]], Any], int)->None
+        self.f_joint = f_joint
+        self.start = start
+        self.columns = slice(start, start + 3)
+
+    def __call__(self, x):
+        # type: (Sequence[float])->numpy.ndarray
+        return cast(numpy.ndarray, self.f_joint(x)[self.columns])
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        return _call_batch(self.f_joint, xs)[:, self.columns]
+
+
+class _Router(object):
+    """Index locating the box containing each point.
+
+    The sorted boundaries of the boxes divide each axis into slots, i.e., the
+    boundaries themselves and the open intervals between them, and the box
+    used for each combination of the slots is precomputed. The slot of a
+    point along each axis is found by binary search.
+    """
+
+    def __init__(self, boxes):
+        # type: (Sequence[Sequence[Tuple[float, float]]])->None
+        bounds = numpy.array(boxes, dtype=float)  # (n, d, 2)
+        self.edges = [numpy.unique(bounds[:, j, :]) for j in range(bounds.shape[1])]
+        # representative values of the slots; the outermost slots are empty.
+        axes = []
+        for e in self.edges:
+            values = numpy.full(2 * len(e) + 1, numpy.nan)
+            values[1::2] = e
+            values[2:-1:2] = (e[:-1] + e[1:]) / 2
+            axes.append(values)
+        grid = numpy.stack(numpy.meshgrid(*axes, indexing="ij"), axis=-1)
+        self.table = numpy.full(grid.shape[:-1], -1, dtype=int)
+        for k in reversed(range(len(bounds))):  # the former boxes overwrite.
+            inside = (grid >= bounds[k, :, 0]) & (grid <= bounds[k, :, 1])
+            self.table[inside.all(axis=-1)] = k
+
+    def route(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        """Return the index of the box for each point (N, d), or -1 if none."""
+        slots = []
+        for j, e in enumerate(self.edges):
+            x = xs[:, j]
+            i = numpy.searchsorted(e, x, side="left")
+            on_edge = e[i.clip(0, len(e) - 1)] == x
+            slots.append(2 * i + on_edge)  # NaN falls in the last slot.
+        return self.table[tuple(slots)]
+
+
+class _CompositeFunction(object):
+    """Function dispatching points to functions by a `_Router`."""
+
+    def __init__(self, functions, router, shape=()):
+        # type: (Sequence[Callable[[Any], Any]], _Router, Tuple[int, ...])->None
+        self.functions = list(functions)
+        self.router = router
+        self.shape = shape
+
+    def __call__(self, x):
+        # type: (Sequence[float])->Any
+        k = self.router.route(numpy.array([x], dtype=float))[0]
+        if k < 0:
+            return numpy.full(self.shape, numpy.nan) if self.shape else numpy.nan
+        return self.functions[k](x)
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        routes = self.router.route(xs)
+        ys = numpy.full((len(xs),) + self.shape, numpy.nan)
+        for k in numpy.unique(routes[routes >= 0]):
+            group = routes == k
+            ys[group] = _call_batch(self.functions[k], xs[group])
+        return ys
+
+
+class _Interp1dFunction(object):
+    """Wrapper of scipy one-dimensional interpolants to accept points.
+
+    For pickling, piecewise polynomials, e.g., splines, are stored as their
+    coefficients and breakpoints and restored as `scipy.interpolate.PPoly`.
+    The `!kind` of `scipy.interpolate.interp1d` is kept for `interp.artifact`,
+    as the interpolant does not expose it.
+    """
+
+    def __init__(self, interp, kind=None):
+        # type: (Callable[[Any], Any], Optional[Any])->None
+        self.interp = interp
+        if isinstance(interp, sci_interp.PPoly):
+            self._state = {
+                "c": interp.c,
+                "x": interp.x,
+                "extrapolate": interp.extrapolate,
+            }  # type: Mapping[str, Any]
+        else:
+            self._state = {"interp": interp, "kind": kind}
+
+    @property
+    def kind(self):
+        # type: ()->Optional[Any]
+        """Return the kind of `scipy.interpolate.interp1d` if specified."""
+        return self._state.get("kind")
+
+    def __call__(self, x):
+        # type: (Sequence[float])->float
+        return cast(float, self.interp(*x))
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        return cast(numpy.ndarray, self.interp(xs[:, 0]))
+
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        return self._state
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        self._state = state
+        if "c" in state:
+            self.interp = sci_interp.PPoly.construct_fast(
+                state["c"], state["x"], state["extrapolate"]
+            )
+        else:
+            self.interp = state["interp"]
+
+
+def _tolerance(w, x, granularity):
+    # type: (Callable[[Any], Any], numpy.ndarray, Optional[float])->float
+    """Return the quantization error of the points in the transformed axis.
+
+    The points are quantized by the granularity, so they may deviate by half of
+    the granularity in the original axis, which is transformed by `!w`.
+    """
+    if not granularity:
+        return 0.0
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        error = numpy.abs(w(x + granularity / 2) - w(x - granularity / 2)) / 2
+    error = error[numpy.isfinite(error)]
+    return float(error.max()) if len(error) else 0.0
+
+
+class _Tabulation(object):
+    """Values of a function on a uniform grid, refined to be accurate.
+
+    Arguments
+    ---------
+    bounds: numpy.ndarray
+        The lower and upper bounds of each axis with shape (d, 2).
+    f_bar: function
+        The three series in the axes of the grid, accepting an array (N, d).
+    wy_inv: function
+        The function to convert the series into the original values.
+    fraction: float
+        The tolerated deviation relative to the local uncertainty.
+    """
+
+    INITIAL_SIZE = 17
+    """The initial number of the grid points along each axis."""
+
+    SAMPLES = 4096
+    """The number of the test points for each test."""
+
+    def __init__(
+        self,
+        bounds,  # type: numpy.ndarray
+        f_bar,  # type: Callable[[numpy.ndarray], numpy.ndarray]
+        wy_inv,  # type: Callable[[Any], Any]
+        fraction,  # type: float
+    ):
+        # type: (...)->None
+        self.bounds = bounds
+        self.f_bar = f_bar
+        self.wy_inv = wy_inv
+        self.fraction = fraction
+        self.sizes = [self.INITIAL_SIZE] * len(bounds)
+        self.random = numpy.random.RandomState(0)
+        self._evaluate()
+
+    def _evaluate(self):
+        # type: ()->None
+        self.grid = [
+            numpy.linspace(lo, hi, n) for (lo, hi), n in zip(self.bounds, self.sizes)
+        ]
+        nodes = numpy.stack(numpy.meshgrid(*self.grid, indexing="ij"), axis=-1)
+        values = self.f_bar(nodes.reshape(-1, len(self.sizes)))
+        self.values = values.reshape(tuple(self.sizes) + (3,))
+        self.lut = _LookupTable(self.grid, self.values)
+
+    def function(self):
+        # type: ()->_LookupTable
+        """Return the function interpolating the grid."""
+        return self.lut
+
+    def refine(self, factors):
+        # type: (Sequence[int])->None
+        """Divide the cells along each axis by the factors."""
+        self.sizes = [(n - 1) * k + 1 for n, k in zip(self.sizes, factors)]
+        self._evaluate()
+
+    def refinement(self):
+        # type: ()->Optional[List[int]]
+        """Return the factors to refine the grid, or None if accurate enough.
+
+        The interpolation along each axis is tested at the midpoints of the
+        cells along the axis, and then the cross terms at the centers of the
+        cells and at random points.
+        """
+        d = len(self.sizes)
+        excesses = [self._excess(self._test_points([j])) for j in range(d)]
+        if max(excesses) <= 1:
+            excess = max(
+                self._excess(self._test_points(list(range(d)))),
+                self._excess(
+                    self.random.uniform(
+                        self.bounds[:, 0], self.bounds[:, 1], (self.SAMPLES, d)
+                    )
+                ),
+            )
+            if excess <= 1:
+                return None
+            excesses = [excess] * d
+        # the deviation of the linear interpolation is quadratic in the step.
+        return [
+            int(max(2, numpy.ceil(1.2 * e ** 0.5))) if e > 1 else 1 for e in excesses
+        ]
+
+    def _test_points(self, axes):
+        # type: (Sequence[int])->numpy.ndarray
+        """Return random points at midpoints along the axes and nodes along others."""
+        columns = []
+        for j, (g, n) in enumerate(zip(self.grid, self.sizes)):
+            if j in axes:
+                i = self.random.randint(0, n - 1, self.SAMPLES)
+                columns.append((g[i] + g[i + 1]) / 2)
+            else:
+                columns.append(g[self.random.randint(0, n, self.SAMPLES)])
+        return numpy.column_stack(columns)
+
+    def _excess(self, xs):
+        # type: (numpy.ndarray)->float
+        """Return the maximal ratio of the deviation to the tolerance."""
+        exact = self.wy_inv(self.f_bar(xs))
+        approx = self.wy_inv(self.lut.batch(xs))
+        f0, fp, fm = exact.T
+        tolerance = self.fraction * numpy.minimum(fp - f0, f0 - fm)
+        # round-off errors are not regarded as deviations.
+        deviation = numpy.abs(approx - exact).max(axis=1) - 1e-12 * numpy.abs(f0)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            ratio = numpy.where(deviation > 0, deviation / tolerance, 0)
+        ratio = ratio[~numpy.isnan(ratio)]
+        return float(ratio.max()) if len(ratio) else 0.0
+
+
+class _Axis(object):
+    """Grid points along an axis with the lookup of the cells.
+
+    If the points are equally spaced up to the tolerance, the cell of a value
+    is estimated arithmetically and corrected by one comparison on each side.
+    Otherwise, the axis is divided into buckets narrower than the gaps of the
+    points, e.g., for points equally spaced before the axes preprocess, so
+    that the cell is given by the bucket with the same correction; if too
+    many buckets are needed, the cell is found by binary search. All of them
+    give the index `!i` with ``points[i] <= x < points[i+1]``, clipped to
+    the cells.
+    """
+
+    MAX_BUCKETS = 64
+    """The maximal number of the buckets per grid point."""
+
+    def __init__(self, points, tolerance=0.0):
+        # type: (numpy.ndarray, float)->None
+        self.points = points
+        self.tolerance = tolerance
+        self.spacing = uniform_spacing(points, tolerance) if len(points) > 1 else None
+        self.buckets = None  # type: Optional[numpy.ndarray]
+        if self.spacing is None and len(points) > 2:
+            start, width = points[0], numpy.diff(points).min()
+            n_buckets = int(numpy.ceil((points[-1] - start) / width))
+            if n_buckets <= self.MAX_BUCKETS * len(points):
+                edges = start + width * numpy.arange(n_buckets)
+                self.spacing = (float(start), float(width))
+                self.buckets = self._search(edges)
+
+    def __repr__(self):
+        # type: ()->str
+        n = len(self.points)
+        if self.buckets is not None:
+            return "bucketed({}, {})".format(n, len(self.buckets))
+        elif self.spacing:
+            return "uniform({:g}, {:g}, {})".format(self.spacing[0], self.spacing[1], n)
+        return "irregular({})".format(n)
+
+    def _search(self, x):
+        # type: (numpy.ndarray)->numpy.ndarray
+        last = max(len(self.points) - 2, 0)
+        return (numpy.searchsorted(self.points, x, side="right") - 1).clip(0, last)
+
+    def cells(self, x):
+        # type: (numpy.ndarray)->numpy.ndarray
+        """Return the index of the cell of each value."""
+        if self.spacing is None:
+            return self._search(x)
+        start, step = self.spacing
+        last = max(len(self.points) - 2, 0)
+        n_slots = last + 1 if self.buckets is None else len(self.buckets)
+        guess = numpy.nan_to_num(((x - start) / step).clip(0, n_slots - 1))
+        i = numpy.floor(guess).astype(numpy.int64)
+        if self.buckets is not None:
+            i = self.buckets[i]
+        i -= (x < self.points[i]) & (i > 0)
+        i += (x >= self.points[i + 1]) & (i < last)
+        return i
+
+
+class _MultilinearFunction(object):
+    """Multilinear interpolation on a rectilinear grid of any dimension.
+
+    The values are flattened so that the :math:`2^d` corners of a cell are at
+    fixed offsets from its lowest corner, given by the strides of the grid.
+    The cells of a batch of points are located along each axis by `_Axis`,
+    i.e., arithmetically on equally-spaced axes, and the values at the
+    corners are combined at once for all the series, i.e., the last axes of
+    the values.
+
+    Arguments
+    ---------
+    grid: list of numpy.ndarray
+        The grid points along each axis.
+    values: numpy.ndarray
+        The values on the grid, with additional axes for the series.
+    tolerances: list of float, optional
+        The deviations of the grid points from equal spacing to be tolerated
+        for each axis.
+    """
+
+    def __init__(
+        self,
+        grid,  # type: Sequence[numpy.ndarray]
+        values,  # type: numpy.ndarray
+        tolerances=None,  # type: Optional[Sequence[float]]
+    ):
+        # type: (...)->None
+        self.grid = [numpy.asarray(g, dtype=float) for g in grid]
+        self.values = values  # the shape of the grid + the shape of a value
+        self.tolerances = list(tolerances or [0.0] * len(self.grid))
+        self.axes = [_Axis(g, t) for g, t in zip(self.grid, self.tolerances)]
+        shape = tuple(len(g) for g in self.grid)
+        dim = len(shape)
+        if values.shape[:dim] != shape:
+            raise ValueError("Values do not match the grid: %s", values.shape)
+        if any((numpy.diff(g) <= 0).any() for g in self.grid):
+            raise ValueError("Grid points must be strictly ascending.")
+        self._flat = values.reshape((-1,) + values.shape[dim:])
+        self._strides = numpy.cumprod((1,) + shape[:0:-1])[::-1]
+        steps = numpy.where(numpy.array(shape) > 1, self._strides, 0)
+        bits = numpy.array(list(itertools.product([0, 1], repeat=dim)))
+        self._offsets = bits.reshape(-1, dim).dot(steps)
+
+    def __repr__(self):
+        # type: ()->str
+        return "_MultilinearFunction({})".format(", ".join(map(repr, self.axes)))
+
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        return {"grid": self.grid, "values": self.values, "tolerances": self.tolerances}
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        self.__init__(  # type: ignore
+            state["grid"], state["values"], state.get("tolerances")
+        )
+
+    def __call__(self, x):
+        # type: (Sequence[float])->Any
+        point = numpy.asarray(x, dtype=float)
+        if point.shape != (len(self.grid),):
+            raise TypeError("Invalid arguments for interpolation: %s", x)
+        if not all(g[0] <= p <= g[-1] for g, p in zip(self.grid, point)):
+            raise ValueError("Point out of the grid: %s", x)
+        result = self.batch(point.reshape(1, -1))[0]
+        return float(result) if result.ndim == 0 else result
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        """Return the values at the points (N, d); NaN out of the grid."""
+        base, fractions, inside = self._locate(xs)
+        # the corners are ordered with the first axis most significant; the
+        # lower and upper halves are combined along one axis after another.
+        n = len(xs)
+        ys = numpy.take(self._flat, base[:, None] + self._offsets, axis=0)
+        for t in fractions:
+            half = ys.shape[1] // 2
+            t = t.reshape((n, 1) + (1,) * (ys.ndim - 2))
+            ys = ys[:, :half] + t * (ys[:, half:] - ys[:, :half])
+        ys = ys[:, 0]
+        ys[~inside] = numpy.nan
+        return ys
+
+    def _locate(self, xs):
+        # type: (numpy.ndarray)->Tuple[numpy.ndarray, List[numpy.ndarray], numpy.ndarray]  # noqa: B950
+        """Return the flattened index of the cells, the fractions, and inside."""
+        n = len(xs)
+        base = numpy.zeros(n, dtype=numpy.int64)
+        fractions = []
+        inside = numpy.ones(n, dtype=bool)
+        for j, (g, axis) in enumerate(zip(self.grid, self.axes)):
+            x = xs[:, j]
+            inside &= (x >= g[0]) & (x <= g[-1])
+            if len(g) > 1:
+                i = axis.cells(x)
+                fractions.append((x - g[i]) / (g[i + 1] - g[i]))
+                base += i * self._strides[j]
+            else:
+                fractions.append(numpy.zeros(n))
+        return base, fractions, inside
+
+
+class _LookupTable(_MultilinearFunction):
+    """Multilinear interpolation on an equally-spaced grid.
+
+    The grid is given by `numpy.linspace` on each axis, e.g., by
+    `Interpolation.tabulate`, so that the cell and the fraction of a point
+    are given by arithmetic without any comparison with the grid points.
+    """
+
+    def __init__(self, grid, values):
+        # type: (Sequence[numpy.ndarray], numpy.ndarray)->None
+        super(_LookupTable, self).__init__(grid, values)
+        if any(len(g) < 2 for g in self.grid):
+            raise ValueError("Lookup table must have two grid points on each axis.")
+        self._lower = numpy.array([g[0] for g in self.grid])
+        self._upper = numpy.array([g[-1] for g in self.grid])
+        self._last = numpy.array([len(g) - 2 for g in self.grid])
+        self._step = (self._upper - self._lower) / (self._last + 1)
+
+    def __repr__(self):
+        # type: ()->str
+        return "_LookupTable({})".format([len(g) for g in self.grid])
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        self.__init__(state["grid"], state["values"])  # type: ignore
+
+    def _locate(self, xs):
+        # type: (numpy.ndarray)->Tuple[numpy.ndarray, List[numpy.ndarray], numpy.ndarray]  # noqa: B950
+        inside = ((xs >= self._lower) & (xs <= self._upper)).all(axis=1)
+        q = numpy.nan_to_num((xs - self._lower) / self._step)
+        i = numpy.floor(q).clip(0, self._last)
+        base = numpy.dot(i.astype(numpy.int64), self._strides)
+        return base, list((q - i).T), inside
+
+
+def _rows(df):
+    # type: (Any)->Tuple[List[numpy.ndarray], numpy.ndarray]
+    """Return the parameters and the values of the rows of data.
+
+    The parameters are given for each axis, i.e., as arrays (n,), and the
+    values are an array (n,), or (n, k) if the data is a DataFrame.
+    """
+    index = df.index
+    xs = [index.get_level_values(i).to_numpy() for i in range(index.nlevels)]
+    return xs, df.to_numpy(dtype=float)
+
+
+class _Mesh(object):
+    """Delaunay triangulation with a bucket index to locate points.
+
+    The bounding box of the data points is divided into buckets, as many as the
+    simplices, and each bucket has the list of the simplices overlapping with
+    it. A point is located by testing only the simplices in its bucket with
+    the barycentric transforms of the simplices.
+    """
+
+    VERSION = 1
+    """Version of the cached content, to be incremented if it is changed."""
+
+    _EPS = 1e-10
+    _KEYS = ["simplices", "transform", "lower", "width", "shape", "starts", "members"]
+
+    def __init__(self, arrays):
+        # type: (Mapping[str, numpy.ndarray])->None
+        self.simplices = arrays["simplices"]  # (m, d+1), vertex indices
+        self.transform = arrays["transform"]  # (m, d+1, d), barycentric transforms
+        self.lower = arrays["lower"]  # (d,), the lower corner of the buckets
+        self.width = arrays["width"]  # (d,), the size of a bucket
+        self.shape = arrays["shape"]  # (d,), the numbers of the buckets
+        self.starts = arrays["starts"]  # (n_buckets + 1,), offsets in members
+        self.members = arrays["members"]  # simplices of the buckets, concatenated
+
+    @classmethod
+    def build(cls, points):
+        # type: (numpy.ndarray)->_Mesh
+        """Triangulate the points (n, d) and construct the index."""
+        triangulation = sci_spatial.Delaunay(points)
+        simplices = triangulation.simplices.astype(numpy.int64)
+        n_simplices, dim = simplices.shape[0], points.shape[1]
+        lower, upper = points.min(axis=0), points.max(axis=0)
+        n_side = max(int(numpy.ceil(n_simplices ** (1.0 / dim))), 1)
+        shape = numpy.full(dim, n_side, dtype=numpy.int64)
+        width = numpy.where(upper > lower, (upper - lower) / shape, 1.0)
+
+        # enumerate the pairs of the simplices and the buckets they overlap.
+        vertices = points[simplices]
+        first = cls._bucket(vertices.min(axis=1), lower, width, shape)
+        counts = cls._bucket(vertices.max(axis=1), lower, width, shape) - first + 1
+        n_buckets = counts.prod(axis=1)
+        ids = numpy.repeat(numpy.arange(n_simplices), n_buckets)
+        k = numpy.arange(n_buckets.sum()) - numpy.repeat(
+            numpy.cumsum(n_buckets) - n_buckets, n_buckets
+        )
+        coords = numpy.empty((len(ids), dim), dtype=numpy.int64)
+        for j in reversed(range(dim)):
+            coords[:, j] = first[ids, j] + k % counts[ids, j]
+            k //= counts[ids, j]
+        keys = numpy.ravel_multi_index(coords.T, shape)
+        order = numpy.argsort(keys, kind="mergesort")
+        starts = numpy.searchsorted(keys[order], numpy.arange(shape.prod() + 1))
+        return cls(
+            {
+                "simplices": simplices,
+                "transform": triangulation.transform,
+                "lower": lower,
+                "width": width,
+                "shape": shape,
+                "starts": starts,
+                "members": ids[order],
+            }
+        )
+
+    @classmethod
+    def cached(cls, points):
+        # type: (numpy.ndarray)->_Mesh
+        """Return the mesh of the points, using the cache if available."""
+        digest = hashlib.sha256(
+            repr(points.shape).encode("utf-8") + points.tobytes()
+        ).hexdigest()
+        path = storage.cache_dir() / "delaunay" / "{}.bin".format(digest)
+        try:
+            meta, arrays = storage.load(path, mmap=True)
+            if meta.get("version") == cls.VERSION:
+                return cls(arrays)
+        except (IOError, OSError, ValueError):
+            pass
+        mesh = cls.build(points)
+        try:
+            storage.dump(
+                path, {"version": cls.VERSION}, {k: getattr(mesh, k) for k in cls._KEYS}
+            )
+        except (IOError, OSError) as e:
+            logger.debug("Triangulation is not cached: %s", e)
+        return mesh
+
+    @staticmethod
+    def _bucket(xs, lower, width, shape):
+        # type: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)->numpy.ndarray  # noqa: B950
+        """Return the bucket coordinates of the points (n, d)."""
+        return numpy.floor((xs - lower) / width).astype(numpy.int64).clip(0, shape - 1)
+
+    def locate(self, xs):
+        # type: (numpy.ndarray)->Tuple[numpy.ndarray, numpy.ndarray]
+        """Return the simplex containing each point and the barycentric weights.
+
+        Returns
+        -------
+        tuple(numpy.ndarray, numpy.ndarray)
+            The indices of the simplices (n,), -1 for points out of the convex
+            hull, and the barycentric coordinates (n, d+1).
+        """
+        n, dim = xs.shape
+        buckets = numpy.ravel_multi_index(
+            self._bucket(xs, self.lower, self.width, self.shape).T, self.shape
+        )
+        first, counts = self.starts[buckets], numpy.diff(self.starts)[buckets]
+        point_ids = numpy.repeat(numpy.arange(n), counts)
+        offsets = numpy.arange(counts.sum()) - numpy.repeat(
+            numpy.cumsum(counts) - counts, counts
+        )
+        candidates = self.members[numpy.repeat(first, counts) + offsets]
+        t = self.transform[candidates]
+        c = numpy.einsum("pij,pj->pi", t[:, :dim, :], xs[point_ids] - t[:, dim, :])
+        weights = numpy.column_stack([c, 1 - c.sum(axis=1)])
+        inside = (weights >= -self._EPS).all(axis=1)
+        found, index = numpy.unique(point_ids[inside], return_index=True)
+        simplex = numpy.full(n, -1, dtype=numpy.int64)
+        simplex[found] = candidates[inside][index]
+        result = numpy.full((n, dim + 1), numpy.nan)
+        result[found] = weights[inside][index]
+        return simplex, result
+
+
+class _DelaunayFunction(object):
+    """Piecewise-linear interpolation on a `_Mesh`."""
+
+    def __init__(self, mesh, values):
+        # type: (_Mesh, numpy.ndarray)->None
+        self.mesh = mesh
+        self.values = values  # (n,) or (n, k) for the vertices
+
+    def __call__(self, x):
+        # type: (Sequence[float])->Any
+        point = numpy.asarray(x, dtype=float)
+        if point.shape != (self.mesh.transform.shape[2],):
+            raise TypeError("Invalid arguments for interpolation: %s", x)
+        result = self.batch(point.reshape(1, -1))[0]
+        return float(result) if result.ndim == 0 else result
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        simplex, weights = self.mesh.locate(xs)
+        ys = numpy.full((len(xs),) + self.values.shape[1:], numpy.nan)
+        found = simplex >= 0
+        vertex_values = self.values[self.mesh.simplices[simplex[found]]]
+        ys[found] = numpy.einsum("nv,nv...->n...", weights[found], vertex_values)
+        return ys
+
+
+class _SparseGridFunction(object):
+    """Multilinear interpolation on the populated cells of a grid.
+
+    The cells are identified by the flattened index of their lower corners
+    and kept sorted with the rows of their corners, so that a point is located
+    along each axis by `_Axis` and then by binary search in the cell index.
+
+    Arguments
+    ---------
+    xs: list of numpy.ndarray
+        The parameters of the rows, one array (n,) for each axis.
+    ys: numpy.ndarray
+        The values of the rows with shape (n,) or (n, k); rows with NaN are
+        regarded as holes.
+    tolerances: list of float, optional
+        The deviations of the grid points from equal spacing to be tolerated
+        for each axis.
+    """
+
+    def __init__(self, xs, ys, tolerances=None):
+        # type: (Sequence[Any], numpy.ndarray, Optional[Sequence[float]])->None
+        points = numpy.column_stack([numpy.asarray(x, dtype=float) for x in xs])
+        valid = ~numpy.isnan(ys.reshape(len(ys), -1)).any(axis=1)
+        points, self.values = points[valid], ys[valid]
+        self.axes = [numpy.unique(x) for x in points.T]
+        self.locators = [
+            _Axis(a, t) for a, t in zip(self.axes, tolerances or [0.0] * len(xs))
+        ]
+        shape = tuple(len(a) for a in self.axes)
+        if min(shape) < 2:
+            raise ValueError("Sparse grid must have two grid points on each axis.")
+        codes = [numpy.searchsorted(a, x) for a, x in zip(self.axes, points.T)]
+        keys = numpy.ravel_multi_index(codes, shape)
+        order = numpy.argsort(keys)
+        if (numpy.diff(keys[order]) == 0).any():
+            raise ValueError("Sparse grid has duplicated grid points.")
+
+        # the 2^d corners of a cell and their offsets in the flattened index.
+        self.corners = numpy.array(list(itertools.product([0, 1], repeat=len(shape))))
+        self.strides = numpy.cumprod((1,) + shape[:0:-1])[::-1]
+        lower = (numpy.column_stack(codes) < numpy.array(shape) - 1).all(axis=1)
+        cell_keys = numpy.sort(keys[lower])
+        corner_keys = cell_keys[:, None] + numpy.dot(self.corners, self.strides)
+        position = numpy.searchsorted(keys[order], corner_keys).clip(0, len(keys) - 1)
+        populated = (keys[order][position] == corner_keys).all(axis=1)
+        self.cell_keys = cell_keys[populated]
+        self.cell_rows = order[position[populated]]  # (n_cells, 2^d)
+        if not len(self.cell_keys):
+            raise ValueError("Sparse grid has no populated cells.")
+
+    def __call__(self, x):
+        # type: (Sequence[float])->Any
+        point = numpy.asarray(x, dtype=float)
+        if point.shape != (len(self.axes),):
+            raise TypeError("Invalid arguments for interpolation: %s", x)
+        if any(not a[0] <= v <= a[-1] for a, v in zip(self.axes, point)):
+            raise ValueError("One of the requested xi is out of bounds: %s", x)
+        result = self.batch(point.reshape(1, -1))[0]
+        return float(result) if result.ndim == 0 else result
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        lower, on_line = [], []
+        for a, locator, x in zip(self.axes, self.locators, xs.T):
+            i = locator.cells(x)
+            lower.append(i)
+            on_line.append((a[i] == x) & (i > 0))  # also in the cell below
+        lower, on_line = numpy.column_stack(lower), numpy.column_stack(on_line)
+        cell, found = self._find(lower)
+        # a point on grid lines may be in a populated cell on the other side.
+        for shift in self.corners[1:]:
+            retry = ~found & (on_line | (shift == 0)).all(axis=1)
+            if retry.any():
+                cell[retry], found[retry] = self._find(lower[retry] - shift)
+                lower[retry & found] -= shift
+        ys = numpy.full((len(xs),) + self.values.shape[1:], numpy.nan)
+        if not found.any():
+            return ys
+        xs, lower, cell = xs[found], lower[found], cell[found]
+        t = numpy.column_stack(
+            [
+                (x - a[i]) / (a[i + 1] - a[i])
+                for a, x, i in zip(self.axes, xs.T, lower.T)
+            ]
+        )  # (n, d)
+        t = t[:, None, :]
+        weights = numpy.where(self.corners, t, 1 - t).prod(axis=2)  # (n, 2^d)
+        corner_values = self.values[self.cell_rows[cell]]  # (n, 2^d) or (n, 2^d, k)
+        ys[found] = numpy.einsum("nc,nc...->n...", weights, corner_values)
+        return ys
+
+    def _find(self, lower):
+        # type: (numpy.ndarray)->Tuple[numpy.ndarray, numpy.ndarray]
+        """Return the positions of the cells in the index and if they exist."""
+        keys = numpy.dot(lower, self.strides)
+        last = len(self.cell_keys) - 1
+        position = numpy.searchsorted(self.cell_keys, keys).clip(0, last)
+        return position, self.cell_keys[position] == keys
+
+
+class _BivariateSplineFunction(object):
+    """Wrapper of `scipy.interpolate.RectBivariateSpline`.
+
+    If a list of splines is given, the values of the splines are returned as
+    the last axis, i.e., as a stacked interpolation. The splines must share
+    the knots, which holds for interpolating splines on the same grid, so that
+    only the knots, the coefficients, and the degrees are kept for pickling.
+    """
+
+    def __init__(self, interp):
+        # type: (Any)->None
+        self.stacked = isinstance(interp, list)
+        splines = interp if self.stacked else [interp]
+        self.tx, self.ty, _ = splines[0].tck
+        for spline in splines:
+            if not (
+                numpy.array_equal(spline.tck[0], self.tx)
+                and numpy.array_equal(spline.tck[1], self.ty)
+            ):
+                raise ValueError("Stacked splines must share the knots.")
+        self.c = numpy.array([spline.tck[2] for spline in splines])
+        self.degrees = tuple(splines[0].degrees)
+        self.interp = interp
+
+    def __call__(self, x):
+        # type: (Sequence[float])->Any
+        if self.stacked:
+            return numpy.array([float(i(*x)) for i in self.interp])
+        return float(self.interp(*x))
+
+    def batch(self, xs):
+        # type: (numpy.ndarray)->numpy.ndarray
+        if self.stacked:
+            return numpy.column_stack(
+                [i(xs[:, 0], xs[:, 1], grid=False) for i in self.interp]
+            )
+        return cast(numpy.ndarray, self.interp(xs[:, 0], xs[:, 1], grid=False))
+
+    def __getstate__(self):
+        # type: ()->Mapping[str, Any]
+        """Return the knots, the coefficients, and the degrees of the splines."""
+        return {
+            "tx": self.tx,
+            "ty": self.ty,
+            "c": self.c,
+            "degrees": self.degrees,
+            "stacked": self.stacked,
+        }
+
+    def __setstate__(self, state):
+        # type: (Mapping[str, Any])->None
+        self.__dict__.update(state)
+        splines = [self._spline(c) for c in self.c]
+        self.interp = splines if self.stacked else splines[0]
+
+    def _spline(self, c):
+        # type: (numpy.ndarray)->sci_interp.RectBivariateSpline
+        """Return the spline with the coefficients without fitting.
+
+        The spline is evaluated by its public attributes `!tck` and `!degrees`,
+        which are set here as scipy has no public constructor from them.
+        """
+        spline = sci_interp.RectBivariateSpline.__new__(sci_interp.RectBivariateSpline)
+        spline.tck = (self.tx, self.ty, c)
+        spline.degrees = tuple(self.degrees)
+        return spline
+
 
 class AbstractInterpolator:
     """A base class of interpolator for values with uncertainties.
@@ -214,8 +1486,22 @@ class AbstractInterpolator:
     Actual interpolator should implement :meth:`_interpolate` method, which
     accepts a `pandas.DataFrame` object with one value-column and returns an
     interpolating function (|InterpType|).
+
+    If :attr:`_stackable` is True, :meth:`_interpolate` is instead called once
+    with a `pandas.DataFrame` with three value-columns, i.e., the central,
+    upper-fluctuated, and downer-fluctuated values, and should return a
+    function whose values have the three series as the last axis. Then the
+    three series share the axis transformation and the cell search.
+
+    If :attr:`_granular` is True, :meth:`_interpolate` is called with the
+    keyword argument `!granularity`, the list of the granularities of the
+    parameters (see `BaseTable.granularities`), so that the interpolator can
+    tolerate the quantization of the grid points.
     """
 
+    _stackable = False
+    _granular = False
+
     def interpolate(self, table):
         # type: (BaseTable)->Interpolation
         """Perform interpolation for values with uncertainties.
@@ -232,13 +1518,105 @@ class AbstractInterpolator:
         Interpolation
             The interpolation result.
         """
+        series = self._series(table)
+        param_names = table.index.names
+        domain = self._domain(table.index)
+        kw = self._options(table)
+        if self._stackable:
+            df = pandas.concat(series, axis=1, keys=["f0", "fp", "fm"])
+            return Interpolation.from_stacked(
+                self._interpolate(df, **kw), param_names=param_names, domain=domain
+            )
         return Interpolation(
-            self._interpolate(table["value"]),
-            self._interpolate(table["value"] + table["unc+"]),
-            self._interpolate(table["value"] - abs(table["unc-"])),
-            param_names=table.index.names,
+            *[self._interpolate(s, **kw) for s in series],
+            param_names=param_names,
+            domain=domain
         )
 
+    def interpolate_many(self, tables):
+        # type: (Sequence[BaseTable])->List[Interpolation]
+        """Perform interpolation for tables, sharing work among the tables.
+
+        If the interpolator is stackable and the tables have the identical
+        parameter grid, the series of all the tables are interpolated at once,
+        so that they share the axis transformation, the fitting, and, in
+        `tuple_batch_many`, the cell search. Otherwise each table is
+        interpolated separately.
+
+        Arguments
+        ---------
+        tables: list of BaseTable
+            Cross-section data tables.
+
+        Returns
+        -------
+        list of Interpolation
+            The interpolation results, equivalent to those of
+            :meth:`interpolate` for each table.
+        """
+        tables = list(tables)
+        index = tables[0].index if tables else None
+        if not (
+            self._stackable
+            and len(tables) > 1
+            and all(t.index.equals(index) for t in tables[1:])
+        ):
+            return [self.interpolate(t) for t in tables]
+        series = [s for t in tables for s in self._series(t)]
+        df = pandas.concat(series, axis=1, keys=list(range(len(series))))
+        f_joint = self._interpolate(df, **self._options(tables[0]))
+        param_names = index.names
+        domain = self._domain(index)
+        return [
+            Interpolation.from_stacked(
+                _JointComponent(f_joint, 3 * i), param_names=param_names, domain=domain
+            )
+            for i in range(len(tables))
+        ]
+
+    def interpolate_composite(self, tables):
+        # type: (Sequence[BaseTable])->CompositeInterpolation
+        """Perform interpolation for tables on adjacent domains and stitch them.
+
+        Arguments
+        ---------
+        tables: list of BaseTable
+            Cross-section data tables of the same parameters, e.g., the default
+            and high-mass grids of a process. If their grids overlap, the
+            former table is used.
+
+        Returns
+        -------
+        CompositeInterpolation
+            The interpolation using the interpolation of each table within its
+            grid.
+        """
+        return CompositeInterpolation(self.interpolate_many(tables))
+
+    def _options(self, table):
+        # type: (BaseTable)->Mapping[str, Any]
+        """Return the keyword arguments of :meth:`_interpolate` for the table."""
+        if self._granular and isinstance(table, BaseTable):
+            return {"granularity": table.granularities()}
+        return {}
+
+    @staticmethod
+    def _series(table):
+        # type: (BaseTable)->List[pandas.Series]
+        """Return the central, upper-fluctuated, and downer-fluctuated values."""
+        return [
+            table["value"],
+            table["value"] + table["unc+"],
+            table["value"] - abs(table["unc-"]),
+        ]
+
+    @staticmethod
+    def _domain(index):
+        # type: (pandas.Index)->List[Tuple[float, float]]
+        """Return the bounds of each parameter of the grid."""
+        levels = [index.get_level_values(i) for i in range(index.nlevels)]
+        return [(level.min(), level.max()) for level in levels]
+
     def _interpolate(self, df):
         # type: (pandas.DataFrame)->InterpType
         raise NotImplementedError
@@ -316,11 +1694,17 @@ class Scipy1dInterpolator(AbstractInterpolator):
        https://gist.github.com/misho104/46032fa730088a0cb4c2e0556c59260b
     """
 
+    _stackable = True
+
     def __init__(self, kind="linear", axes="linear"):
         # type: (str, str)->None
         self.kind = kind.lower()  # type: str
         self.axes = axes.lower()  # type: str
 
+    def __repr__(self):
+        # type: ()->str
+        return "Scipy1dInterpolator(kind={!r}, axes={!r})".format(self.kind, self.axes)
+
     def _interpolate(self, df):
         # type: (pandas.DataFrame)->InterpType
         if self.axes == "linear":
@@ -337,7 +1721,8 @@ class Scipy1dInterpolator(AbstractInterpolator):
         if df.index.nlevels != 1:
             raise ValueError("Scipy1dInterpolator not handle multiindex data.")
 
-        # axes modification; note that the wrappers are numpy.vectorize()-ed.
+        # axes modification; note that the wrappers are applicable to arrays.
+        # ys has the shape (n_points,) or (n_points, n_series) if stacked.
         xs = wrapper.wx[0](df.index.to_numpy())
         ys = wrapper.wy(df.to_numpy())
 
@@ -349,15 +1734,10 @@ class Scipy1dInterpolator(AbstractInterpolator):
             f_bar = sci_interp.Akima1DInterpolator(xs, ys)
             f_bar.extrapolate = False
         else:
-            f_bar = sci_interp.interp1d(xs, ys, self.kind, bounds_error=True)
+            f_bar = sci_interp.interp1d(xs, ys, self.kind, axis=0, bounds_error=True)
 
         # now `f_bar` is float->float; we should convert it to Tuple[float]->float.
-
-        def _f_bar(x, f_bar=f_bar):  # noqa: B008
-            # type: (Sequence[float], Callable[[float], float])->float
-            return f_bar(*x)
-
-        return wrapper.wrapped_f(_f_bar)
+        return wrapper.wrapped_f(_Interp1dFunction(f_bar, self.kind))
 
 
 class ScipyGridInterpolator(AbstractInterpolator):
@@ -370,33 +1750,54 @@ class ScipyGridInterpolator(AbstractInterpolator):
         only for two-parameter interpolations.
 
         :linear:
-            uses `scipy.interpolate.RegularGridInterpolator` with
-            method="linear", which linearly interpolates the grid mesh.
+            linearly interpolates the grid mesh of any dimension, as
+            `scipy.interpolate.RegularGridInterpolator` with method="linear"
+            does, with the cell search and the evaluation vectorized over
+            the points of the batch methods.
         :spline:
             alias of "spline33".
         :spline33:
             uses `scipy.interpolate.RectBivariateSpline` with order (3, 3); the
             numbers may be 1 to 5, but "spline11" is equivalent to "linear".
+        :sparse:
+            linearly interpolates the grid mesh as "linear", but for grids not
+            filling the rectangle, e.g., triangular grids or grids with holes.
+            Only the populated cells, i.e., the cells whose corners are all
+            grid points, are kept with a sorted index, so that the memory is
+            proportional to the number of the grid points. The results in
+            the other cells are NaN.
 
     axes_wrapper: AxesWrapper, optional
         Object for axes preprocess. If unspecified, no preprocess is performed.
+
+    Note
+    ----
+    For "linear" and "sparse", the grid cells are located arithmetically
+    along the axes on which the grid points are equally spaced after the axes
+    preprocess, e.g., grids with constant mass steps in linear axes or with
+    constant ratios in log axes. The grid points may deviate from the equal
+    spacing by the quantization with their granularity. The other axes are
+    searched by binary search.
     """
 
+    _stackable = True
+    _granular = True
+
     def __init__(self, kind="linear", axes_wrapper=None):
         # type: (str, Optional[AxesWrapper])->None
         self.kind = kind.lower()  # type: str
         self.axes_wrapper = axes_wrapper  # type: Optional[AxesWrapper]
 
-    def _interpolate(self, df):
-        # type: (pandas.DataFrame)->InterpType
-        try:
-            xs = df.index.levels  # multiindex case
-            ys = df.unstack().to_numpy()
-        except AttributeError:
-            xs = [df.index.values]
-            ys = df.to_numpy()
-        # xs: list with n_dim elements; each is a list of grid points along an axis.
-        # ys: a numpy matrix with ndim = n_dim, i.e., "unstacked" tensor.
+    def __repr__(self):
+        # type: ()->str
+        return "ScipyGridInterpolator(kind={!r}, axes_wrapper={!r})".format(
+            self.kind, self.axes_wrapper
+        )
+
+    def _interpolate(self, df, granularity=None):
+        # type: (pandas.DataFrame, Optional[Sequence[Optional[float]]])->InterpType
+        xs, ys = self._grid_data(df)
+        granularity = granularity or [None] * len(xs)
 
         # wrap
         if self.axes_wrapper:
@@ -406,12 +1807,20 @@ class ScipyGridInterpolator(AbstractInterpolator):
                     len(self.axes_wrapper.wx),
                     len(xs),
                 )
-            xs = [w(axis) for w, axis in zip(self.axes_wrapper.wx, xs)]
+            tolerances = [
+                _tolerance(w, numpy.asarray(x, dtype=float), g)
+                for w, x, g in zip(self.axes_wrapper.wx, xs, granularity)
+            ]
+            xs = [w(numpy.asarray(x)) for w, x in zip(self.axes_wrapper.wx, xs)]
             ys = self.axes_wrapper.wy(ys)
+        else:
+            tolerances = [(g or 0) / 2 for g in granularity]
 
         # call scipy
         if self.kind == "linear":
-            f_bar = self._interpolate_linear(xs, ys)
+            f_bar = _MultilinearFunction(xs, ys, tolerances)
+        elif self.kind == "sparse":
+            f_bar = _SparseGridFunction(xs, ys, tolerances)
         elif self.kind == "spline":
             f_bar = self._interpolate_spline(xs, ys, 3, 3)
         elif re.match(r"\Aspline[1-5][1-5]\Z", self.kind):
@@ -425,16 +1834,28 @@ class ScipyGridInterpolator(AbstractInterpolator):
         else:
             return f_bar
 
-    def _interpolate_linear(self, xs, ys):
-        # type: (Any, Any)->Callable[[Sequence[float]], float]
-        interp = sci_interp.RegularGridInterpolator(xs, ys, method="linear")
-        interp.bounds_error = True
-
-        def f_bar(x, _f_bar=interp):
-            # type: (Sequence[float], Any)->float
-            return float(_f_bar(x))
-
-        return f_bar
+    def _grid_data(self, df):
+        # type: (pandas.DataFrame)->Tuple[Any, numpy.ndarray]
+        """Return the parameters and the values to be interpolated."""
+        stacked = isinstance(df, pandas.DataFrame)
+        if self.kind == "sparse":
+            return _rows(df)
+        tensors = []
+        for series in [df[c] for c in df.columns] if stacked else [df]:
+            if isinstance(series.index, pandas.MultiIndex):
+                index = series.index.remove_unused_levels()
+                xs = index.levels
+                full = pandas.MultiIndex.from_product(xs, names=index.names)
+                shape = [len(x) for x in xs]
+                tensors.append(series.reindex(full).to_numpy().reshape(shape))
+            else:
+                xs = [series.index.values]
+                tensors.append(series.to_numpy())
+        ys = numpy.stack(tensors, axis=-1) if stacked else tensors[0]
+        # xs: list with n_dim elements; each is a list of grid points along an axis.
+        # ys: a numpy matrix with ndim = n_dim, i.e., "unstacked" tensor, with an
+        #     additional last axis for the series if stacked.
+        return xs, ys
 
     def _interpolate_spline(self, xs, ys, kx, ky):
         # type: (Any, Any, int, int)->Callable[[Sequence[float]], float]
@@ -443,19 +1864,91 @@ class ScipyGridInterpolator(AbstractInterpolator):
 
         if numpy.isnan(ys).any():
             raise ValueError("Spline interpolation does not allow missing grid points.")
-        interp = sci_interp.RectBivariateSpline(xs[0], xs[1], ys, s=0, kx=kx, ky=ky)
+        if ys.ndim == 3:  # stacked; RectBivariateSpline accepts only scalar values.
+            interp = [
+                sci_interp.RectBivariateSpline(xs[0], xs[1], y, s=0, kx=kx, ky=ky)
+                for y in numpy.moveaxis(ys, -1, 0)
+            ]  # type: Any
+        else:
+            interp = sci_interp.RectBivariateSpline(xs[0], xs[1], ys, s=0, kx=kx, ky=ky)
+        return _BivariateSplineFunction(interp)
+
+
+def default_interpolator(n_params):
+    # type: (int)->AbstractInterpolator
+    """Return the interpolator recommended for tables with the parameters.
+
+    Cubic splines in log-log axes are used for one or two parameters, and
+    linear interpolation in log axes for more parameters. This is the
+    interpolator used by the command-line script.
+    """
+    if n_params == 1:
+        return Scipy1dInterpolator(axes="loglog", kind="spline")
+    wrapper = AxesWrapper(["log" for _ in range(n_params)], "log")
+    kind = "spline33" if n_params == 2 else "linear"
+    return ScipyGridInterpolator(axes_wrapper=wrapper, kind=kind)
 
-        def f_bar(x, _f_bar=interp):
-            # type: (Sequence[float], Any)->float
-            return float(_f_bar(*x))
 
-        return f_bar
+class ScipyMultiDimensionalInterpolator(AbstractInterpolator):
+    """Interpolator for multi-dimensional non-structural data.
 
+    The data points, e.g., of adaptive parameter scans, need not form a grid.
+    They are triangulated by `scipy.spatial.Delaunay` in the axes given by the
+    axes wrapper, and the values are linearly interpolated in each simplex as
+    `scipy.interpolate.LinearNDInterpolator` does. The results out of the
+    convex hull of the data points are NaN.
 
-# class ScipyMultiDimensionalInterpolator(AbstractInterpolator):
-#    """Interpolator for multi - dimensional non - structural data.
-#
-#    Among the several implementations in scipy.interpolate for multi-
-#    dimensional non - structural data, "linear" (LinearNDInterpolator) and
-#    "spline" (LSQBivariateSpline) are sensible for cross - section fitting.
-#    """
+    The triangulation and an index to locate points in the simplices are
+    cached in `storage.cache_dir` with the coordinates of the data points as
+    the key, so that they are computed only once for the data. The batch
+    methods locate all the points at once with the index.
+
+    Arguments
+    ---------
+    kind: str
+        Specifies the interpolator types; only "linear" is available.
+    axes_wrapper: AxesWrapper, optional
+        Object for axes preprocess. If unspecified, no preprocess is performed.
+    cache: bool
+        Whether to cache the triangulation in the cache directory.
+    """
+
+    _stackable = True
+
+    def __init__(self, kind="linear", axes_wrapper=None, cache=True):
+        # type: (str, Optional[AxesWrapper], bool)->None
+        self.kind = kind.lower()  # type: str
+        self.axes_wrapper = axes_wrapper  # type: Optional[AxesWrapper]
+        self.cache = cache  # type: bool
+
+    def __repr__(self):
+        # type: ()->str
+        return "ScipyMultiDimensionalInterpolator(kind={!r}, axes_wrapper={!r})".format(
+            self.kind, self.axes_wrapper
+        )
+
+    def _interpolate(self, df):
+        # type: (pandas.DataFrame)->InterpType
+        if self.kind != "linear":
+            raise ValueError("Invalid kind: %s", self.kind)
+        xs, ys = _rows(df)
+        if len(xs) < 2:
+            raise ValueError("ScipyMultiDimensionalInterpolator is for 2d or more.")
+        if self.axes_wrapper:
+            if len(self.axes_wrapper.wx) != len(xs):
+                raise ValueError(
+                    "Axes wrapper for %d-dim is specified for %d-dim interp.",
+                    len(self.axes_wrapper.wx),
+                    len(xs),
+                )
+            xs = [w(numpy.asarray(x)) for w, x in zip(self.axes_wrapper.wx, xs)]
+            ys = self.axes_wrapper.wy(ys)
+        points = numpy.column_stack(xs).astype(float)
+        valid = ~numpy.isnan(ys.reshape(len(ys), -1)).any(axis=1)
+        points, ys = numpy.ascontiguousarray(points[valid]), ys[valid]
+        mesh = _Mesh.cached(points) if self.cache else _Mesh.build(points)
+        f_bar = _DelaunayFunction(mesh, ys)
+        if self.axes_wrapper:
+            return self.axes_wrapper.wrapped_f(f_bar)
+        else:
+            return f_bar
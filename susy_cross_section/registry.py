@@ -0,0 +1,229 @@
+"""Process-wide registry of loaded table files.
+
+Loading a grid file takes disk access and parsing, which is wasteful if the
+same table is used many times in a long-running process. The registry keeps
+loaded `File` objects and returns the same object for repeated requests, so
+that a repeated lookup costs a dictionary access. The objects are shared, so
+the data of their tables are read-only; in-place modification of the tables
+raises ValueError, and a copy should be modified instead.
+
+The number of kept files and their total memory usage are limited by
+:data:`config.registry_size` and :data:`config.registry_memory`; the least
+recently used files are evicted first.
+
+============== ========================================================
+`load`         return a `File` object from the default registry
+`Registry`     registry of `File` objects with LRU eviction
+============== ========================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import collections
+import logging
+import pathlib
+import sys
+import threading
+from typing import (  # noqa: F401
+    Hashable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import pandas
+
+import susy_cross_section.config as config
+from susy_cross_section.table import File
+from susy_cross_section.utility import get_paths
+
+if sys.version_info[0] < 3:  # py2
+    str = basestring  # noqa: A001, F821
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[pathlib.Path, str]
+PathPair = Tuple[pathlib.Path, pathlib.Path]
+
+
+def _memory_usage(data_file):
+    # type: (File)->int
+    """Return the approximate memory usage of a file object in bytes."""
+    frames = [table._df for table in data_file.tables.values()]
+    if data_file._data is not None:
+        frames.append(data_file._data)
+    if data_file._raw_data is not None:
+        frames.append(data_file._raw_data)
+    return sum(int(df.memory_usage(index=True, deep=True).sum()) for df in frames)
+
+
+def _freeze(data_file):
+    # type: (File)->None
+    """Make the data of the tables read-only."""
+    for table in data_file.tables.values():
+        values = table._df.to_numpy(copy=True)
+        values.flags.writeable = False
+        table._df = pandas.DataFrame(
+            values, index=table._df.index, columns=table._df.columns, copy=False
+        )
+
+
+class Registry(object):
+    """Registry of loaded `File` objects with LRU eviction.
+
+    Arguments
+    ---------
+    max_entries: int, optional
+        The maximal number of files to keep; :data:`config.registry_size` is
+        used if unspecified.
+    max_bytes: int, optional
+        The memory budget in bytes; :data:`config.registry_memory` is used if
+        unspecified. The most recently used file is always kept even if it
+        exceeds the budget.
+
+    Attributes
+    ----------
+    hits: int
+        The number of requests served from the registry.
+    misses: int
+        The number of requests that required loading a file.
+    evictions: int
+        The number of files evicted due to the limits.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        # type: (Optional[int], Optional[int])->None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._files = collections.OrderedDict()  # type: collections.OrderedDict[PathPair, File]  # noqa: B950
+        self._sizes = {}  # type: MutableMapping[PathPair, int]
+        self._aliases = {}  # type: MutableMapping[Hashable, PathPair]
+        self._lock = threading.RLock()
+
+    def _resolve(self, key_or_path, info_path=None):
+        # type: (PathLike, Optional[PathLike])->PathPair
+        """Return the absolute paths of the files, memoizing the lookup."""
+        alias = (type(key_or_path), key_or_path, info_path)
+        if alias not in self._aliases:
+            grid, info = get_paths(key_or_path, info_path)
+            self._aliases[alias] = (grid.resolve(), info.resolve())
+        return self._aliases[alias]
+
+    def load(self, key_or_path, info_path=None):
+        # type: (PathLike, Optional[PathLike])->File
+        """Return the file object, loading it if not in the registry.
+
+        Arguments
+        ---------
+        key_or_path: str or pathlib.Path
+            A table name predefined in configuration or path to a grid file,
+            interpreted as in `get_paths`.
+        info_path: str or pathlib.Path, optional
+            Path to the info file, which overrides the default setting.
+
+        Returns
+        -------
+        File
+            The shared file object with all the tables built, whose data are
+            read-only.
+
+        Raises
+        ------
+        FileNotFoundError
+            If one of the specified files is not found.
+        """
+        with self._lock:
+            paths = self._resolve(key_or_path, info_path)
+            data_file = self._files.get(paths)
+            if data_file is not None:
+                self.hits += 1
+                self._files[paths] = self._files.pop(paths)  # move to end
+                return data_file
+
+            self.misses += 1
+            data_file = File(paths[0], paths[1], lazy=False)
+            _freeze(data_file)
+            self._files[paths] = data_file
+            self._sizes[paths] = _memory_usage(data_file)
+            self._evict()
+            return data_file
+
+    def _evict(self):
+        # type: ()->None
+        """Remove the least recently used files exceeding the limits."""
+        max_entries = self.max_entries
+        if max_entries is None:
+            max_entries = config.registry_size
+        max_bytes = self.max_bytes
+        if max_bytes is None:
+            max_bytes = config.registry_memory
+        while len(self._files) > 1 and (
+            len(self._files) > max_entries
+            or (max_bytes is not None and self.memory_usage() > max_bytes)
+        ):
+            paths, _ = self._files.popitem(last=False)
+            del self._sizes[paths]
+            self.evictions += 1
+            logger.debug("Registry evicted %s", paths[0].__str__())
+
+    def memory_usage(self):
+        # type: ()->int
+        """Return the approximate memory usage of the kept files in bytes."""
+        return sum(self._sizes.values())
+
+    def stats(self):
+        # type: ()->Mapping[str, int]
+        """Return the statistics of the registry as a dict."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._files),
+                "bytes": self.memory_usage(),
+            }
+
+    def invalidate(self, key_or_path=None, info_path=None):
+        # type: (Optional[PathLike], Optional[PathLike])->bool
+        """Remove a file from the registry, or all the files if unspecified.
+
+        The removed file is loaded again on the next request; objects already
+        returned are not affected.
+
+        Returns
+        -------
+        bool
+            Whether any file was removed.
+        """
+        with self._lock:
+            if key_or_path is None:
+                removed = bool(self._files)
+                self._files.clear()
+                self._sizes.clear()
+                self._aliases.clear()
+                return removed
+            paths = self._resolve(key_or_path, info_path)
+            for alias in [k for k, v in self._aliases.items() if v == paths]:
+                del self._aliases[alias]
+            self._sizes.pop(paths, None)
+            return self._files.pop(paths, None) is not None
+
+
+default_registry = Registry()
+"""The registry used by `load`."""
+
+
+def load(key_or_path, info_path=None):
+    # type: (PathLike, Optional[PathLike])->File
+    """Return a shared `File` object from the default registry.
+
+    See `Registry.load` for the arguments. The returned object is shared in
+    the process and its tables are read-only; copy the tables if needed.
+    """
+    return default_registry.load(key_or_path, info_path)
@@ -1,28 +1,42 @@
 """Scripts for user's ease of handling the data.
 
 For details, see the manual or try to execute with ``--help`` option.
+
+The modules depending on pandas and scipy are imported in the sub-commands
+that need them, so that light sub-commands such as ``list`` start quickly.
 """
 
 from __future__ import absolute_import, division, print_function  # py2
 
+import itertools
+import json
 import logging
 import pathlib
 import sys
-from typing import Any, List, MutableMapping, Optional, Tuple  # noqa: F401
+import time
+from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    TextIO,
+    Tuple,
+)
 
 import click
-import colorama
-import coloredlogs
 
 import susy_cross_section.config as config
 import susy_cross_section.utility as Util
-from susy_cross_section.interp.axes_wrapper import AxesWrapper
-from susy_cross_section.interp.interpolator import (
-    AbstractInterpolator,
-    Scipy1dInterpolator,
-    ScipyGridInterpolator,
-)
-from susy_cross_section.table import File
+
+if TYPE_CHECKING:  # imported in the functions to speed up the start.
+    import numpy  # noqa: F401
+    from susy_cross_section.interp.interpolator import Interpolation  # noqa: F401
+    from susy_cross_section.table import File  # noqa: F401
 
 __author__ = "Sho Iwamoto"
 __copyright__ = "Copyright (C) 2018-2019 Sho Iwamoto / Misho"
@@ -37,11 +51,15 @@ logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 _DEFAULT_VALUE_NAME = "xsec"
+_DELIMITERS = {"csv": ",", "tsv": "\t"}
+_OUT_OF_DOMAIN_POLICIES = ["nan", "raise", "clip"]  # of Interpolation
 
 
 def _configure_logger():
     # type: ()->None
     """Configure logger so that proper logs are shown on console."""
+    import coloredlogs
+
     coloredlogs.install(
         level=logging.INFO, logger=logging.getLogger(), fmt="%(levelname)8s %(message)s"
     )
@@ -70,11 +88,11 @@ def _display_usage_for_file(context, data_file, **kw):
     values_lines = [
         "    {title:17} --name={name}   [unit: {unit}]  {default}".format(
             title="Table-specific options:" if i == 0 else "",
-            name=name,
-            unit=table.unit,
-            default="(default)" if name == _DEFAULT_VALUE_NAME else "",
+            name=v.column,
+            unit=data_file.info.get_column(v.column).unit,
+            default="(default)" if v.column == _DEFAULT_VALUE_NAME else "",
         )
-        for i, (name, table) in enumerate(data_file.tables.items())
+        for i, v in enumerate(data_file.info.values)
     ]
 
     click.echo(usage_line)
@@ -96,7 +114,7 @@ def main():
 
 @main.command(context_settings={"help_option_names": ["-h", "--help"]})
 @click.argument("table", required=True, type=click.Path(exists=False))
-@click.argument("args", type=float, nargs=-1)
+@click.argument("args", nargs=-1)
 @click.option("--name", default="xsec", help="name of a table")
 @click.option("-0", "simplest", is_flag=True, help="show in simplest format")
 @click.option("-1", "simple", is_flag=True, help="show in simple format")
@@ -109,56 +127,578 @@ def main():
     type=click.Path(exists=True, dir_okay=False),
     help="path of table-info file if non-standard file name",
 )
+@click.option(
+    "--server/--no-server",
+    default=True,
+    help="use the server of SERVE command if running",
+    show_default=True,
+)
+@click.option(
+    "--socket", type=click.Path(dir_okay=False), help="path of the server socket"
+)
+@click.option(
+    "--all",
+    "all_tables",
+    is_flag=True,
+    help="evaluate all the tables matching TABLE at NAME=VALUE arguments",
+)
+@click.option(
+    "--points",
+    type=click.File("r"),
+    help="file of parameter assignments for --all (CSV/TSV with header or JSONL)",
+)
+@click.option(
+    "--jobs", type=click.IntRange(min=1), help="number of threads for --all"
+)
+@click.option(
+    "--auto",
+    is_flag=True,
+    help="select the table of process TABLE covering NAME=VALUE arguments",
+)
+@click.option("--ecm", help="collision energy for --auto, e.g., 13TeV")
 @click.pass_context
 def get(context, **kw):
     # type: (Any, Any)->None
-    """Get cross-section value using interpolation."""
+    """Get cross-section value using interpolation.
+
+    With --all option, TABLE is a comma-separated list of table names or glob
+    patterns, e.g., "13TeV.*", and ARGS are parameter assignments such as
+    "ms=1200 mgl=1000"; all the matching tables that have the parameters are
+    evaluated, and one line is displayed for each table (and for each point
+    if --points is specified).
+
+    With --auto option, TABLE is a process, e.g., "p p > go go", and ARGS are
+    parameter assignments; the table of the process at the energy --ecm whose
+    grid covers the parameters is selected from the tables of this package.
+    """
+    _configure_logger()
+    if kw["all_tables"]:
+        if kw["auto"]:
+            raise click.UsageError("--auto cannot be used with --all.")
+        _get_all(**kw)
+        exit(0)
+    value_name = kw["name"] or _DEFAULT_VALUE_NAME
+    if kw["auto"]:
+        table_path, info_path, args = _select_table(value_name, **kw)
+    else:
+        table_path, info_path, args = _table_and_args(**kw)
+
+    # the running server answers if available; otherwise evaluate here.
+    if kw["server"] and args:
+        result = _request_server(table_path, info_path, value_name, args, kw["socket"])
+        if result is not None:
+            click.echo(_format_value(*result, **kw))
+            exit(0)
+
+    data_file = _load_file(table_path, info_path, value_name)
+
+    # without arguments or with invalid number of arguments, show the table information.
+    if len(args) != len(data_file.info.parameters):
+        _display_usage_for_file(context, data_file, **kw)
+        exit(1)
+
+    # data evaluation
+    interpolation = _interpolation(data_file, value_name)
+    cent, u_p, u_m = interpolation.tuple_at(*args)
+    click.echo(_format_value(cent, u_p, u_m, data_file.tables[value_name].unit, **kw))
+    exit(0)
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.argument("table", required=True, type=click.Path(exists=False))
+@click.argument("input", type=click.File("r"), default="-")
+@click.argument("output", type=click.File("w"), default="-")
+@click.option("--name", default="xsec", help="name of a table")
+@click.option("-0", "simplest", is_flag=True, help="show in simplest format")
+@click.option("-1", "simple", is_flag=True, help="show in simple format")
+@click.option("-2", "relative", is_flag=True, help="show relative uncertainties")
+@click.option("--unit/--no-unit", help="display unit", default=True, show_default=True)
+@click.option(
+    "--info",
+    type=click.Path(exists=True, dir_okay=False),
+    help="path of table-info file if non-standard file name",
+)
+@click.option(
+    "--format",
+    "input_format",
+    type=click.Choice(["auto", "csv", "tsv", "jsonl"]),
+    default="auto",
+    help="format of INPUT",
+    show_default=True,
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=10000,
+    help="number of points evaluated at once",
+    show_default=True,
+)
+@click.option(
+    "--out-of-domain",
+    type=click.Choice(_OUT_OF_DOMAIN_POLICIES),
+    default="nan",
+    help="policy for points out of the grid",
+    show_default=True,
+)
+def batch(**kw):
+    # type: (Any)->None
+    """Get cross-section values for the points listed in INPUT.
+
+    INPUT (default: standard input) lists the parameters of one point in each
+    line in CSV, TSV, or JSON-lines format. CSV and TSV may have a header line
+    with parameter names, and each line of JSON-lines is a list of parameters
+    or an object keyed by parameter names. The values are written to OUTPUT
+    (default: standard output) line by line in the format of GET command;
+    points out of the grid give "nan".
+
+    The points are read and evaluated by chunks, so that the input can be
+    larger than the memory. The throughput is reported at the end.
+    """
     _configure_logger()
-    # handle arguments
-    args = kw["args"] or []
     value_name = kw["name"] or _DEFAULT_VALUE_NAME
     try:
         table_path, info_path = Util.get_paths(kw["table"], kw["info"])
-        data_file = File(table_path, info_path)
     except (FileNotFoundError, RuntimeError, ValueError, TypeError) as e:
         click.echo(repr(e))
         exit(1)
+    data_file = _load_file(table_path, info_path, value_name)
+    interpolation = _interpolation(data_file, value_name)
+    param_names = [p.column for p in data_file.info.parameters]
+    formatter = _value_formatter(data_file.tables[value_name].unit, **kw)
+
+    start = time.time()
+    n_points = 0
+    chunks = _read_points(
+        kw["input"], kw["input_format"], param_names, kw["chunk_size"]
+    )
+    while True:
+        try:
+            points, line_numbers = next(chunks)
+        except StopIteration:
+            break
+        except ValueError as e:
+            logger.critical("Invalid input: %s", e)
+            exit(1)
+        values = _evaluate_points(
+            interpolation, points, line_numbers, kw["out_of_domain"]
+        )
+        lines = map(formatter, *[v.tolist() for v in values])
+        kw["output"].write("\n".join(lines) + "\n")
+        n_points += len(points)
+    elapsed = time.time() - start
+    logger.info(
+        "%d points in %.3f s (%.0f points/s)",
+        n_points,
+        elapsed,
+        n_points / elapsed if elapsed > 0 else float("inf"),
+    )
+    exit(0)
+
+
+def _evaluate_points(interpolation, points, line_numbers, out_of_domain):
+    # type: (Interpolation, numpy.ndarray, List[int], str)->Any
+    """Return the values at the points, or exit if a point is out of the domain.
+
+    The domain error is reported with the line of the first offending point.
+    """
+    try:
+        return interpolation.tuple_batch(points, out_of_domain)
+    except ValueError:
+        if out_of_domain != "raise":
+            raise
+        for point, line_number in zip(points, line_numbers):
+            try:
+                interpolation.tuple_batch(point[None, :], out_of_domain)
+            except ValueError:
+                point_str = ", ".join(str(x) for x in point)
+                logger.critical(
+                    "Point out of the domain at line %d: %s", line_number, point_str
+                )
+                exit(1)
+        raise
+
+
+def _read_points(stream, input_format, param_names, chunk_size):
+    # type: (TextIO, str, List[str], int)->Iterator[Tuple[numpy.ndarray, List[int]]]
+    """Read points from the stream and yield them by chunks.
+
+    Each chunk is an array (chunk_size, d) of the points and the list of the
+    line numbers of the points in the stream.
+
+    Raises
+    ------
+    ValueError
+        If the input is not parsed; the message has the line number.
+    """
+    lines = ((n, line) for n, line in enumerate(stream, 1) if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return
+    if input_format == "auto":
+        input_format = _detect_format(first[1])
+    try:
+        columns = _header_columns(first[1], input_format, param_names)
+    except ValueError as e:
+        raise ValueError("line {}: {}".format(first[0], e))
+    if columns is None:
+        lines = itertools.chain([first], lines)  # the first line is data
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield _parse_chunk(chunk, input_format, param_names, columns)
+
+
+def _parse_chunk(chunk, input_format, param_names, columns):
+    # type: (List[Tuple[int, str]], str, List[str], Optional[List[int]])->Tuple[numpy.ndarray, List[int]]  # noqa: B950
+    """Parse numbered lines into an array of points and the line numbers."""
+    try:
+        points = _parse_points(
+            [line for _, line in chunk], input_format, param_names, columns
+        )
+    except ValueError:
+        # parse again line by line to find the invalid line.
+        for n, line in chunk:
+            try:
+                _parse_points([line], input_format, param_names, columns)
+            except ValueError as e:
+                raise ValueError("line {}: {}".format(n, e))
+        raise
+    return points, [n for n, _ in chunk]
+
+
+def _detect_format(line):
+    # type: (str)->str
+    """Return the format of input guessed from the first line."""
+    if line.lstrip().startswith(("{", "[")):
+        return "jsonl"
+    return "tsv" if "\t" in line else "csv"
+
+
+def _header_columns(line, input_format, param_names):
+    # type: (str, str, List[str])->Optional[List[int]]
+    """Return the column of each parameter if the line is a header of CSV/TSV."""
+    if input_format == "jsonl":
+        return None
+    fields = [f.strip().lower() for f in line.split(_DELIMITERS[input_format])]
+    try:
+        [float(f) for f in fields]
+        return None
+    except ValueError:
+        pass
+    for name in param_names:
+        if name.lower() not in fields:
+            raise ValueError("Parameter {} not in the header.".format(name))
+    return [fields.index(name.lower()) for name in param_names]
+
+
+def _parse_points(lines, input_format, param_names, columns):
+    # type: (List[str], str, List[str], Optional[List[int]])->numpy.ndarray
+    """Parse lines into an array of points.
+
+    Raises
+    ------
+    ValueError
+        If the lines are not parsed into points with the parameters.
+    """
+    import numpy  # noqa: F811
+
+    if input_format == "jsonl":
+        rows = [json.loads(line) for line in lines]
+        try:
+            rows = [
+                [r[p] for p in param_names] if isinstance(r, dict) else r for r in rows
+            ]
+        except KeyError as e:
+            raise ValueError("Parameter {} not found.".format(e))
+        points = numpy.array(rows, dtype=float)
+    else:
+        points = numpy.loadtxt(lines, delimiter=_DELIMITERS[input_format], ndmin=2)
+        if columns is not None:
+            if points.shape[1] <= max(columns):
+                raise ValueError("Parameters are missing.")
+            points = points[:, columns]
+    if points.ndim != 2 or points.shape[1] != len(param_names):
+        raise ValueError("{} parameters are expected.".format(len(param_names)))
+    return points
+
+
+def _table_and_args(**kw):
+    # type: (Any)->Tuple[pathlib.Path, pathlib.Path, List[float]]
+    """Return the paths to the specified table and the arguments."""
+    try:
+        args = [float(a) for a in kw["args"]]
+    except ValueError as e:
+        raise click.BadParameter(e.__str__(), param_hint="ARGS")  # py2
+    try:
+        table_path, info_path = Util.get_paths(kw["table"], kw["info"])
+    except (FileNotFoundError, RuntimeError, ValueError, TypeError) as e:
+        click.echo(repr(e))
+        exit(1)
+    return table_path, info_path, args
+
+
+def _select_table(value_name, **kw):
+    # type: (str, Any)->Tuple[pathlib.Path, pathlib.Path, List[float]]
+    """Return the paths to the table covering the point and the arguments."""
+    from susy_cross_section.coverage import CoverageIndex
+
+    if not kw["ecm"]:
+        raise click.BadParameter("required with --auto.", param_hint="--ecm")
+    try:
+        point = _parse_assignment(kw["args"])
+    except ValueError as e:
+        raise click.BadParameter(e.__str__(), param_hint="ARGS")  # py2
+    index = CoverageIndex.from_catalog()
+    if not index.tables(kw["table"], kw["ecm"], value_name=value_name):
+        logger.critical("No tables of %s at %s.", kw["table"], kw["ecm"])
+        exit(1)
+    entry = index.select(kw["table"], kw["ecm"], point, value_name)[0]
+    if entry is None:
+        logger.critical("No tables of %s cover the parameters.", kw["table"])
+        exit(1)
+    logger.info("Table %s is selected.", entry.key or entry.table_path)
+    table_path, info_path = entry.paths()
+    return table_path, info_path, [point[p["name"]] for p in entry.parameters]
+
+
+def _get_all(**kw):
+    # type: (Any)->None
+    """Evaluate all the matching tables and display one line for each."""
+    import susy_cross_section.evaluation as evaluation
+
+    try:
+        assignments = _read_assignments(kw["points"]) if kw["points"] else []
+        if kw["args"] or not assignments:
+            assignments.append(_parse_assignment(kw["args"]))
+        rows = evaluation.evaluate(
+            assignments,
+            kw["table"].split(","),
+            value_name=kw["name"] or _DEFAULT_VALUE_NAME,
+            info_path=kw["info"],
+            max_workers=kw["jobs"],
+        )
+    except (FileNotFoundError, RuntimeError, ValueError, TypeError, KeyError) as e:
+        click.echo(repr(e))
+        exit(1)
+    if not rows:
+        logger.warning("No tables have the specified parameters.")
+    formatters = {}  # type: MutableMapping[str, Callable[[float, float, float], str]]
+    for row in rows:
+        if row.unit not in formatters:
+            formatters[row.unit] = _value_formatter(row.unit, **kw)
+        fields = [row.table, formatters[row.unit](row.value, row.unc_p, row.unc_m)]
+        if kw["points"]:
+            fields.insert(0, row.point.__str__())  # py2
+        click.echo("\t".join(fields))
+
+
+def _parse_assignment(args):
+    # type: (Sequence[str])->Mapping[str, float]
+    """Parse arguments such as "ms=1200" into a parameter assignment."""
+    assignment = {}
+    for arg in args:
+        name, sep, value = arg.partition("=")
+        if not sep:
+            raise ValueError("Argument must be NAME=VALUE: {}".format(arg))
+        assignment[name.strip()] = float(value)
+    if not assignment:
+        raise ValueError("No parameters are specified.")
+    return assignment
+
+
+def _read_assignments(stream):
+    # type: (TextIO)->List[Mapping[str, float]]
+    """Read parameter assignments from CSV or TSV with header, or JSON-lines."""
+    import numpy  # noqa: F811
+
+    lines = [line for line in stream if line.strip()]
+    if not lines:
+        return []
+    input_format = _detect_format(lines[0])
+    if input_format == "jsonl":
+        return [{k: float(v) for k, v in json.loads(x).items()} for x in lines]
+    delimiter = _DELIMITERS[input_format]
+    names = [name.strip() for name in lines[0].split(delimiter)]
+    values = numpy.loadtxt(lines[1:], delimiter=delimiter, ndmin=2)
+    if values.shape[1] != len(names):
+        raise ValueError("Number of columns differs from the header.")
+    return [dict(zip(names, row)) for row in values.tolist()]
+
+
+def _load_file(table_path, info_path, value_name):
+    # type: (pathlib.Path, pathlib.Path, str)->File
+    """Return the file with the value, or exit with the error message."""
+    from susy_cross_section.table import File  # noqa: F811
 
     try:
-        table = data_file.tables[value_name]
+        # only the columns for the specified value are read.
+        data_file = File(table_path, info_path, values=[value_name])
+        data_file.tables[value_name]
     except KeyError as e:
         logger.critical("Data file does not contain specified table.")
         click.echo(repr(e))
         exit(1)
-
-    # without arguments or with invalid number of arguments, show the table information.
-    if len(args) != len(data_file.info.parameters):
-        _display_usage_for_file(context, data_file, **kw)
+    except (FileNotFoundError, RuntimeError, ValueError, TypeError) as e:
+        click.echo(repr(e))
         exit(1)
+    return data_file
 
-    # data evaluation
-    if len(args) == 1:
-        interp = Scipy1dInterpolator(
-            axes="loglog", kind="spline"
-        )  # type: AbstractInterpolator
-    else:
-        wrapper = AxesWrapper(["log" for _ in args], "log")
-        kind = "spline33" if len(args) == 2 else "linear"
-        interp = ScipyGridInterpolator(axes_wrapper=wrapper, kind=kind)
-    cent, u_p, u_m = interp.interpolate(table).tuple_at(*kw["args"])
-
-    # display
-    if kw["simplest"]:
-        click.echo(cent)
-    elif kw["simple"]:
-        click.echo("{} +{} -{}".format(cent, u_p, abs(u_m)))
-    else:
-        relative = bool(kw.get("relative", False))
-        unit = table.unit if kw["unit"] else None
-        click.echo(Util.value_format(cent, u_p, u_m, unit, relative))
+
+def _interpolation(data_file, value_name):
+    # type: (File, str)->Interpolation
+    """Return the interpolation of the value, using the compiled one if any."""
+    import susy_cross_section.interp.artifact as artifact
+    from susy_cross_section.interp.interpolator import default_interpolator
+
+    interp = default_interpolator(len(data_file.info.parameters))
+    interpolation = artifact.load_compiled(
+        data_file.table_path, data_file.info_path, value_name, interp
+    )
+    if interpolation is None:
+        interpolation = interp.interpolate(data_file.tables[value_name])
+    return interpolation
+
+
+def _request_server(
+    table_path,  # type: pathlib.Path
+    info_path,  # type: pathlib.Path
+    value_name,  # type: str
+    args,  # type: Any
+    socket_path=None,  # type: Optional[str]
+):
+    # type: (...)->Optional[Tuple[float, float, float, str]]
+    """Return the value and the unit from the server, or None if unavailable.
+
+    Failed requests also give None, so that errors are handled locally.
+    """
+    import susy_cross_section.server as server
+
+    message = {
+        "op": "get",
+        "table_path": table_path.absolute().__str__(),  # py2
+        "info_path": info_path.absolute().__str__(),  # py2
+        "name": value_name,
+        "args": list(args),
+    }
+    try:
+        response = server.request(message, socket_path)
+    except (OSError, ValueError):
+        return None  # server is not running
+    if not response.get("ok"):
+        logger.debug("Server failed: %s", response.get("error"))
+        return None
+    cent, u_p, u_m = response["value"]
+    return cent, u_p, u_m, response["unit"]
+
+
+def _format_value(cent, u_p, u_m, value_unit, **kw):
+    # type: (float, float, float, str, Any)->str
+    """Return the value in the format specified by the options."""
+    return _value_formatter(value_unit, **kw)(cent, u_p, u_m)
+
+
+def _value_formatter(value_unit, **kw):
+    # type: (str, Any)->Callable[[float, float, float], str]
+    """Return the function to format values as specified by the options."""
+    unit = value_unit if kw["unit"] else None
+    relative = bool(kw.get("relative", False))
+
+    def formatter(cent, u_p, u_m):
+        # type: (float, float, float)->str
+        if kw["simplest"]:
+            return "{}".format(cent)
+        elif kw["simple"]:
+            return "{} +{} -{}".format(cent, u_p, abs(u_m))
+        elif cent != cent:
+            return "nan"  # out of the grid
+        return Util.value_format(cent, u_p, u_m, unit, relative)
+
+    return formatter
+
+
+@main.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option(
+    "--socket", type=click.Path(dir_okay=False), help="path of the server socket"
+)
+@click.option("--stop", is_flag=True, help="stop the running server")
+def serve(**kw):
+    # type: (Any)->None
+    """Serve GET commands, keeping tables and interpolations in memory.
+
+    The server runs in the foreground until stopped by --stop option or by
+    interruption. While it is running, GET command sends its request to the
+    server, which skips the file loading and fitting done in each GET call.
+    Modified files are automatically reloaded.
+    """
+    import susy_cross_section.server as server
+
+    _configure_logger()
+    if kw["stop"]:
+        try:
+            server.request({"op": "stop"}, kw["socket"])
+        except (OSError, ValueError) as e:
+            click.echo("Server is not running: {}".format(repr(e)))
+            exit(1)
+        exit(0)
+
+    try:
+        daemon = server.Server(kw["socket"])
+    except (RuntimeError, OSError) as e:
+        click.echo(repr(e))
+        exit(1)
+    logger.info("Serving on %s", daemon.path.__str__())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
     exit(0)
 
 
+@main.command(name="compile", context_settings={"help_option_names": ["-h", "--help"]})
+@click.argument("tables", nargs=-1)
+def cmd_compile(**kw):
+    # type: (Any)->None
+    """Compile interpolations of TABLES, or of all the predefined tables.
+
+    Each value of the tables is interpolated as in GET command and stored in
+    the cache directory, from which GET loads the interpolation without
+    fitting. Compiled interpolations of modified tables are ignored by GET;
+    run this command again to recompile them.
+    """
+    import susy_cross_section.interp.artifact as artifact
+    import susy_cross_section.storage as storage
+    from susy_cross_section.interp.interpolator import default_interpolator
+    from susy_cross_section.table import File  # noqa: F811
+
+    _configure_logger()
+    keys = kw["tables"] or list(config.table_names.keys())
+    failed = False
+    for key in keys:
+        try:
+            table_path, info_path = Util.get_paths(key)
+            data_file = File(table_path, info_path)
+        except (FileNotFoundError, RuntimeError, ValueError, TypeError) as e:
+            logger.error("%s: %s", key, repr(e))
+            failed = True
+            continue
+        source_hash = storage.content_hash(table_path, info_path)
+        interp = default_interpolator(len(data_file.info.parameters))
+        for value_name in data_file.tables:
+            path = artifact.default_path(source_hash, value_name, interp)
+            try:
+                interpolation = interp.interpolate(data_file.tables[value_name])
+            except ValueError as e:
+                # GET cannot interpolate the table either.
+                logger.warning("%s (%s) skipped: %s", key, value_name, repr(e))
+                continue
+            artifact.dump(interpolation, path, source_hash, repr(interp))
+            click.echo("{}\t{}\t{}".format(key, value_name, path))
+    exit(1 if failed else 0)
+
+
 @main.command(context_settings={"help_option_names": ["-h", "--help"]})
 @click.argument("table", required=True, type=click.Path(exists=False))
 # @click.option('--config', type=click.Path(exists=True, dir_okay=False),
@@ -171,6 +711,8 @@ def get(context, **kw):
 def show(**kw):
     # type: (Any)->None
     """Show the cross-section table with combined uncertainties."""
+    from susy_cross_section.table import File  # noqa: F811
+
     _configure_logger()
     # handle arguments
     try:
@@ -193,56 +735,66 @@ def show(**kw):
 @click.argument("substr", nargs=-1)
 @click.option("--all", "-a", is_flag=True, help="List all the tables in this package.")
 @click.option("--full", "-f", is_flag=True, help="List full paths")
+@click.option("--process", help="Show tables of processes containing this.")
+@click.option("--collider", help="Show tables of this collider, e.g., pp.")
+@click.option("--ecm", help="Show tables of this energy, e.g., 13TeV.")
+@click.option("--order", help="Show tables of this order, e.g., NLO+NLL.")
+@click.option("--pdf", help="Show tables with PDF names containing this.")
+@click.option(
+    "--param", multiple=True, metavar="NAME", help="Show tables with this parameter."
+)
+@click.option(
+    "--at",
+    multiple=True,
+    metavar="NAME=VALUE",
+    help="Show tables covering this parameter value.",
+)
+@click.option("--rebuild", is_flag=True, help="Rebuild the catalog of the tables.")
 def cmd_list(**kw):
     # type: (Any)->None
-    """List the predefined tables, containing SUBSTR if specified."""
+    """List the predefined tables, containing SUBSTR if specified.
+
+    The tables are searched in the catalog of this package, which is rebuilt
+    by --rebuild after the data files are modified.
+    """
+    import colorama
+
+    from susy_cross_section import catalog
+
     colorama.init()
     _configure_logger()
 
+    try:
+        point = _parse_assignment(kw["at"]) if kw["at"] else None
+    except ValueError as e:
+        raise click.BadParameter(e.__str__(), param_hint="--at")  # py2
+    index = catalog.rebuild() if kw["rebuild"] else catalog.load()
+    entries = index.search(
+        predefined=not kw["all"],
+        substr=kw["substr"],
+        process=kw["process"],
+        collider=kw["collider"],
+        ecm=kw["ecm"],
+        order=kw["order"],
+        pdf_name=kw["pdf"],
+        parameters=kw["param"],
+        point=point,
+    )
+
     table_dir_abs = config.package_dir / config.table_dir  # absolute path
-    substr_list = [s.lower() for s in kw["substr"]]  # case insensitive
-
-    def to_show(key, grid, info):
-        # type: (Optional[str], str, Optional[str])->bool
-        """Check if all the substr are in (any of) the arguments."""
-        return all(
-            any(v is not None and substr in v.lower() for v in [key, grid, info])
-            for substr in substr_list
-        )
 
     def str_to_pathstr(s):
         # type: (str)->str
         return (table_dir_abs / s).absolute().__str__() if kw["full"] else s
 
-    # predefined paths
-    lines = []  # type: List[Tuple[Optional[str], str, Optional[str]]]
-    checked = {}  # type: MutableMapping[str, bool]
-    for key, value in config.table_names.items():
-        grid, info = config.parse_table_value(value)
-        checked[grid.__str__()] = True
-        if to_show(key, grid, info):
-            lines.append((key, grid, info))
-
-    # list all the grid even without predefined keys
-    if kw["all"]:
-        for f in sorted(table_dir_abs.glob("**/*")):
-            rel_path = f.relative_to(table_dir_abs).__str__()
-            if all(
-                [
-                    not rel_path.endswith(".info"),
-                    to_show(None, rel_path, None),
-                    not checked.get(rel_path),
-                    f.is_file(),
-                    f.with_suffix(".info").is_file(),
-                ]
-            ):
-                lines.append((None, rel_path, None))
-
-    for k, grid, info in sorted(lines, key=lambda x: x[1]):
+    for entry in sorted(entries, key=lambda e: e.table_path):
+        # info paths are shown only if non-standard
+        sibling = pathlib.PurePosixPath(entry.table_path).with_suffix(".info")
+        info = None if sibling.as_posix() == entry.info_path else entry.info_path
         click.echo(
             "{key}\t{dim}{grid}{info}{reset}".format(
-                key=k or "",
-                grid=str_to_pathstr(grid),
+                key=entry.key or "",
+                grid=str_to_pathstr(entry.table_path),
                 info=" " + str_to_pathstr(info) if info else "",
                 dim=colorama.Style.DIM,
                 reset=colorama.Style.RESET_ALL,
@@ -0,0 +1,309 @@
+"""Server process keeping tables and interpolations in memory.
+
+Each call of ``susy-xs get`` starts a Python process, reads the files, and
+fits an interpolation to return one value. The server started by ``susy-xs
+serve`` instead keeps the loaded files and the fitted interpolations, and
+answers requests over a Unix-domain socket; ``susy-xs get`` sends its request
+to the server if it is running.
+
+The files are checked on every request, and the kept objects are discarded
+if the grid-data or info file is modified.
+
+Requests and responses are JSON objects, each of which is sent as one line:
+
+====================================================== ========================
+request                                                response
+====================================================== ========================
+``{"op": "get", "table_path": str, "info_path": str,`` ``{"ok": true, "value":``
+``"name": str, "args": [float, ...]}``                 ``[float, float, float],``
+                                                       ``"unit": str}``
+``{"op": "ping"}``                                     ``{"ok": true}``
+``{"op": "stop"}``                                     ``{"ok": true}``
+====================================================== ========================
+
+where the values are the central value and the positive and negative
+uncertainties. Failed requests are answered by ``{"ok": false, "error":
+str}``.
+
+============== ========================================================
+`Server`       the server of the requests
+`socket_path`  return the default path of the socket
+`request`      send a request to the running server
+============== ========================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import json
+import logging
+import os
+import pathlib
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from typing import Any, Mapping, MutableMapping, Optional, Tuple, Union  # noqa: F401
+
+import susy_cross_section.config as config
+
+if sys.version_info[0] < 3:  # py2
+    import SocketServer as socketserver
+
+    str = basestring  # noqa: A001, F821
+else:
+    import socketserver
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+PathPair = Tuple[pathlib.Path, pathlib.Path]
+Signature = Tuple[Tuple[int, int], Tuple[int, int]]
+
+CLIENT_TIMEOUT = 30.0
+"""Timeout in seconds of a request sent by `request`."""
+
+
+def socket_path():
+    # type: ()->pathlib.Path
+    """Return the default path of the socket.
+
+    :data:`config.server_socket` is used if set; otherwise the socket is
+    placed in ``$XDG_RUNTIME_DIR`` or in the temporary directory. As the
+    latter is shared with other users, the clients use only sockets owned by
+    the current user; see `request`.
+    """
+    if config.server_socket:
+        return pathlib.Path(config.server_socket)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return pathlib.Path(runtime_dir) / "susy_cross_section.sock"
+    uid = getattr(os, "getuid", lambda: 0)()
+    name = "susy_cross_section-{}.sock".format(uid)
+    return pathlib.Path(tempfile.gettempdir()) / name
+
+
+def request(message, path=None, timeout=CLIENT_TIMEOUT):
+    # type: (Mapping[str, Any], Optional[PathLike], float)->Mapping[str, Any]
+    """Send a request to the running server and return the response.
+
+    Arguments
+    ---------
+    message: dict(str, Any)
+        The request; see the module document.
+    path: str or pathlib.Path, optional
+        Path to the socket; `socket_path` is used if unspecified.
+    timeout: float
+        Timeout in seconds.
+
+    Returns
+    -------
+    dict(str, Any)
+        The response.
+
+    Raises
+    ------
+    OSError
+        If the server is not running or does not respond, or if the socket is
+        not owned by the current user.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix-domain socket is not supported.")
+    path = pathlib.Path(path or socket_path())
+    _check_owner(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        stream = sock.makefile("rwb")
+        try:
+            stream.write(json.dumps(message).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+        finally:
+            stream.close()
+    except socket.error as e:
+        if isinstance(e, OSError):
+            raise
+        raise OSError(repr(e))  # py2, where socket.error is an IOError
+    finally:
+        sock.close()
+    if not line:
+        raise OSError("No response from the server.")
+    return json.loads(line.decode("utf-8"))  # type: ignore
+
+
+def _check_owner(path):
+    # type: (pathlib.Path)->None
+    """Raise OSError unless the path is a socket owned by the current user.
+
+    Otherwise another user could answer the requests by creating the socket
+    in a shared directory before the server starts.
+    """
+    st = os.lstat(str(path))
+    if not stat.S_ISSOCK(st.st_mode):
+        raise OSError("Not a socket: %s", path)
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise OSError("Socket is not owned by the current user: %s", path)
+
+
+def _signature(table_path, info_path):
+    # type: (pathlib.Path, pathlib.Path)->Signature
+    """Return the modification time and size of the files."""
+    stats = [os.stat(str(p)) for p in (table_path, info_path)]
+    # st_mtime_ns is not available in py2
+    return (
+        (getattr(stats[0], "st_mtime_ns", stats[0].st_mtime), stats[0].st_size),
+        (getattr(stats[1], "st_mtime_ns", stats[1].st_mtime), stats[1].st_size),
+    )
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handler of a connection, which may send several requests."""
+
+    def handle(self):
+        # type: ()->None
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line.decode("utf-8"))
+            except ValueError as e:
+                message = {}
+                response = {"ok": False, "error": repr(e)}  # type: Mapping[str, Any]
+            else:
+                response = self.server.respond(message)  # type: ignore
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if message.get("op") == "stop":
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Server of the requests over a Unix-domain socket.
+
+    The loaded files are kept in a `Registry` and the interpolations by the
+    `default_interpolator` are kept in a dictionary; compiled interpolations
+    (see `interp.artifact`) are used if available.
+
+    Arguments
+    ---------
+    path: str or pathlib.Path, optional
+        Path to the socket; `socket_path` is used if unspecified.
+
+    Raises
+    ------
+    RuntimeError
+        If another server is running on the socket, or if the socket is owned
+        by another user.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path=None):
+        # type: (Optional[PathLike])->None
+        from susy_cross_section.registry import Registry
+
+        self.path = pathlib.Path(path or socket_path())
+        self.registry = Registry()
+        self._interpolations = {}  # type: MutableMapping[Tuple[Any, ...], Any]
+        self._signatures = {}  # type: MutableMapping[PathPair, Signature]
+        self._resolved = {}  # type: MutableMapping[Tuple[str, str], PathPair]
+        self._lock = threading.RLock()
+        if os.path.lexists(str(self.path)):
+            try:
+                _check_owner(self.path)
+            except OSError as e:
+                raise RuntimeError("Socket cannot be used: %s", repr(e))
+            try:
+                request({"op": "ping"}, self.path, timeout=1)
+            except (OSError, ValueError):
+                os.remove(str(self.path))  # left by a dead server
+            else:
+                raise RuntimeError("Server is already running: %s", self.path)
+        # the socket is created without permission for others.
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.__init__(self, str(self.path), _Handler)
+        finally:
+            os.umask(umask)
+        os.chmod(str(self.path), 0o600)
+
+    def server_close(self):
+        # type: ()->None
+        """Close the server and remove the socket."""
+        socketserver.UnixStreamServer.server_close(self)
+        if self.path.exists():
+            os.remove(str(self.path))
+
+    def respond(self, message):
+        # type: (Mapping[str, Any])->Mapping[str, Any]
+        """Return the response to a request."""
+        op = message.get("op")
+        if op in ["ping", "stop"]:
+            return {"ok": True}
+        elif op != "get":
+            return {"ok": False, "error": "Unknown operation: {}".format(op)}
+        try:
+            value, unit = self.evaluate(
+                message["table_path"],
+                message["info_path"],
+                message["name"],
+                message["args"],
+            )
+        except Exception as e:  # any errors are sent to the client
+            logger.debug("Request failed: %s", message, exc_info=True)
+            return {"ok": False, "error": repr(e)}
+        return {"ok": True, "value": value, "unit": unit}
+
+    def evaluate(self, table_path, info_path, name, args):
+        # type: (PathLike, PathLike, str, Any)->Tuple[Tuple[float, float, float], str]
+        """Return the interpolated value and the unit.
+
+        Returns
+        -------
+        tuple(tuple(float, float, float), str)
+            The central value, the positive and negative uncertainties, and the
+            unit of the value.
+        """
+        interpolation, unit, n_params = self._interpolation(
+            table_path.__str__(), info_path.__str__(), name  # py2
+        )
+        if len(args) != n_params:
+            raise TypeError("Invalid number of arguments: %s", args)
+        cent, u_p, u_m = interpolation.tuple_at(*[float(x) for x in args])
+        return (float(cent), float(u_p), float(u_m)), unit
+
+    def _interpolation(self, table_path, info_path, name):
+        # type: (str, str, str)->Any
+        """Return the interpolation with the unit and the number of parameters."""
+        from susy_cross_section.interp import artifact
+        from susy_cross_section.interp.interpolator import default_interpolator
+
+        paths = self._resolved.get((table_path, info_path))
+        if paths is None:
+            paths = tuple(pathlib.Path(p).resolve() for p in (table_path, info_path))
+            self._resolved[table_path, info_path] = paths
+        signature = _signature(*paths)
+        with self._lock:
+            if self._signatures.get(paths) != signature:
+                # new or modified files
+                if paths in self._signatures:
+                    logger.info("Reload modified file %s", paths[0].__str__())
+                self.registry.invalidate(*paths)
+                for key in [k for k in self._interpolations if k[:2] == paths]:
+                    del self._interpolations[key]
+                self._signatures[paths] = signature
+            key = paths + (name,)
+            if key not in self._interpolations:
+                data_file = self.registry.load(*paths)
+                table = data_file.tables[name]
+                n_params = len(data_file.info.parameters)
+                interp = default_interpolator(n_params)
+                interpolation = artifact.load_compiled(
+                    paths[0], paths[1], name, interp
+                ) or interp.interpolate(table)
+                self._interpolations[key] = (interpolation, table.unit, n_params)
+            return self._interpolations[key]
@@ -0,0 +1,228 @@
+"""Binary storage of numerical arrays with metadata.
+
+This module provides a compact binary container used for caches of parsed
+tables and other derived data. A container consists of a JSON header and raw
+array data, each of which is aligned so that the arrays can be mapped into
+memory without copy.
+
+============== ========================================================
+`dump`         write a container atomically
+`load`         read a container by a single read or by memory-mapping
+`content_hash` compute a hash of file contents for cache keys
+`cache_dir`    return the cache directory of this package
+`shared_dir`   return the directory for blocks shared among processes
+`shared_path`  return a new path for a block in `shared_dir`
+============== ========================================================
+"""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+from typing import Any, List, Mapping, MutableMapping, Tuple, Union  # noqa: F401
+
+import numpy
+
+import susy_cross_section.config as config
+
+if sys.version_info[0] < 3:  # py2
+    str = basestring  # noqa: A001, F821
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+
+MAGIC = b"SUSYXSB"
+"""Magic bytes at the beginning of a container."""
+VERSION = 1
+"""Version of the container format."""
+_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<7sBQ")  # magic, version, header length
+
+
+_replace = getattr(os, "replace", os.rename)  # py2
+
+
+def _makedirs(path):
+    # type: (pathlib.Path)->None
+    """Create a directory with its parents unless it exists."""
+    try:
+        os.makedirs(str(path))
+    except OSError:
+        if not path.is_dir():
+            raise
+
+
+def _aligned(n):
+    # type: (int)->int
+    return (n + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def dump(path, meta, arrays):
+    # type: (PathLike, Mapping[str, Any], Mapping[str, numpy.ndarray])->None
+    """Write metadata and arrays into a container file.
+
+    The file is first written to a temporary file in the same directory and
+    then renamed, so that concurrent readers and writers never see a partially
+    written container.
+
+    Parameters
+    ----------
+    path: str or pathlib.Path
+        Path to the container file.
+    meta: dict(str, Any)
+        JSON-serializable metadata.
+    arrays: dict(str, numpy.ndarray)
+        Numerical arrays to store; object arrays are not allowed.
+    """
+    path = pathlib.Path(path)
+    specs = []  # type: List[MutableMapping[str, Any]]
+    offset = 0
+    contiguous = {}  # type: MutableMapping[str, numpy.ndarray]
+    for name, array in arrays.items():
+        array = numpy.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError("Object array cannot be stored: %s", name)
+        contiguous[name] = array
+        specs.append(
+            {
+                "name": name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+        )
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"meta": meta, "arrays": specs}).encode("utf-8")
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    _makedirs(path.parent)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            for spec in specs:
+                f.seek(data_start + spec["offset"])
+                f.write(contiguous[spec["name"]].tobytes())
+            f.truncate(data_start + offset)
+        _replace(tmp_name, str(path))
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def load(path, mmap=False):
+    # type: (PathLike, bool)->Tuple[Mapping[str, Any], Mapping[str, numpy.ndarray]]
+    """Read metadata and arrays from a container file.
+
+    Parameters
+    ----------
+    path: str or pathlib.Path
+        Path to the container file.
+    mmap: bool
+        If True, the arrays are read-only memory-mapped views of the file, which
+        are shared among processes mapping the same file. Otherwise the whole
+        file is read by a single read into a writable buffer.
+
+    Returns
+    -------
+    tuple(dict(str, Any), dict(str, numpy.ndarray))
+        The metadata and the arrays.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid container.
+    """
+    path = pathlib.Path(path)
+    if mmap:
+        buffer = numpy.memmap(str(path), dtype=numpy.uint8, mode="r")
+    else:
+        size = path.stat().st_size
+        buffer = numpy.empty(size, dtype=numpy.uint8)
+        with open(str(path), "rb") as f:
+            if f.readinto(memoryview(buffer)) != size:
+                raise ValueError("Container truncated: %s", path)
+
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError("Invalid container: %s", path)
+    magic, version, header_length = _PREAMBLE.unpack(
+        buffer[: _PREAMBLE.size].tobytes()
+    )
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Invalid container or version: %s", path)
+    header_bytes = buffer[_PREAMBLE.size:][:header_length].tobytes()
+    header = json.loads(header_bytes.decode("utf-8"))
+    data_start = _aligned(_PREAMBLE.size + header_length)
+
+    arrays = {}  # type: MutableMapping[str, numpy.ndarray]
+    for spec in header["arrays"]:
+        dtype = numpy.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        start = data_start + spec["offset"]
+        end = start + dtype.itemsize * int(numpy.prod(shape, dtype=numpy.int64))
+        if end > len(buffer):
+            raise ValueError("Container truncated: %s", path)
+        arrays[spec["name"]] = buffer[start:end].view(dtype).reshape(shape)
+    return header["meta"], arrays
+
+
+def content_hash(*paths):
+    # type: (PathLike)->str
+    """Return a hex digest identifying the contents of the files.
+
+    The digest depends on the file contents and their order, but not on the
+    file names or time stamps.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(str(path), "rb") as f:
+            content = f.read()
+        digest.update(struct.pack("<Q", len(content)))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def cache_dir():
+    # type: ()->pathlib.Path
+    """Return the cache directory of this package.
+
+    :data:`config.cache_dir` is used if set; otherwise the directory is
+    ``susy_cross_section`` in ``$XDG_CACHE_HOME`` or ``~/.cache``.
+    """
+    if config.cache_dir:
+        return pathlib.Path(config.cache_dir)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return pathlib.Path(os.path.expanduser(base)) / "susy_cross_section"
+
+
+def shared_dir():
+    # type: ()->pathlib.Path
+    """Return the directory for data blocks shared among processes.
+
+    ``/dev/shm`` is used if available, so that the blocks reside in memory;
+    otherwise the temporary directory of the system is used.
+    """
+    shm = pathlib.Path("/dev/shm")
+    if shm.is_dir() and os.access(str(shm), os.W_OK):
+        return shm
+    return pathlib.Path(tempfile.gettempdir())
+
+
+def shared_path(prefix=""):
+    # type: (str)->pathlib.Path
+    """Return the path to a new empty file in `shared_dir`."""
+    fd, name = tempfile.mkstemp(
+        dir=str(shared_dir()), prefix="susy_xs-" + prefix, suffix=".bin"
+    )
+    os.close(fd)
+    return pathlib.Path(name)
@@ -200,15 +200,29 @@ class File(BaseFile[Table]):
         The cross-section table parsed according to the annotation.
     """
 
-    def __init__(self, table_path, info_path=None):
-        # type: (Union[PathLike, BaseFile[BaseTable], File], Optional[PathLike])->None
+    def __init__(
+        self,
+        table_path,  # type: Union[PathLike, BaseFile[BaseTable], File]
+        info_path=None,  # type: Optional[PathLike]
+        use_cache=None,  # type: Optional[bool]
+        lazy=True,  # type: bool
+        values=None,  # type: Optional[Sequence[str]]
+    ):
+        # type: (...)->None
         if isinstance(table_path, File):
             assert info_path is None
             super(File, self).__init__(table_path)
-        else:
-            base = BaseFile(table_path, info_path)
+        elif isinstance(table_path, BaseFile):
+            assert info_path is None
+            base = cast(BaseFile[Table], table_path)
+            super(File, self).__init__(base)
             # note that BaseTable knows BaseFile, not File.
             # so here we tell them file=self.
-            base.tables = {k: Table(v, file=self) for k, v in base.tables.items()}
-            base = cast(BaseFile[Table], base)
-            super(File, self).__init__(base)
+            self.tables = {k: Table(v, file=self) for k, v in base.tables.items()}
+        else:
+            super(File, self).__init__(table_path, info_path, use_cache, lazy, values)
+
+    def _new_table(self, df, name):
+        # type: (pandas.DataFrame, str)->Table
+        """Return a `Table` object for the data-frame."""
+        return Table(df, file=self, name=name)
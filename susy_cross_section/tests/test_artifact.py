@@ -0,0 +1,126 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import logging
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+import numpy
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+import susy_cross_section.config as config
+import susy_cross_section.interp.artifact as artifact
+from susy_cross_section.interp import Scipy1dInterpolator, ScipyGridInterpolator
+from susy_cross_section.interp.axes_wrapper import AxesWrapper
+from susy_cross_section.table import File
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class TestArtifact(unittest.TestCase):
+    """Test codes for compiled interpolations."""
+
+    def setUp(self):
+        """Set up."""
+        cwd = pathlib.Path(__file__).parent
+        lhc_wg = cwd / ".." / "data" / "lhc_susy_xs_wg"
+        self.table1_path = lhc_wg / "13TeVn2x1wino_cteq_pm.csv"
+        self.table2_path = cwd / "data" / "sg_8TeV_NLONLL_modified.xsec"
+        self.tmp_dir = pathlib.Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Tear down."""
+        shutil.rmtree(self.tmp_dir.__str__())  # py2
+
+    def test_roundtrip(self):
+        """Verify compiled interpolations are identical to the original."""
+        table1 = File(self.table1_path)["xsec"]
+        table2 = File(self.table2_path)["xsec"]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        interpolators = [
+            (Scipy1dInterpolator(kind, "loglog"), table1)
+            for kind in ["linear", "spline", "pchip", "akima", "quadratic", "cubic"]
+        ] + [
+            (ScipyGridInterpolator(kind, axes_wrapper), table2)
+            for kind in ["linear", "spline", "spline22"]
+            for axes_wrapper in [wrapper, None]
+        ]
+        unstacked = ScipyGridInterpolator("spline", wrapper)
+        unstacked._stackable = False
+        interpolators.append((unstacked, table2))
+        path = self.tmp_dir / "artifact.bin"
+        for interpolator, table in interpolators:
+            fit = interpolator.interpolate(table)
+            artifact.dump(fit, path, "hash", repr(interpolator))
+            for mmap in [True, False]:
+                loaded = artifact.load(path, "hash", repr(interpolator), mmap=mmap)
+                eq_(loaded.param_index, fit.param_index)
+                eq_(loaded.domain, fit.domain)
+                lower, upper = numpy.array(fit.domain).T
+                xs = numpy.random.RandomState(0).uniform(lower, upper, (20, len(lower)))
+                for x in xs[:3]:
+                    eq_(loaded.tuple_at(x), fit.tuple_at(x))
+                for a, b in zip(loaded.tuple_batch(xs), fit.tuple_batch(xs)):
+                    ok_(numpy.array_equal(a, b))
+            # loaded interpolations can be compiled again
+            artifact.dump(loaded, self.tmp_dir / "again.bin")
+            again = artifact.load(self.tmp_dir / "again.bin")
+            for a, b in zip(again.tuple_batch(xs), fit.tuple_batch(xs)):
+                ok_(numpy.array_equal(a, b))
+
+            # stale or invalid artifacts are rejected
+            with assert_raises(ValueError):
+                artifact.load(path, source_hash="other")
+            with assert_raises(ValueError):
+                artifact.load(path, label="other")
+
+    def test_lookup_table(self):
+        """Verify lookup tables are compiled and shared by memory-mapping."""
+        table2 = File(self.table2_path)["xsec"]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        fit = ScipyGridInterpolator("spline", wrapper).interpolate(table2).tabulate()
+        path = self.tmp_dir / "artifact.bin"
+        artifact.dump(fit, path)
+        loaded = artifact.load(path, mmap=True)
+        lower, upper = numpy.array(fit.domain).T
+        xs = numpy.random.RandomState(0).uniform(lower, upper, (20, len(lower)))
+        for a, b in zip(loaded.tuple_batch(xs), fit.tuple_batch(xs)):
+            ok_(numpy.array_equal(a, b))
+
+    def test_unsupported(self):
+        """Verify custom axis functions or non-spline kinds cannot be compiled."""
+        table2 = File(self.table2_path)["xsec"]
+        wrapper = AxesWrapper(["log", numpy.sqrt], "log")
+        fit = ScipyGridInterpolator("linear", wrapper).interpolate(table2)
+        with assert_raises(TypeError):
+            artifact.dump(fit, self.tmp_dir / "artifact.bin")
+        table1 = File(self.table1_path)["xsec"]
+        fit = Scipy1dInterpolator("nearest", "loglog").interpolate(table1)
+        with assert_raises(TypeError):
+            artifact.dump(fit, self.tmp_dir / "artifact.bin")
+
+    def test_load_compiled(self):
+        """Verify compiled interpolations are found in the cache directory."""
+        interpolator = Scipy1dInterpolator("spline", "loglog")
+        info_path = self.table1_path.with_suffix(".info")
+        cache_dir = config.cache_dir
+        try:
+            config.cache_dir = self.tmp_dir.__str__()  # py2
+            args = (self.table1_path, info_path, "xsec", interpolator)
+            ok_(artifact.load_compiled(*args) is None)
+            fit = interpolator.interpolate(File(self.table1_path)["xsec"])
+            source_hash = artifact.storage.content_hash(self.table1_path, info_path)
+            path = artifact.default_path(source_hash, "xsec", interpolator)
+            artifact.dump(fit, path, source_hash, repr(interpolator))
+            loaded = artifact.load_compiled(*args)
+            eq_(loaded.tuple_at(500), fit.tuple_at(500))
+            # another interpolator does not use the artifact
+            other = Scipy1dInterpolator("pchip", "loglog")
+            args = (self.table1_path, info_path, "xsec", other)
+            ok_(artifact.load_compiled(*args) is None)
+        finally:
+            config.cache_dir = cache_dir
@@ -0,0 +1,93 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import logging
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+import susy_cross_section.config as config
+from susy_cross_section import catalog
+from susy_cross_section.table import File
+from susy_cross_section.utility import get_paths
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class TestCatalog(unittest.TestCase):
+    """Test codes for the catalog of the grid files."""
+
+    def setUp(self):
+        """Load the shipped catalog."""
+        self.catalog = catalog.load()
+
+    def test_up_to_date(self):
+        """Verify the shipped catalog agrees with the data files."""
+        tmp_dir = pathlib.Path(tempfile.mkdtemp())
+        try:
+            path = tmp_dir / catalog.CATALOG_NAME
+            catalog.Catalog.build().dump(path)
+            eq_(path.read_text(), catalog.default_path().read_text())
+        finally:
+            shutil.rmtree(tmp_dir.__str__())  # py2
+        eq_(
+            sorted(e.key for e in self.catalog if e.key is not None),
+            sorted(config.table_names),
+        )
+
+    def test_entry(self):
+        """Verify an entry records the content of the files."""
+        entry = self.catalog.search(substr=["13TeV.ss10"], predefined=True)[0]
+        eq_(entry.key, "13TeV.ss10")
+        data_file = File(*get_paths("13TeV.ss10"))
+        eq_([p["name"] for p in entry.parameters], ["ms", "mgl"])
+        for p in entry.parameters:
+            column = data_file.raw_data[p["name"]]
+            eq_((p["min"], p["max"]), (column.min(), column.max()))
+        attributes = data_file.tables["xsec"].attributes
+        value = [v for v in entry.values if v["name"] == "xsec"][0]
+        eq_(value["processes"], attributes.processes)
+        eq_((value["ecm"], value["order"]), (attributes.ecm, attributes.order))
+        eq_(value["unit"], data_file.tables["xsec"].unit)
+        for path in entry.paths():
+            ok_(path.is_file())
+        for ms, mgl_min, mgl_max in entry.hull:
+            column = data_file.raw_data[data_file.raw_data["ms"] == ms]["mgl"]
+            eq_((mgl_min, mgl_max), (column.min(), column.max()))
+        eq_(len(entry.hull), data_file.raw_data["ms"].nunique())
+
+    def test_search(self):
+        """Verify the conditions of search."""
+        all_entries = self.catalog.search()
+        eq_(len(all_entries), len(self.catalog))
+        predefined = self.catalog.search(predefined=True)
+        eq_(len(predefined), len(config.table_names))
+
+        for entry in self.catalog.search(ecm="13tev", order="nlo+nll"):
+            ok_(any(v["ecm"] == "13TeV" for v in entry.values))
+        gluino = self.catalog.search(process="go go", predefined=True)
+        ok_(gluino and all("gg" in e.key for e in gluino))
+
+        with_params = self.catalog.search(parameters=["ms", "mgl"])
+        for entry in with_params:
+            eq_([p["name"] for p in entry.parameters], ["ms", "mgl"])
+        covering = self.catalog.search(parameters=["mgl"], point={"mgl": 2900})
+        ok_(covering)
+        for entry in covering:
+            bounds = {p["name"]: (p["min"], p["max"]) for p in entry.parameters}
+            ok_(bounds["mgl"][0] <= 2900 <= bounds["mgl"][1])
+        eq_(self.catalog.search(point={"mgl": 1e9}), [])
+        eq_(self.catalog.search(ecm="13TeV", collider="ee"), [])
+
+    def test_load_without_file(self):
+        """Verify the catalog is built if the file does not exist."""
+        built = catalog.load("no-such-catalog.json")
+        eq_(
+            [(e.key, e.to_dict()) for e in built],
+            [(e.key, e.to_dict()) for e in self.catalog],
+        )
@@ -0,0 +1,94 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import logging
+import unittest
+
+import numpy
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+from susy_cross_section.catalog import Catalog, CatalogEntry
+from susy_cross_section.coverage import CoverageIndex
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def _entry(key, hull, ecm="13TeV", names=("x", "y")):
+    """Return a catalog entry of a two-parameter grid with the hull."""
+    hull = numpy.array(hull, dtype=float)
+    x, y_min, y_max = hull.T
+    bounds = [(x.min(), x.max()), (y_min.min(), y_max.max())]
+    parameters = [
+        {"name": n, "unit": "", "min": lo, "max": hi}
+        for n, (lo, hi) in zip(names, bounds)
+    ]
+    values = [
+        {
+            "name": "xsec",
+            "unit": "fb",
+            "processes": ["p p > a b"],
+            "collider": "pp",
+            "ecm": ecm,
+            "order": "LO",
+            "pdf_name": "",
+        }
+    ]
+    return CatalogEntry(key, key, key, parameters, values, hull.tolist())
+
+
+class TestCoverage(unittest.TestCase):
+    """Test codes for the coverage index."""
+
+    def setUp(self):
+        """Prepare a triangular grid and its complement."""
+        self.lower = _entry("lower", [[0, 0, 2], [1, 0, 1], [2, 0, 0]])
+        self.upper = _entry("upper", [[0, 1, 4], [1, 1, 4], [2, 0, 4]])
+        self.other = _entry("other", [[0, 0, 4], [2, 0, 4]], ecm="8TeV")
+        self.index = CoverageIndex([self.lower, self.upper, self.other])
+
+    def test_tables(self):
+        """Verify tables are grouped by process and energy."""
+        eq_(self.index.tables("p p >  a b", "13tev"), [self.lower, self.upper])
+        eq_(self.index.tables("p p > a b", "8TeV"), [self.other])
+        eq_(
+            self.index.tables("p p > a b", "13TeV", parameters=["y", "x"]),
+            [self.lower, self.upper],
+        )
+        eq_(self.index.tables("p p > a b", "13TeV", parameters=["x"]), [])
+        eq_(self.index.tables("p p > a b", "13TeV", value_name="xsec_lo"), [])
+        eq_(self.index.tables("p p > b a", "13TeV"), [])
+
+    def test_select(self):
+        """Verify the hull and the preference are respected."""
+        points = [
+            {"x": 0.5, "y": 0.5},  # both
+            {"x": 0.5, "y": 1.5},  # the lower hull is y <= min(2, 1) at x = 0.5
+            {"x": 1, "y": 1},  # on the grid line
+            {"x": 2, "y": 3},
+            {"x": 3, "y": 0},  # out of the box
+            {"x": 1},  # no tables with only x
+        ]
+        eq_(
+            self.index.select("p p > a b", "13TeV", points),
+            [self.lower, self.upper, self.lower, self.upper, None, None],
+        )
+        eq_(self.index.select("p p > a b", "13TeV", points[0]), [self.lower])
+        eq_(
+            self.index.covering("p p > a b", "13TeV", points[2]),
+            [self.lower, self.upper],
+        )
+        eq_(self.index.covering("p p > a b", "13TeV", points[4]), [])
+
+    def test_bundled(self):
+        """Verify high-mass grids of NLL-fast are selected for heavy squarks."""
+        index = CoverageIndex.from_catalog()
+        points = [{"ms": ms, "mgl": 1000} for ms in [1000, 3000, 2550]]
+        light, heavy, gap = index.select("p p > go go", "8TeV", points)
+        eq_((light.key, heavy.key, gap), ("8TeV.gg", "8TeV.gg.high", None))
+        eq_(index.select("p p > go go", "8TeV", {"mgl": 1000})[0].key, "8TeV.gg.decoup")
+
+        # an explicitly empty catalog is not replaced by the bundled one
+        empty = CoverageIndex.from_catalog(Catalog([]))
+        eq_(empty.tables("p p > go go", "8TeV"), [])
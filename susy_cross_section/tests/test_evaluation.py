@@ -0,0 +1,70 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import logging
+import math
+import unittest
+
+import pandas
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+import susy_cross_section.config as config
+from susy_cross_section import evaluation
+from susy_cross_section.interp.interpolator import default_interpolator
+from susy_cross_section.table import File
+from susy_cross_section.utility import get_paths
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class TestEvaluation(unittest.TestCase):
+    """Test codes for evaluation of many tables."""
+
+    def test_find_tables(self):
+        """Verify patterns are expanded in the order of configuration."""
+        wino = [k for k in config.table_names if k.startswith("13TeV.") and "wino" in k]
+        eq_(evaluation.find_tables(["13TeV.*.wino"]), wino)
+        eq_(
+            evaluation.find_tables(["13TeV.slepslep.ll", "13TeV.slepslep.*"]),
+            ["13TeV.slepslep.ll", "13TeV.slepslep.rr", "13TeV.slepslep.maxmix"],
+        )
+        eq_(evaluation.find_tables(["path/to/file.csv"]), ["path/to/file.csv"])
+        with assert_raises(ValueError):
+            evaluation.find_tables(["no-such-table.*"])
+
+    def test_evaluate(self):
+        """Verify results agree with separate evaluation of each table."""
+        points = [
+            {"ms": 1200, "mgl": 1000, "m_wino": 500},
+            {"mgl": 1500, "m_slep": 300},
+            {"ms": 1200, "mgl": 1e6},  # out of the grids
+        ]
+        tables = ["13TeV.*10", "13TeV.gg.decoup", "13TeV.*.wino", "13TeV.slepslep.ll"]
+        rows = evaluation.evaluate(points, tables)
+        frame = pandas.DataFrame(points)
+        eq_(repr(rows), repr(evaluation.evaluate(frame, tables)))  # with NaN
+
+        expected = [
+            (0, ["13TeV.gg.decoup", "13TeV.sb10", "13TeV.ss10"]),
+            (0, evaluation.find_tables(["13TeV.*.wino"])),
+            (1, ["13TeV.gg.decoup", "13TeV.slepslep.ll"]),
+            (2, ["13TeV.gg.decoup", "13TeV.sb10", "13TeV.ss10"]),
+        ]
+        expected_keys = sorted(
+            [(i, k) for i, keys in expected for k in keys],
+            key=lambda x: (x[0], evaluation.find_tables(tables).index(x[1])),
+        )
+        eq_([(r.point, r.table) for r in rows], expected_keys)
+
+        for row in rows:
+            data_file = File(*get_paths(row.table))
+            params = [p.column for p in data_file.info.parameters]
+            fit = default_interpolator(len(params)).interpolate(data_file["xsec"])
+            x = [points[row.point][p] for p in params]
+            eq_(row.unit, data_file["xsec"].unit)
+            if row.point == 2:
+                ok_(math.isnan(row.value))
+            else:
+                eq_((row.value, row.unc_p, row.unc_m), fit.tuple_at(x))
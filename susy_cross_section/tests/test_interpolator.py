@@ -5,19 +5,57 @@ from __future__ import absolute_import, division, print_function  # py2
 import itertools
 import logging
 import pathlib
+import pickle
+import shutil
+import tempfile
 import unittest
 
 import numpy
+import pandas
+import scipy.interpolate
 from nose.tools import assert_almost_equals, assert_raises, eq_, ok_  # noqa: F401
 
-from susy_cross_section.interp import Scipy1dInterpolator, ScipyGridInterpolator
-from susy_cross_section.interp.axes_wrapper import AxesWrapper
-from susy_cross_section.table import File
+import susy_cross_section.config as config
+from susy_cross_section.interp import (
+    Scipy1dInterpolator,
+    ScipyGridInterpolator,
+    ScipyMultiDimensionalInterpolator,
+)
+from susy_cross_section.interp.axes_wrapper import AxesWrapper, vectorized
+from susy_cross_section.interp.interpolator import (
+    CompositeInterpolation,
+    _Axis,
+    _JointComponent,
+    tuple_batch_many,
+)
+from susy_cross_section.base.info import FileInfo, ParameterInfo
+from susy_cross_section.base.table import BaseFile
+from susy_cross_section.table import BaseTable, File
 
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+def _table(index, value, granularities=None):
+    """Return a table of the values with +10% and -20% uncertainties.
+
+    If granularities are given, the table belongs to a file whose info has
+    the parameters with the granularities.
+    """
+    df = pandas.DataFrame(
+        {"value": value, "unc+": value * 0.1, "unc-": value * 0.2}, index=index
+    )
+    data_file = None
+    if granularities is not None:
+        data_file = BaseFile.__new__(BaseFile)
+        data_file.info = FileInfo(
+            parameters=[
+                ParameterInfo(name, g) for name, g in zip(index.names, granularities)
+            ]
+        )
+    return BaseTable(df, file=data_file)
+
+
 class TestInterpolator(unittest.TestCase):
     """Test codes for one-dimensional cross-section fit."""
 
@@ -178,3 +216,402 @@ class TestInterpolator(unittest.TestCase):
                     test_method()
                 with assert_raises((IndexError, TypeError)):
                     test_method(777)
+
+    def test_batch_evaluation(self):
+        """Verify batch methods are consistent with point-by-point ones."""
+        random = numpy.random.RandomState(0)
+        table1 = File(self.dirs["lhc_wg"] / "13TeVn2x1wino_cteq_pm.csv")["xsec"]
+        table2 = File(self.dirs["fastlim8mod"] / "sg_8TeV_NLONLL_modified.xsec")["xsec"]
+        fits = [
+            (Scipy1dInterpolator(kind, "loglog").interpolate(table1), [(300, 1000)])
+            for kind in ["linear", "akima", "spline", "pchip"]
+        ] + [
+            (
+                ScipyGridInterpolator(kind, AxesWrapper(["log", "log"], "log"))
+                .interpolate(table2),
+                [(700, 1000), (1400, 1600)],
+            )
+            for kind in ["linear", "spline"]
+        ]
+        for fit, bounds in fits:
+            xs = numpy.column_stack([random.uniform(lo, hi, 50) for lo, hi in bounds])
+            expected = numpy.array([fit.tuple_at(x) for x in xs]).T
+            f0, unc_p, unc_m = fit.tuple_batch(xs)
+            for actual, e in zip((f0, unc_p, unc_m), expected):
+                numpy.testing.assert_allclose(actual, e, rtol=1e-12)
+            numpy.testing.assert_allclose(fit.f0_batch(xs), expected[0], rtol=1e-12)
+            numpy.testing.assert_allclose(fit.fp_batch(xs), f0 + unc_p, rtol=1e-12)
+            numpy.testing.assert_allclose(fit.fm_batch(xs), f0 + unc_m, rtol=1e-12)
+
+            # DataFrame with parameter-named columns, in any order
+            names = list(fit.param_index)
+            df = pandas.DataFrame(xs, columns=names)[names[::-1]]
+            numpy.testing.assert_allclose(fit.f0_batch(df), f0, rtol=1e-12)
+
+            # out-of-domain policies
+            lower, upper = numpy.array(fit.domain).T
+            xs_out = numpy.vstack([xs[:2], lower - 10, upper + 10])
+            results = fit.f0_batch(xs_out)
+            numpy.testing.assert_allclose(results[:2], f0[:2], rtol=1e-12)
+            ok_(numpy.isnan(results[2:]).all())
+            with assert_raises(ValueError):
+                fit.f0_batch(xs_out, out_of_domain="raise")
+            results = fit.f0_batch(xs_out, out_of_domain="clip")
+            numpy.testing.assert_allclose(results[2], fit(*lower), rtol=1e-12)
+            numpy.testing.assert_allclose(results[3], fit(*upper), rtol=1e-12)
+            with assert_raises(ValueError):
+                fit.f0_batch(xs, out_of_domain="invalid")
+            eq_(fit.f0_batch(xs[:0]).shape, (0,))
+
+    def test_stacked_interpolation(self):
+        """Verify stacked interpolation agrees with separate interpolations."""
+        random = numpy.random.RandomState(0)
+        table1 = File(self.dirs["lhc_wg"] / "13TeVn2x1wino_cteq_pm.csv")["xsec"]
+        table2 = File(self.dirs["fastlim8mod"] / "sg_8TeV_NLONLL_modified.xsec")["xsec"]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        for interpolator, table in [
+            (Scipy1dInterpolator("spline", "loglog"), table1),
+            (Scipy1dInterpolator("linear", "log"), table1),
+            (ScipyGridInterpolator("linear", wrapper), table2),
+            (ScipyGridInterpolator("spline", wrapper), table2),
+            (ScipyGridInterpolator("linear"), table2),
+        ]:
+            ok_(interpolator._stackable)
+            stacked = interpolator.interpolate(table)
+            try:
+                interpolator._stackable = False
+                separate = interpolator.interpolate(table)
+            finally:
+                del interpolator._stackable
+            ok_(stacked._f_stack is not None and separate._f_stack is None)
+            lower, upper = numpy.array(stacked.domain).T
+            xs = random.uniform(lower, upper, (30, len(lower)))
+            for x in xs:
+                numpy.testing.assert_allclose(
+                    stacked.tuple_at(x), separate.tuple_at(x), rtol=1e-12
+                )
+                ok_(self._is_scalar_number(stacked.f0(x)))
+                assert_almost_equals(stacked.fp(x) - stacked.f0(x), stacked.unc_p_at(x))
+            numpy.testing.assert_allclose(
+                stacked.tuple_batch(xs), separate.tuple_batch(xs), rtol=1e-12
+            )
+
+    def test_interpolate_many(self):
+        """Verify tables on an identical grid are interpolated together."""
+        lhc_wg = self.dirs["lhc_wg"]
+        tables1 = [
+            File(lhc_wg / "13TeVn2x1wino_cteq_{}.csv".format(c))["xsec"]
+            for c in ["pm", "p", "m"]
+        ]
+        nnllfast13 = self.dirs["lhc_wg"] / ".." / "nnllfast" / "13TeV"
+        tables2 = [
+            File(nnllfast13 / "{}_nnlonnll_pdf4lhc15_13TeV_wpresc.grid".format(p))[n]
+            for p in ["sg", "ss"]
+            for n in ["xsec", "xsec_lo"]
+        ]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        for interpolator, tables in [
+            (Scipy1dInterpolator("spline", "loglog"), tables1),
+            (Scipy1dInterpolator("linear", "log"), tables1),
+            (ScipyGridInterpolator("linear", wrapper), tables2),
+            (ScipyGridInterpolator("spline", wrapper), tables2),
+        ]:
+            joint = interpolator.interpolate_many(tables)
+            separate = [interpolator.interpolate(t) for t in tables]
+            ok_(all(isinstance(j._f_stack, _JointComponent) for j in joint))
+            lower, upper = numpy.array(joint[0].domain).T
+            xs = numpy.random.RandomState(0).uniform(
+                lower * 0.9, upper * 1.1, (30, len(lower))
+            )
+            for j, s in zip(joint, separate):
+                eq_(j.domain, s.domain)
+                eq_(j.tuple_at(xs[0]), s.tuple_at(xs[0]))
+            results = tuple_batch_many(joint + separate, xs)
+            for j, s, values in zip(joint, separate, results):
+                for a, b, c in zip(values, j.tuple_batch(xs), s.tuple_batch(xs)):
+                    numpy.testing.assert_array_equal(a, b)
+                    numpy.testing.assert_array_equal(a, c)
+
+        # tables on different grids are interpolated separately
+        interpolator = Scipy1dInterpolator("spline", "loglog")
+        other = File(lhc_wg / "13TeVslepslep_ll.csv")["xsec"]
+        fits = interpolator.interpolate_many([tables1[0], other])
+        ok_(not any(isinstance(f._f_stack, _JointComponent) for f in fits))
+
+    def test_sparse(self):
+        """Verify sparse grid interpolation on full and triangular grids."""
+        table = File(self.dirs["fastlim8mod"] / "sg_8TeV_NLONLL_modified.xsec")["xsec"]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        linear = ScipyGridInterpolator("linear", wrapper).interpolate(table)
+        sparse = ScipyGridInterpolator("sparse", wrapper).interpolate(table)
+        lower, upper = numpy.array(linear.domain).T
+        xs = numpy.random.RandomState(0).uniform(lower, upper, (300, 2))
+        xs[:2] = [lower, upper]
+        for a, b in zip(sparse.tuple_batch(xs), linear.tuple_batch(xs)):
+            numpy.testing.assert_allclose(a, b, rtol=1e-12)
+        eq_(sparse.tuple_at(700, 1400), linear.tuple_at(700, 1400))
+
+        # triangular grid x >= y, where a linear function is reproduced.
+        grid = [(x, y) for x in range(100, 1001, 100) for y in range(100, x + 1, 100)]
+        index = pandas.MultiIndex.from_tuples(grid, names=["x", "y"])
+        value = numpy.array([x + 2 * y for x, y in grid], dtype=float)
+        table = _table(index, value)
+        fit = ScipyGridInterpolator("sparse").interpolate(table)
+        f = fit._f_stack
+        eq_(len(f.cell_keys), 36)  # cells below the diagonal; 9 * 8 / 2
+        eq_(f.values.shape, (len(grid), 3))
+        self._assert_all_close(fit.tuple_at(850, 320), (1490, 149, -298))
+        assert_almost_equals(fit(x=1000, y=900), 2800)  # on the edge of the grid
+        points = [[850, 320], [200, 200], [150, 140], [140, 150], [100, 900]]
+        numpy.testing.assert_allclose(
+            fit.f0_batch(points), [1490, 600, numpy.nan, numpy.nan, numpy.nan]
+        )
+        with assert_raises(ValueError):
+            fit.f0_batch(points, "raise")
+        restored = pickle.loads(pickle.dumps(fit))
+        eq_(restored.tuple_at(850, 320), fit.tuple_at(850, 320))
+
+    def test_multilinear(self):
+        """Verify linear grid interpolation with three or four parameters."""
+        random = numpy.random.RandomState(0)
+        for axes in [
+            [[100, 200, 400, 800], [1, 2, 3], [10, 20, 25, 30, 50]],
+            [[100, 300, 1000], [5], [0.1, 0.2, 0.5, 1.0], [7, 8]],
+        ]:
+            names = ["x{}".format(j) for j in range(len(axes))]
+            index = pandas.MultiIndex.from_product(axes, names=names)
+            grid = index.to_frame(index=False).to_numpy(dtype=float)
+            # a multilinear function is reproduced.
+            value = numpy.prod(grid + numpy.arange(1, len(axes) + 1), axis=1)
+            table = _table(index, value)
+            fit = ScipyGridInterpolator("linear").interpolate(table)
+            lower, upper = numpy.array(fit.domain).T
+            xs = random.uniform(lower, upper, (500, len(axes)))
+            xs[:len(grid)] = grid[:500]
+            expected = numpy.prod(xs + numpy.arange(1, len(axes) + 1), axis=1)
+            central, unc_p, unc_m = fit.tuple_batch(xs)
+            numpy.testing.assert_allclose(central, expected, rtol=1e-12)
+            numpy.testing.assert_allclose(unc_p, expected * 0.1, rtol=1e-12)
+            numpy.testing.assert_allclose(unc_m, expected * -0.2, rtol=1e-12)
+            assert_almost_equals(fit(*xs[-1]) / expected[-1], 1)
+            with assert_raises(ValueError):
+                fit(*(upper + 1))
+            ok_(numpy.isnan(fit.f0_batch([upper + 1])).all())
+
+            # in log axes, agrees with the scipy interpolator.
+            wrapper = AxesWrapper(["log"] * len(axes), "log")
+            fit = ScipyGridInterpolator("linear", wrapper).interpolate(table)
+            reference = scipy.interpolate.RegularGridInterpolator(
+                [numpy.log(a) for a in axes],
+                numpy.log(value).reshape([len(a) for a in axes]),
+            )
+            numpy.testing.assert_allclose(
+                fit.f0_batch(xs), numpy.exp(reference(numpy.log(xs))), rtol=1e-12
+            )
+            restored = pickle.loads(pickle.dumps(fit))
+            eq_(restored.tuple_at(xs[0]), fit.tuple_at(xs[0]))
+
+    def test_cell_lookup(self):
+        """Verify arithmetic cell lookup agrees with binary search."""
+        ms = numpy.round(numpy.geomspace(100, 3000, 12))  # log-uniform, quantized
+        mgl = numpy.concatenate([numpy.arange(100, 1000, 50), [1000, 1500, 2000]])
+        index = pandas.MultiIndex.from_product([ms, mgl], names=["ms", "mgl"])
+        value = 1e4 / (index.get_level_values(0) * index.get_level_values(1))
+        table = _table(index, value, granularities=[1, 1])
+        wrapper = AxesWrapper(["log", "log"], "log")
+        xs = numpy.random.RandomState(0).uniform([100, 100], [3000, 2000], (500, 2))
+        xs[:len(ms)] = numpy.column_stack([ms, mgl[: len(ms)]])
+        for kind in ["linear", "sparse"]:
+            fit = ScipyGridInterpolator(kind, wrapper).interpolate(table)
+            f_bar = fit._f_stack.f_bar
+            axes = f_bar.axes if kind == "linear" else f_bar.locators
+            ok_(axes[0].spacing and axes[0].buckets is None)  # uniform in log
+            ok_(axes[1].buckets is not None)  # uniform (partially) before log
+            max_buckets = _Axis.MAX_BUCKETS
+            try:
+                _Axis.MAX_BUCKETS = 0
+                searched = ScipyGridInterpolator(kind, wrapper).interpolate(
+                    _table(index, value)
+                )
+            finally:
+                _Axis.MAX_BUCKETS = max_buckets
+            f_bar = searched._f_stack.f_bar
+            axes = f_bar.axes if kind == "linear" else f_bar.locators
+            eq_([repr(a) for a in axes], ["irregular(12)", "irregular(21)"])
+            for a, b in zip(fit.tuple_batch(xs), searched.tuple_batch(xs)):
+                numpy.testing.assert_array_equal(a, b)
+
+    def test_multi_dimensional(self):
+        """Verify Delaunay interpolation and its cache of the triangulation."""
+        random = numpy.random.RandomState(0)
+        grid = random.uniform(100, 1000, (500, 2))
+        index = pandas.MultiIndex.from_arrays(grid.T, names=["x", "y"])
+        value = numpy.exp(grid[:, 0] / 500) + numpy.sqrt(grid[:, 1])
+        table = _table(index, value)
+        xs = random.uniform(50, 1050, (300, 2))
+        expected = scipy.interpolate.LinearNDInterpolator(grid, value)(xs)
+        cache_dir = config.cache_dir
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            config.cache_dir = tmp_dir
+            fit = ScipyMultiDimensionalInterpolator().interpolate(table)
+            numpy.testing.assert_allclose(fit.f0_batch(xs), expected, rtol=1e-12)
+            expected_at_node = value[7] * numpy.array([1, 0.1, -0.2])
+            self._assert_all_close(fit.tuple_at(*grid[7]), expected_at_node)
+            cached = list((pathlib.Path(tmp_dir) / "delaunay").iterdir())
+            eq_(len(cached), 1)
+            refit = ScipyMultiDimensionalInterpolator().interpolate(table)
+            eq_(list((pathlib.Path(tmp_dir) / "delaunay").iterdir()), cached)
+            numpy.testing.assert_array_equal(refit.f0_batch(xs), fit.f0_batch(xs))
+        finally:
+            config.cache_dir = cache_dir
+            shutil.rmtree(tmp_dir)
+        with assert_raises(ValueError):
+            fit.f0_batch(xs, "raise")
+        restored = pickle.loads(pickle.dumps(fit))
+        eq_(restored.tuple_at(500, 500), fit.tuple_at(500, 500))
+
+        # on a grid, agrees with the grid interpolator at the grid points.
+        table = File(self.dirs["fastlim8mod"] / "sg_8TeV_NLONLL_modified.xsec")["xsec"]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        linear = ScipyGridInterpolator("linear", wrapper).interpolate(table)
+        fit = ScipyMultiDimensionalInterpolator("linear", wrapper, cache=False)
+        fit = fit.interpolate(table)
+        points = table.index.to_frame(index=False).to_numpy(dtype=float)[::7]
+        for a, b in zip(fit.tuple_batch(points), linear.tuple_batch(points)):
+            numpy.testing.assert_allclose(a, b, rtol=1e-10)
+        with assert_raises(ValueError):
+            ScipyMultiDimensionalInterpolator("spline").interpolate(table)
+
+    def test_tabulate(self):
+        """Verify the lookup tables are within the tolerated deviation."""
+        table1 = File(self.dirs["lhc_wg"] / "13TeVn2x1wino_cteq_pm.csv")["xsec"]
+        table2 = File(self.dirs["fastlim8mod"] / "sg_8TeV_NLONLL_modified.xsec")["xsec"]
+        fits = [
+            Scipy1dInterpolator("spline", "loglog").interpolate(table1),
+            ScipyGridInterpolator("spline").interpolate(table2),
+        ]
+        for fit in fits:
+            lut = fit.tabulate(0.1)
+            eq_(lut.domain, fit.domain)
+            eq_(lut.param_index, fit.param_index)
+            lower, upper = numpy.array(fit.domain).T
+            xs = numpy.random.RandomState(1).uniform(lower, upper, (3000, len(lower)))
+            exact = numpy.array(fit.tuple_batch(xs))
+            approx = numpy.array(lut.tuple_batch(xs))
+            tolerance = 0.1 * numpy.minimum(exact[1], -exact[2])
+            ok_((abs(approx[0] - exact[0]) <= tolerance).all())
+            ok_((abs(approx[0] + approx[1] - exact[0] - exact[1]) <= tolerance).all())
+            ok_((abs(approx[0] + approx[2] - exact[0] - exact[2]) <= tolerance).all())
+            # the grid points of the table are reproduced
+            x = numpy.array(fit.domain)[:, 0]
+            self._assert_all_close(lut.tuple_at(x), fit.tuple_at(x), decimal=12)
+            ok_(numpy.isnan(lut.f0_batch(numpy.array([lower - 1]), "nan")).all())
+            restored = pickle.loads(pickle.dumps(lut))
+            numpy.testing.assert_array_equal(restored.f0_batch(xs), lut.f0_batch(xs))
+            with assert_raises(ValueError):
+                fit.tabulate(0.1, max_nodes=10)
+
+        # the grid is not evaluated beyond max_nodes
+        fit = fits[1]
+        wrapper, f_bar = fit._transformed()
+        sizes = []
+
+        def counted(xs):
+            sizes.append(len(xs))
+            return f_bar(xs)
+
+        fit._transformed = lambda: (wrapper, counted)
+        with assert_raises(ValueError):
+            fit.tabulate(1e-4, max_nodes=5000)
+        ok_(sizes and max(sizes) <= 5000)
+
+    def test_composite(self):
+        """Verify stitched interpolation agrees with interpolation of each grid."""
+        nllfast7 = self.dirs["lhc_wg"] / ".." / "nllfast" / "7TeV"
+        tables = [
+            File(nllfast7 / "gg_nllnlo{}_mstw2008.grid".format(s))["xsec"]
+            for s in ["", "_hm"]
+        ]
+        wrapper = AxesWrapper(["log", "log"], "log")
+        for interpolator in [
+            ScipyGridInterpolator("linear", wrapper),
+            ScipyGridInterpolator("spline", wrapper),
+        ]:
+            separate = [interpolator.interpolate(t) for t in tables]
+            composite = interpolator.interpolate_composite(tables)
+            eq_(composite.domain, [(200, 4500), (200, 2000)])
+            xs = numpy.random.RandomState(0).uniform([100, 100], [4600, 2100], (300, 2))
+            xs[:4] = [[2000, 2000], [2100, 200], [2050, 1000], [3000, 1800]]
+            routes = composite.route(xs)
+            eq_(routes[:4].tolist(), [0, 1, -1, -1])
+            expected = [numpy.full(len(xs), numpy.nan) for _ in range(3)]
+            for k, fit in enumerate(separate):
+                for e, v in zip(expected, fit.tuple_batch(xs[routes == k])):
+                    e[routes == k] = v
+            for a, e in zip(composite.tuple_batch(xs), expected):
+                numpy.testing.assert_array_equal(a, e)
+            eq_(composite.tuple_at(3000, 1000), separate[1].tuple_at(3000, 1000))
+            eq_(composite.f0(ms=1000, mgl=1000), separate[0].f0(1000, 1000))
+            ok_(numpy.isnan(composite.f0(2050, 1000)))
+            with assert_raises(ValueError):
+                composite.f0_batch(xs[:4], "raise")
+            restored = pickle.loads(pickle.dumps(composite))
+            ok_(isinstance(restored, CompositeInterpolation))
+            eq_(restored.tuple_at(3000, 1000), composite.tuple_at(3000, 1000))
+
+        slepton = Scipy1dInterpolator().interpolate(
+            File(self.dirs["lhc_wg"] / "13TeVslepslep_ll.csv")["xsec"]
+        )
+        with assert_raises(ValueError):
+            CompositeInterpolation([separate[0], slepton])
+
+    def test_axes_wrapper_functions(self):
+        """Verify transforms of AxesWrapper are applicable to arrays."""
+        xs = numpy.linspace(0.5, 3, 11)
+        for name in ["identity", "log", "exp"]:
+            f = AxesWrapper._get_function(name)
+            ok_(not isinstance(f, numpy.vectorize))
+            eq_(f(xs).shape, xs.shape)
+            numpy.testing.assert_allclose(AxesWrapper.inverse(name)(f(xs)), xs)
+            numerical = (f(xs + 1e-6) - f(xs - 1e-6)) / 2e-6
+            numpy.testing.assert_allclose(AxesWrapper.derivative(name)(xs), numerical)
+        eq_(AxesWrapper.exp10(2.5), 10 ** 2.5)  # identical to Python's power
+
+        # user-supplied functions
+        wrapper = AxesWrapper([numpy.sqrt, vectorized(lambda x: x * 2)], "log")
+        ok_(wrapper.wx[0] is numpy.sqrt)
+        ok_(not isinstance(wrapper.wx[1], numpy.vectorize))
+        wrapper = AxesWrapper([lambda x: float(x) * 2], "log")
+        ok_(isinstance(wrapper.wx[0], numpy.vectorize))
+        numpy.testing.assert_allclose(wrapper.wx[0](xs), xs * 2)
+
+    def test_pickle(self):
+        """Verify interpolations are restored from pickles."""
+        table1 = File(self.dirs["lhc_wg"] / "13TeVn2x1wino_cteq_pm.csv")["xsec"]
+        table2 = File(self.dirs["fastlim8mod"] / "sg_8TeV_NLONLL_modified.xsec")["xsec"]
+        wrapper = AxesWrapper(["log", numpy.sqrt], "log")
+        fits = [
+            Scipy1dInterpolator(kind, "loglog").interpolate(table1)
+            for kind in ["linear", "cubic", "akima", "spline", "pchip"]
+        ] + [
+            ScipyGridInterpolator(kind, axes_wrapper).interpolate(table2)
+            for kind in ["linear", "spline", "spline22"]
+            for axes_wrapper in [wrapper, None]
+        ]
+        unstacked = ScipyGridInterpolator("spline", wrapper)
+        unstacked._stackable = False
+        fits.append(unstacked.interpolate(table2))
+        for fit in fits:
+            restored = pickle.loads(pickle.dumps(fit))
+            eq_(restored.param_index, fit.param_index)
+            eq_(restored.domain, fit.domain)
+            lower, upper = numpy.array(fit.domain).T
+            xs = numpy.random.RandomState(0).uniform(lower, upper, (20, len(lower)))
+            for x in xs[:3]:
+                eq_(restored.tuple_at(x), fit.tuple_at(x))
+                eq_(restored.f0(x), fit.f0(x))
+            for a, b in zip(restored.tuple_batch(xs), fit.tuple_batch(xs)):
+                ok_(numpy.array_equal(a, b))
+            # restored objects can be pickled again
+            ok_(pickle.loads(pickle.dumps(restored)).f0(xs[0]) == fit.f0(xs[0]))
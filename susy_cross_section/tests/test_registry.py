@@ -0,0 +1,102 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import logging
+import unittest
+
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+import susy_cross_section
+import susy_cross_section.config as config
+from susy_cross_section.registry import Registry, default_registry
+from susy_cross_section.table import File
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class TestRegistry(unittest.TestCase):
+    """Test codes for the registry of files."""
+
+    keys = ["8TeV.gg", "8TeV.sg", "8TeV.ss10"]
+
+    def test_load(self):
+        """Verify repeated requests return the same object."""
+        registry = Registry()
+        first = registry.load("8TeV.gg")
+        ok_(isinstance(first, File))
+        ok_(registry.load("8TeV.gg") is first)
+        grid, info = config.table_paths("8TeV.gg", absolute=True)
+        ok_(registry.load(grid) is first)  # same file by path
+        ok_(registry.load(grid, info) is first)
+        stats = registry.stats()
+        eq_((stats["hits"], stats["misses"], stats["entries"]), (3, 1, 1))
+        ok_(stats["bytes"] > 0)
+        with assert_raises(FileNotFoundError):
+            registry.load("invalid-key")
+
+        # the shared tables are read-only
+        table = first["xsec"]
+        value = table.iloc[0, 0]
+        with assert_raises(ValueError):
+            table.iloc[0, 0] = 0
+        with assert_raises(ValueError):
+            table["value"] *= 2
+        eq_(registry.load("8TeV.gg")["xsec"].iloc[0, 0], value)
+        copied = table.copy()
+        copied.iloc[0, 0] = 0  # copies can be modified
+        eq_(table.iloc[0, 0], value)
+
+    def test_eviction(self):
+        """Verify the least recently used files are evicted."""
+        registry = Registry(max_entries=2)
+        gg = registry.load("8TeV.gg")
+        registry.load("8TeV.sg")
+        registry.load("8TeV.gg")  # now 8TeV.sg is the least recently used
+        registry.load("8TeV.ss10")
+        eq_(registry.stats()["entries"], 2)
+        eq_(registry.evictions, 1)
+        ok_(registry.load("8TeV.gg") is gg)
+        eq_(registry.misses, 3)
+        registry.load("8TeV.sg")
+        eq_(registry.misses, 4)
+
+        # memory budget; the most recent one is always kept
+        registry = Registry(max_bytes=1)
+        for key in self.keys:
+            registry.load(key)
+            eq_(registry.stats()["entries"], 1)
+        eq_(registry.evictions, 2)
+
+        # limits given by config
+        size = config.registry_size
+        try:
+            config.registry_size = 1
+            registry = Registry()
+            for key in self.keys:
+                registry.load(key)
+            eq_(registry.stats()["entries"], 1)
+        finally:
+            config.registry_size = size
+
+    def test_invalidate(self):
+        """Verify invalidated files are loaded again."""
+        registry = Registry()
+        gg = registry.load("8TeV.gg")
+        registry.load("8TeV.sg")
+        ok_(registry.invalidate("8TeV.gg"))
+        ok_(not registry.invalidate("8TeV.gg"))
+        eq_(registry.stats()["entries"], 1)
+        new_gg = registry.load("8TeV.gg")
+        ok_(new_gg is not gg)
+        ok_(new_gg["xsec"]._df.equals(gg["xsec"]._df))
+        ok_(registry.invalidate())
+        eq_(registry.stats()["entries"], 0)
+        eq_(registry.memory_usage(), 0)
+
+    def test_package_load(self):
+        """Verify the package-level shortcut uses the default registry."""
+        data_file = susy_cross_section.load("8TeV.gg")
+        ok_(susy_cross_section.load("8TeV.gg") is data_file)
+        ok_(default_registry.invalidate("8TeV.gg"))
@@ -4,12 +4,17 @@ from __future__ import absolute_import, division, print_function  # py2
 
 import logging
 import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 import os
 
 from click.testing import CliRunner
 from nose.tools import assert_almost_equals, eq_, ok_, raises  # noqa: F401
 
+import susy_cross_section.config as config
 from susy_cross_section import scripts
 
 logging.basicConfig(level=logging.WARNING)
@@ -37,6 +42,21 @@ class TestScripts(unittest.TestCase):
         ret = self.runner.invoke(scripts.main)
         self.assert_success(ret)
 
+    def test_lazy_import(self):
+        """Check light commands do not import pandas or scipy."""
+        code = "\n".join(
+            [
+                "import atexit, sys",
+                "from susy_cross_section.scripts import main",
+                "heavy = lambda: {m.split('.')[0] for m in sys.modules}",
+                "atexit.register(lambda: print(sorted(heavy() & {'pandas', 'scipy'})))",
+                "main(sys.argv[1:])",
+            ]
+        )
+        for args in [["--version"], ["--help"], ["list"], ["list", "-a", "--ecm", "8TeV"]]:
+            output = subprocess.check_output([sys.executable, "-c", code] + args)
+            eq_(output.decode("utf-8").strip().splitlines()[-1], "[]")
+
     def test_list(self):
         """Assert behavior of LIST command."""
         full = self.runner.invoke(scripts.cmd_list)
@@ -68,6 +88,17 @@ class TestScripts(unittest.TestCase):
         for line in actual_lines:
             ok_(line in expected)
 
+        # filters by the contents of the tables
+        actual = self.runner.invoke(
+            scripts.cmd_list, ["--all", "--ecm", "13TeV", "--at", "mgl=2900"]
+        )
+        self.assert_success(actual)
+        actual_lines = actual.output.splitlines()
+        ok_(actual_lines)
+        for line in actual_lines:
+            ok_(line in all_lines and "13TeV" in line)
+        ok_(self.runner.invoke(scripts.cmd_list, ["--at", "mgl"]).exit_code != 0)
+
     def test_list_fullpath(self):
         """Assert behavior of LIST command with --full option."""
         os.chdir("./docs")  # move to any directory
@@ -94,6 +125,21 @@ class TestScripts(unittest.TestCase):
         eq_(result[300].output.strip(), "(4.43 +0.19 -0.24) fb")
         eq_(result[350].output.strip(), "(2.33 +0.11 -0.14) fb")
 
+    def test_get_auto(self):
+        """Verify GET command selects the table covering the parameters."""
+        runner = CliRunner(mix_stderr=False)
+        args = ["--no-server", "--auto", "--ecm", "8TeV", "p p > go go"]
+        for ms, key in [("1000", "8TeV.gg"), ("3000", "8TeV.gg.high")]:
+            auto = runner.invoke(scripts.get, args + ["ms=" + ms, "mgl=1000"])
+            self.assert_success(auto)
+            ok_(key + " is selected" in auto.stderr)
+            direct = runner.invoke(scripts.get, ["--no-server", key, ms, "1000"])
+            eq_(auto.stdout, direct.stdout)
+        for invalid in [["ms=2550", "mgl=1000"], ["ms=1000", "m_wino=300"]]:
+            ok_(runner.invoke(scripts.get, args + invalid).exit_code != 0)
+        no_ecm = ["--no-server", "--auto", "p p > go go", "mgl=1000"]
+        ok_(runner.invoke(scripts.get, no_ecm).exit_code != 0)
+
     def test_get_two_args(self):
         """Test get command for two-argument case."""
         ret = self.runner.invoke(scripts.get, ["13TeV.ss10", "600", "700"])
@@ -153,3 +199,91 @@ class TestScripts(unittest.TestCase):
         assert output[450][0] > output[458][0] > output[475][0]
         assert output[450][1] > output[458][1] > output[475][1]
         assert output[450][2] < output[458][2] < output[475][2]
+
+    def test_get_all(self):
+        """Assert GET command with --all evaluates all the matching tables."""
+        ret = self.runner.invoke(
+            scripts.get, ["--all", "13TeV.*10,13TeV.slepslep.ll", "ms=600", "mgl=700"]
+        )
+        self.assert_success(ret)
+        lines = ret.output.strip().splitlines()
+        eq_([line.split("\t")[0] for line in lines], ["13TeV.sb10", "13TeV.ss10"])
+        eq_(lines[1], "13TeV.ss10\t(4.84 +0.17 -0.22) pb")
+
+        points = "m_slep,ms,mgl\n300,600,700\n350,600,700\n"
+        ret = self.runner.invoke(
+            scripts.get,
+            ["--all", "13TeV.ss10,13TeV.slepslep.ll", "--points", "-"],
+            input=points,
+        )
+        self.assert_success(ret)
+        eq_(
+            ret.output.strip().splitlines(),
+            [
+                "0\t13TeV.ss10\t(4.84 +0.17 -0.22) pb",
+                "0\t13TeV.slepslep.ll\t(4.43 +0.19 -0.24) fb",
+                "1\t13TeV.ss10\t(4.84 +0.17 -0.22) pb",
+                "1\t13TeV.slepslep.ll\t(2.33 +0.11 -0.14) fb",
+            ],
+        )
+
+        for args in [["13TeV.ss10", "600"], ["no-such-table.*", "ms=600"]]:
+            ret = self.runner.invoke(scripts.get, ["--all"] + args)
+            eq_(ret.exit_code, 1)
+
+    def test_compile(self):
+        """Assert compiled interpolations are used by GET command."""
+        cache_dir = config.cache_dir
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            config.cache_dir = tmp_dir
+            ret = self.runner.invoke(scripts.cmd_compile, ["13TeV.slepslep.ll"])
+            self.assert_success(ret)
+            eq_(len(ret.output.splitlines()), 1)
+            eq_(len(list(pathlib.Path(tmp_dir).glob("interp/*.bin"))), 1)
+            ret = self.runner.invoke(scripts.get, ["13TeV.slepslep.ll", "300"])
+            self.assert_success(ret)
+            eq_(ret.output.strip(), "(4.43 +0.19 -0.24) fb")
+        finally:
+            config.cache_dir = cache_dir
+            shutil.rmtree(tmp_dir)
+
+    def test_batch(self):
+        """Assert BATCH command gives the same values as GET command."""
+        points = [("600", "700"), ("1000", "1200"), ("500", "5000")]
+        expected = [
+            self.runner.invoke(scripts.get, ["-1", "13TeV.ss10", ms, mgl]).output
+            for ms, mgl in points
+        ]
+        expected[2] = "nan +nan -nan\n"  # out of the grid
+        inputs = [
+            "\n".join(",".join(p) for p in points),
+            "mgl,ms\n" + "\n".join(",".join(reversed(p)) for p in points),
+            "ms\tmgl\n" + "\n".join("\t".join(p) for p in points),
+            "\n".join('{{"ms": {}, "mgl": {}}}'.format(*p) for p in points),
+        ]
+        runner = CliRunner(mix_stderr=False)  # throughput is logged to stderr
+        for text in inputs:
+            for chunk_size in ["1", "10000"]:
+                ret = runner.invoke(
+                    scripts.batch,
+                    ["-1", "--chunk-size", chunk_size, "13TeV.ss10"],
+                    input=text + "\n",
+                )
+                self.assert_success(ret)
+                eq_(ret.stdout, "".join(expected))
+
+        # errors are reported with the line of the offending point
+        for args, text, message in [
+            (["13TeV.ss10"], "600,700,800\n", "Invalid input: line 1:"),
+            (["13TeV.ss10"], "ms,mgl\n600,700\n\n600,abc\n", "Invalid input: line 4:"),
+            (["13TeV.ss10"], '{"ms": 600}\n', "Invalid input: line 1:"),
+            (
+                ["--out-of-domain", "raise", "--chunk-size", "10", "13TeV.ss10"],
+                "600,700\n500,5000\n",
+                "Point out of the domain at line 2: 500.0, 5000.0",
+            ),
+        ]:
+            ret = runner.invoke(scripts.batch, args, input=text)
+            eq_(ret.exit_code, 1)
+            ok_(message in ret.stderr, ret.stderr)
@@ -0,0 +1,126 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import json
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import unittest
+
+from click.testing import CliRunner
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+import susy_cross_section.config as config
+from susy_cross_section import scripts, server
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class TestServer(unittest.TestCase):
+    """Test codes for the server of GET requests."""
+
+    def setUp(self):
+        """Start a server on a temporary socket."""
+        self.tmp_dir = pathlib.Path(tempfile.mkdtemp())
+        self.socket = self.tmp_dir / "test.sock"
+        self.server = server.Server(self.socket)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir.__str__())  # py2
+
+    def _get(self, table_path, args, name="xsec"):
+        return server.request(
+            {
+                "op": "get",
+                "table_path": table_path.__str__(),  # py2
+                "info_path": table_path.with_suffix(".info").__str__(),  # py2
+                "name": name,
+                "args": args,
+            },
+            self.socket,
+        )
+
+    def test_request(self):
+        """Verify the server answers requests as GET command."""
+        eq_(server.request({"op": "ping"}, self.socket), {"ok": True})
+        grid, _ = config.table_paths("13TeV.slepslep.ll", absolute=True)
+        response = self._get(grid, [300])
+        ok_(response["ok"])
+        eq_(response["unit"], "fb")
+        eq_(round(response["value"][0], 2), 4.43)
+        eq_(self._get(grid, [300]), response)  # served from memory
+        eq_(self.server.registry.misses, 1)
+
+        for invalid in [self._get(grid, [300, 300]), self._get(grid, [300], "bad")]:
+            ok_(not invalid["ok"] and invalid["error"])
+        ok_(not server.request({"op": "invalid"}, self.socket)["ok"])
+
+        # another server cannot run on the same socket
+        with assert_raises(RuntimeError):
+            server.Server(self.socket)
+
+    def test_socket_owner(self):
+        """Verify sockets of other users or non-socket files are not used."""
+        eq_(os.stat(self.socket.__str__()).st_mode & 0o777, 0o600)
+        not_socket = self.tmp_dir / "file.sock"
+        not_socket.write_text(u"")
+        with assert_raises(OSError):
+            server.request({"op": "ping"}, not_socket)
+        with assert_raises(RuntimeError):
+            server.Server(not_socket)
+        ok_(not_socket.exists())
+
+        getuid = os.getuid
+        os.getuid = lambda: getuid() + 1  # as if the socket is of another user
+        try:
+            with assert_raises(OSError):
+                server.request({"op": "ping"}, self.socket)
+            with assert_raises(RuntimeError):
+                server.Server(self.socket)
+        finally:
+            os.getuid = getuid
+        eq_(server.request({"op": "ping"}, self.socket), {"ok": True})
+
+    def test_invalidation(self):
+        """Verify modified files are reloaded."""
+        original, _ = config.table_paths("13TeV.slepslep.ll", absolute=True)
+        grid = self.tmp_dir / original.name
+        shutil.copy(original.__str__(), grid.__str__())  # py2
+        info = json.loads(original.with_suffix(".info").read_text())
+        grid.with_suffix(".info").write_text(json.dumps(info))
+        eq_(self._get(grid, [300])["unit"], "fb")
+
+        for column in info["columns"]:
+            if column["unit"] == "fb":
+                column["unit"] = "pb"
+        info["document"]["note"] = "modified"
+        grid.with_suffix(".info").write_text(json.dumps(info))
+        eq_(self._get(grid, [300])["unit"], "pb")
+
+    def test_client(self):
+        """Verify GET command uses the server if running."""
+        runner = CliRunner()
+        args = ["-1", "13TeV.slepslep.ll", "300"]
+        local = runner.invoke(scripts.get, ["--no-server"] + args)
+        remote = runner.invoke(scripts.get, ["--socket", self.socket.__str__()] + args)
+        eq_((local.exit_code, remote.exit_code), (0, 0))
+        eq_(remote.output, local.output)
+        eq_(self.server.registry.misses, 1)
+
+        # errors are handled by GET itself
+        ret = runner.invoke(
+            scripts.get, ["--socket", self.socket.__str__(), "13TeV.slepslep.ll"]
+        )
+        ok_(ret.exit_code != 0)
+        ok_("Usage" in ret.output)
@@ -0,0 +1,283 @@
+"""Test codes."""
+
+from __future__ import absolute_import, division, print_function  # py2
+
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy
+import pandas
+from nose.tools import assert_raises, eq_, ok_  # noqa: F401
+
+import susy_cross_section.config as config
+import susy_cross_section.storage as storage
+from susy_cross_section.base.table import (
+    BaseFile,
+    BaseTable,
+    read_numeric_columns,
+    uniform_spacing,
+)
+from susy_cross_section.table import File, Table
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def _legacy_uncertainty(row, unc_sources, sign):
+    """Calculate uncertainty of a row in the original row-by-row manner."""
+    unc_components = []
+    for source, unc_type in unc_sources:
+        if "signed" in unc_type.split(","):
+            unc_candidates = [abs(row[c]) for c in source if row[c] * sign > 0]
+        else:
+            unc_candidates = [abs(row[c]) for c in source]
+        unc_components.append(max(unc_candidates) if unc_candidates else 0)
+    return sum(i ** 2 for i in unc_components) ** 0.5
+
+
+@contextlib.contextmanager
+def _patch(obj, name, value):
+    """Temporarily replace an attribute of an object."""
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
+
+class TestBaseFile(unittest.TestCase):
+    """Test codes for parsing grid files."""
+
+    def setUp(self):
+        """Set up."""
+        cwd = pathlib.Path(__file__).parent
+        self.data_dir = cwd / ".." / "data"
+        self.test_data_dir = cwd / "data"
+
+    def _all_grids(self):
+        for info in sorted(self.data_dir.glob("**/*.info")):
+            for suffix in [".grid", ".csv"]:
+                if info.with_suffix(suffix).is_file():
+                    yield info.with_suffix(suffix), info
+        yield self.test_data_dir / "sg_8TeV_NLONLL_modified.xsec", None
+
+    def test_uncertainty_combination(self):
+        """Verify column-wise combination is identical to row-wise one."""
+        for grid, info in self._all_grids():
+            data_file = BaseFile(grid, info)
+            for value_info in data_file.info.values:
+                table = data_file.tables[value_info.column]
+                data = data_file._prepare_normalized_data(value_info)
+                for key, row in data.iterrows():
+                    for col, sources, sign in [
+                        ("unc+", value_info.unc_p, +1),
+                        ("unc-", value_info.unc_m, -1),
+                    ]:
+                        expected = _legacy_uncertainty(row, sources, sign)
+                        actual = table.loc[key, col]
+                        ok_(actual == expected, "{} {}".format(grid, key))
+                eq_(list(table.columns), ["value", "unc+", "unc-"])
+                ok_(numpy.array_equal(table["value"], data[value_info.column]))
+
+    def test_cache(self):
+        """Verify cached tables are identical to parsed ones."""
+        grid = self.data_dir / "nllfast" / "8TeV" / "sg_nllnlo_mstw2008.grid"
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with _patch(config, "cache_dir", tmp_dir):
+                original = BaseFile(grid)
+                first = BaseFile(grid, use_cache=True)  # creates cache
+                cache_files = list(pathlib.Path(tmp_dir).glob("**/*.bin"))
+                eq_(len(cache_files), 1)
+                with _patch(pandas, "read_csv", None):
+                    second = BaseFile(grid, use_cache=True)  # reads cache
+                for loaded in [first, second]:
+                    eq_(loaded.info.to_json(), original.info.to_json())
+                    eq_(set(loaded.tables.keys()), set(original.tables.keys()))
+                    for key, table in original.tables.items():
+                        ok_(table._df.equals(loaded.tables[key]._df))
+                        eq_(table.index.names, loaded.tables[key].index.names)
+                        ok_(loaded.tables[key].file is loaded)
+                # raw data is available on demand
+                ok_(second.raw_data.equals(original.raw_data))
+
+                # modification of files invalidates the cache
+                info = json.loads(grid.with_suffix(".info").read_text())
+                info["document"]["note"] = "modified"
+                modified_info = pathlib.Path(tmp_dir) / "modified.info"
+                modified_info.write_text(json.dumps(info))
+                modified = BaseFile(grid, modified_info, use_cache=True)
+                eq_(len(list(pathlib.Path(tmp_dir).glob("**/*.bin"))), 2)
+                eq_(modified.info.document["note"], "modified")
+
+                # broken cache is ignored and overwritten
+                cache_files[0].write_bytes(b"broken")
+                third = BaseFile(grid, use_cache=True)
+                ok_(third.tables["xsec"]._df.equals(original.tables["xsec"]._df))
+                ok_(storage.load(cache_files[0]))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_lazy_tables(self):
+        """Verify tables are built on first access if lazy."""
+        grid = self.data_dir / "nllfast" / "8TeV" / "gdcpl_nllnlo_mstw2008.grid"
+        eager = File(grid, lazy=False)
+        lazy = File(grid)
+        eq_(list(lazy.tables.keys()), ["xsec_lo", "xsec_nlo", "xsec"])
+        eq_(len(lazy.tables), 3)
+        ok_(not any(lazy.tables.is_built(k) for k in lazy.tables))
+
+        table = lazy["xsec"]
+        ok_(isinstance(table, Table) and table.file is lazy)
+        ok_(lazy.tables.is_built("xsec"))
+        ok_(not lazy.tables.is_built("xsec_lo"))
+        ok_(lazy["xsec"] is table)  # built only once
+        for key, eager_table in eager.tables.items():
+            ok_(isinstance(eager_table, Table) and eager_table.file is eager)
+            ok_(eager_table._df.equals(lazy.tables[key]._df))
+        with assert_raises(KeyError):
+            lazy.tables["invalid"]
+
+    def test_partial_load(self):
+        """Verify only required columns are read if values are specified."""
+        grid = self.data_dir / "nllfast" / "8TeV" / "gg_nllnlo_mstw2008.grid"
+        full = File(grid)
+        partial = File(grid, values=["xsec_nlo"])
+        eq_(list(partial.tables.keys()), ["xsec_nlo"])
+        eq_(
+            list(partial._data.columns),
+            [
+                "ms",
+                "mgl",
+                "xsec_nlo",
+                "unc+_scale_nlo",
+                "unc-_scale_nlo",
+                "unc+_pdf",
+                "unc-_pdf",
+                "unc+_alphas",
+                "unc-_alphas",
+            ],
+        )
+        ok_(partial["xsec_nlo"]._df.equals(full["xsec_nlo"]._df))
+        ok_(partial.raw_data.equals(full.raw_data))  # read on demand
+        with assert_raises(KeyError):
+            partial["xsec"]
+        with assert_raises(KeyError):
+            File(grid, values=["invalid"])
+
+    def test_numeric_reader(self):
+        """Verify the fast reader is equivalent to pandas.read_csv."""
+        for grid, info in self._all_grids():
+            data_file = BaseFile(grid, info)
+            names = [c.name for c in data_file.info.columns]
+            columns = data_file._required_columns(names=data_file.tables.keys())
+            arrays = read_numeric_columns(
+                grid, names, columns, data_file.info.reader_options
+            )
+            ok_(arrays is not None, grid)
+            eq_(list(arrays.keys()), columns)
+            for column, array in arrays.items():
+                eq_(array.dtype, numpy.float64)
+                ok_(array.flags["C_CONTIGUOUS"])
+                expected = data_file.raw_data[column].to_numpy(dtype=float)
+                ok_(numpy.array_equal(array, expected), "{} {}".format(grid, column))
+
+        grid = self.data_dir / "nllfast" / "8TeV" / "gg_nllnlo_mstw2008.grid"
+        options = {"skiprows": 1, "delim_whitespace": True}
+        names = ["process", "ms", "mgl"]
+        ok_(read_numeric_columns(grid, names, ["ms"], options) is not None)
+        # unsupported options and non-numeric columns are left to pandas
+        for columns, opts in [
+            (["ms"], dict(options, comment="#")),
+            (["ms"], dict(options, skiprows=[1])),
+            (["ms"], {"skiprows": 1, "sep": ";"}),
+            (["process", "ms"], options),
+        ]:
+            ok_(read_numeric_columns(grid, names, columns, opts) is None)
+
+    def test_layout(self):
+        """Verify detection of equally-spaced grids in the table repr."""
+        grid = self.data_dir / "nllfast" / "8TeV" / "gg_nllnlo_mstw2008.grid"
+        eq_(
+            repr(File(grid)["xsec"]),
+            "<Table xsec: 576 rows; ms: 24 points, uniform step 100; "
+            "mgl: 24 points, uniform step 100>",
+        )
+        eq_(uniform_spacing(numpy.array([100, 125, 150.0])), (100, 25))
+        eq_(uniform_spacing(numpy.array([33.3, 66.7, 100.0])), None)
+        eq_(uniform_spacing(numpy.array([33.3, 66.7, 100.0]), 0.05), (33.3, 33.35))
+        eq_(uniform_spacing(numpy.array([0, 1, 3.0]), 10), None)  # too deviated
+
+        index = pandas.MultiIndex.from_product(
+            [[33.3, 66.7, 100], [100, 200, 400, 800], [1, 2, 4, 5], [7]],
+            names=["a", "b", "c", "d"],
+        )
+        table = BaseTable(pandas.DataFrame({"v": numpy.zeros(len(index))}, index))
+        eq_(table.granularities(), [None, None, None, None])
+        eq_(
+            table.layout(),
+            [
+                "3 points, irregular",
+                "4 points, log-uniform ratio 2",
+                "4 points, irregular",
+                "1 point",
+            ],
+        )
+        with _patch(table, "granularities", lambda: [0.1, 1, 1, None]):
+            eq_(table.layout()[0], "3 points, uniform step 33.35")
+        ok_(repr(table).startswith("<BaseTable: 48 rows; a: 3 points, irregular;"))
+
+    def test_pickle(self):
+        """Verify files and tables are pickled without raw data."""
+        grid = self.data_dir / "nllfast" / "8TeV" / "gg_nllnlo_mstw2008.grid"
+        original = File(grid)
+        original.raw_data  # to be dropped in pickling
+        restored = pickle.loads(pickle.dumps(original))
+        ok_(isinstance(restored, File))
+        ok_(restored._raw_data is None and restored._data is None)
+        eq_(restored.info.to_json(), original.info.to_json())
+        for key, table in original.tables.items():
+            ok_(isinstance(restored[key], Table) and restored[key].file is restored)
+            ok_(restored[key]._df.equals(table._df))
+        table = pickle.loads(pickle.dumps(original["xsec"]))
+        ok_(table._df.equals(original["xsec"]._df))
+        eq_(table.unit, "pb")
+        ok_(pickle.loads(pickle.dumps(Table()))._df.empty)
+        # special methods are still delegated, e.g., for numpy
+        array = numpy.asarray(original["xsec"])
+        eq_((array.shape, array.dtype), (original["xsec"]._df.shape, numpy.float64))
+        ok_(numpy.array_equal(numpy.asarray(table), array))
+
+    def test_shared(self):
+        """Verify files attached to a shared block view the same data."""
+        grid = self.data_dir / "nllfast" / "8TeV" / "gdcpl_nllnlo_mstw2008.grid"
+        original = File(grid)
+        path = original.export_shared()
+        try:
+            attached = File.attach_shared(path)
+            eq_(attached.table_path, original.table_path)
+            eq_(attached.info.to_json(), original.info.to_json())
+            for key, table in original.tables.items():
+                ok_(isinstance(attached[key], Table) and attached[key].file is attached)
+                ok_(attached[key]._df.equals(table._df))
+                values = attached[key]._df.values
+                ok_(not values.flags["WRITEABLE"])  # read-only view of the block
+            eq_(attached["xsec"].unit, "pb")
+
+            # pickled as the path, so unpickled objects attach to the block
+            ok_(len(pickle.dumps(attached)) < 1000)
+            restored = pickle.loads(pickle.dumps(attached))
+            ok_(restored["xsec"]._df.equals(original["xsec"]._df))
+            table = pickle.loads(pickle.dumps(attached["xsec"]))
+            ok_(table._df.equals(original["xsec"]._df))
+            ok_(table.file is not None and table.file["xsec"]._df is table._df)
+        finally:
+            os.remove(str(path))
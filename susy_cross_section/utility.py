@@ -11,12 +11,11 @@ from __future__ import absolute_import, division, print_function  # py2
 
 import itertools
 import logging
+import math
 import pathlib
 import sys
 from typing import Any, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Union
 
-from numpy import log10
-
 from susy_cross_section.config import table_paths
 
 if sys.version_info[0] < 3:  # py2
@@ -206,15 +205,16 @@ def value_format(value, unc_p, unc_m, unit=None, relative=False):
         # without uncertainty
         body = "{:g} +0 -0".format(value)
     else:
-        v_order = int(log10(value))
+        v_order = int(math.log10(value))
         if abs(v_order) > 3:
             # force to use scientific notation
             suffix = "*1e{:d}".format(v_order) + suffix
             divider = 10 ** v_order
-            disp_digits = max(int(-log10(delta / value) - 0.005) + 2, 3)
+            disp_digits = max(int(-math.log10(delta / value) - 0.005) + 2, 3)
         else:
             divider = 1
-            disp_digits = max(int(-log10(delta) - 0.005) + (1 if delta > 1 else 2), 0)
+            disp_digits = int(-math.log10(delta) - 0.005) + (1 if delta > 1 else 2)
+            disp_digits = max(disp_digits, 0)
         v_format = "{f} +{f} -{f}".format(f="{{:.{}f}}".format(disp_digits))
         body = v_format.format(value / divider, unc_p / divider, abs(unc_m / divider))
     return "({}){}".format(body, suffix) if suffix else body